@@ -0,0 +1,74 @@
+"""
+Conversion throughput of the markdownify and lxml converter engines, in MB/s of HTML.
+
+Each page is parsed, its title and description read and its Markdown
+written, as the pipeline does; the two engines' Markdown is compared too.
+Synthetic pages cover an API reference and the docs themes of
+bench_extract.py; saved pages of real sites can be measured with `--html`.
+
+    python benchmarks/bench_converter.py [--pages N] [--sections N] [--main-content] [--html page.html ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_extract import THEMES
+from bench_parse import make_api_reference_page
+from llmstxt_generate_agent.utils.parser import ParsedPage
+
+ENGINES = ('markdownify', 'lxml')
+
+def convert(html: str, engine: str, main_content: bool) -> str:
+    page = ParsedPage("https://example.com/docs/page.html", html, engine=engine)
+    title, description = page.title, page.description
+    return page.to_markdown(main_content)
+
+def measure(html: str, engine: str, pages: int, main_content: bool) -> float:
+    """Returns CPU seconds per page."""
+    start = time.process_time()
+    for _ in range(pages):
+        convert(html, engine, main_content)
+    return (time.process_time() - start) / pages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20, help="conversions per page and engine")
+    parser.add_argument('--sections', type=int, default=40, help="sections of the synthetic pages")
+    parser.add_argument('--main-content', action='store_true', help="convert only the main content region")
+    parser.add_argument('--html', nargs='+', help="saved HTML pages to measure instead of the synthetic ones")
+    args = parser.parse_args()
+
+    if args.html:
+        samples = {}
+        for path in args.html:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                samples[os.path.basename(path)] = f.read()
+    else:
+        samples = {'api-reference': make_api_reference_page(args.sections)}
+        samples.update((name, build(args.sections, 400)) for name, build in THEMES.items())
+
+    print(f"{'page':<20} {'HTML KiB':>8} {'markdownify MB/s':>16} {'lxml MB/s':>10} {'speedup':>8}  same")
+    total_bytes = 0
+    totals = dict.fromkeys(ENGINES, 0.0)
+    identical = 0
+    for name, html in samples.items():
+        size = len(html.encode('utf-8'))
+        seconds = {engine: measure(html, engine, args.pages, args.main_content) for engine in ENGINES}
+        same = convert(html, 'markdownify', args.main_content) == convert(html, 'lxml', args.main_content)
+        identical += same
+        total_bytes += size
+        for engine in ENGINES:
+            totals[engine] += seconds[engine]
+        print(f"{name[:20]:<20} {size / 1024:>8.0f} {size / seconds['markdownify'] / 1e6:>16.2f} "
+              f"{size / seconds['lxml'] / 1e6:>10.2f} {seconds['markdownify'] / seconds['lxml']:>7.1f}x  "
+              f"{'yes' if same else 'NO'}")
+    print(f"Overall: markdownify {total_bytes / totals['markdownify'] / 1e6:.2f} MB/s, "
+          f"lxml {total_bytes / totals['lxml'] / 1e6:.2f} MB/s "
+          f"({totals['markdownify'] / totals['lxml']:.1f}x); identical Markdown for {identical}/{len(samples)} pages")
+
+if __name__ == "__main__":
+    main()
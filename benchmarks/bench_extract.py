@@ -0,0 +1,133 @@
+"""
+Conversion time and Markdown size with and without main-content extraction.
+
+Synthetic pages mimic the DOM of Sphinx (Read the Docs theme), MkDocs
+Material and Docusaurus sites, plus a theme without landmarks that exercises
+the text-density fallback: a long navigation sidebar, a cookie banner and an
+"on this page" TOC around the article. Saved pages of real sites can be
+measured instead with `--html`.
+
+    python benchmarks/bench_extract.py [--pages N] [--sections N] [--html page.html ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.converter import html_to_markdown
+
+def _article(sections: int) -> str:
+    body = ['<h1>Client sessions</h1><p>Sessions keep connections and settings between requests.</p>']
+    for i in range(sections):
+        body.append(
+            f'<h2 id="s{i}">Option {i}</h2><p>Sets the value of option <code>{i}</code> for the session. '
+            f'See <a href="#s{i + 1}">the next option</a> for the retry behaviour.</p>'
+            f'<pre><code>session.configure(option_{i}=True)</code></pre>'
+            '<table><tr><th>Name</th><th>Default</th></tr>'
+            f'<tr><td>option_{i}</td><td>False</td></tr></table>'
+        )
+    return "".join(body)
+
+def _sidebar(links: int) -> str:
+    return "".join(f'<li class="toctree-l2"><a class="reference internal" href="/docs/topic-{i}.html">'
+                   f'Topic {i}: guides and reference</a></li>' for i in range(links))
+
+def _toc(sections: int) -> str:
+    return "".join(f'<li><a href="#s{i}">Option {i}</a></li>' for i in range(sections))
+
+_COOKIES = ('<div class="cookie-banner"><p>We use cookies to analyse traffic and improve your experience. '
+            'By continuing to browse you agree to our use of cookies.</p><button>Accept</button></div>')
+
+def sphinx_page(sections: int, links: int) -> str:
+    return (
+        '<html><head><title>Sessions</title></head><body class="wy-body-for-nav">'
+        f'<div class="wy-grid-for-nav"><div class="wy-nav-side"><div class="wy-menu"><ul>{_sidebar(links)}</ul>'
+        '</div></div><section class="wy-nav-content-wrap"><div class="wy-nav-content"><div class="rst-content">'
+        '<div role="navigation" aria-label="breadcrumbs"><a href="/">Home</a> &raquo; Sessions</div>'
+        f'<div class="document" itemscope="itemscope"><div itemprop="articleBody">{_article(sections)}</div></div>'
+        f'</div></div></section></div>{_COOKIES}</body></html>'
+    )
+
+def mkdocs_material_page(sections: int, links: int) -> str:
+    return (
+        '<html><head><title>Sessions</title></head><body><div class="md-container"><main class="md-main">'
+        '<div class="md-main__inner md-grid">'
+        f'<div class="md-sidebar md-sidebar--primary"><nav class="md-nav"><ul>{_sidebar(links)}</ul></nav></div>'
+        '<div class="md-sidebar md-sidebar--secondary"><div class="md-nav--secondary"><label>Table of contents</label>'
+        f'<ul>{_toc(sections)}</ul></div></div>'
+        f'<div class="md-content"><article class="md-content__inner md-typeset">{_article(sections)}</article></div>'
+        f'</div></main></div>{_COOKIES}</body></html>'
+    )
+
+def docusaurus_page(sections: int, links: int) -> str:
+    return (
+        '<html><head><title>Sessions</title></head><body><div id="__docusaurus"><div class="main-wrapper">'
+        f'<div class="docSidebarContainer"><div class="menu"><ul>{_sidebar(links)}</ul></div></div>'
+        '<main class="docMainContainer"><div class="container"><div class="row"><div class="col docItemCol">'
+        '<div class="theme-doc-breadcrumbs"><a href="/">Home</a></div>'
+        f'<article><div class="theme-doc-markdown markdown">{_article(sections)}</div></article>'
+        '<div class="pagination-nav"><a href="/docs/prev">Previous</a><a href="/docs/next">Next</a></div></div>'
+        f'<div class="col col--3"><div class="tableOfContents"><ul>{_toc(sections)}</ul></div></div></div></div>'
+        f'</main></div></div>{_COOKIES}</body></html>'
+    )
+
+def plain_page(sections: int, links: int) -> str:
+    """No landmarks or known theme classes: only the text-density fallback can find the content."""
+    return (
+        '<html><head><title>Sessions</title></head><body><div id="page">'
+        f'<div id="left"><ul>{_sidebar(links)}</ul></div>'
+        f'<div id="content">{_article(sections)}</div>'
+        f'<div id="right"><ul>{_toc(sections)}</ul></div></div>{_COOKIES}</body></html>'
+    )
+
+THEMES = {
+    'sphinx': sphinx_page,
+    'mkdocs-material': mkdocs_material_page,
+    'docusaurus': docusaurus_page,
+    'density-fallback': plain_page,
+}
+
+def measure(html: str, pages: int, main_content) -> tuple[float, int]:
+    """Returns CPU seconds per page and the Markdown size in bytes."""
+    start = time.process_time()
+    for _ in range(pages):
+        markdown = html_to_markdown(html, main_content=main_content)
+    return (time.process_time() - start) / pages, len(markdown.encode('utf-8'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20, help="conversions per page and mode")
+    parser.add_argument('--sections', type=int, default=20, help="sections of the synthetic article")
+    parser.add_argument('--links', type=int, default=400, help="links in the synthetic navigation sidebar")
+    parser.add_argument('--html', nargs='+', help="saved HTML pages to measure instead of the synthetic themes")
+    parser.add_argument('--selector', action='append', help="content selector to try first (repeatable)")
+    args = parser.parse_args()
+
+    if args.html:
+        samples = {}
+        for path in args.html:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                samples[os.path.basename(path)] = f.read()
+    else:
+        samples = {name: build(args.sections, args.links) for name, build in THEMES.items()}
+    main_content = args.selector or True
+
+    print(f"{'page':<20} {'HTML KiB':>8} {'full ms':>8} {'main ms':>8} {'time':>6}  "
+          f"{'full KiB':>8} {'main KiB':>8} {'size':>6}")
+    totals = [0.0, 0.0, 0, 0]
+    for name, html in samples.items():
+        full_time, full_size = measure(html, args.pages, False)
+        main_time, main_size = measure(html, args.pages, main_content)
+        for n, value in enumerate((full_time, main_time, full_size, main_size)):
+            totals[n] += value
+        print(f"{name:<20} {len(html) / 1024:>8.0f} {full_time * 1000:>8.2f} {main_time * 1000:>8.2f} "
+              f"{1 - main_time / full_time:>6.0%}  {full_size / 1024:>8.1f} {main_size / 1024:>8.1f} "
+              f"{1 - main_size / full_size:>6.0%}")
+    full_time, main_time, full_size, main_size = totals
+    print(f"Overall: conversion time -{1 - main_time / full_time:.0%}, Markdown size -{1 - main_size / full_size:.0%}")
+
+if __name__ == "__main__":
+    main()
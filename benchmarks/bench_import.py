@@ -0,0 +1,93 @@
+"""
+Import-time benchmark: how long each entry point takes to import in a fresh
+interpreter, its resident memory afterwards, and which heavy dependencies it
+dragged in.
+
+Crawling, converting and formatting must not load the agent stack (Google
+ADK), and crawling must not load the HTML-to-Markdown converter. The script
+exits with status 1 if one of them does, or if `--max-ms` is exceeded, so it
+can guard against import-time regressions in CI.
+
+    python benchmarks/bench_import.py --runs 5 --max-ms 500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY = ('google.adk', 'google.genai', 'markdownify', 'bs4', 'requests')
+
+# Module -> heavy dependencies it must not import
+TARGETS = {
+    'llmstxt_generate_agent': ('google.adk', 'google.genai', 'markdownify', 'bs4', 'requests'),
+    'llmstxt_generate_agent.utils.formatter': ('google.adk', 'google.genai', 'markdownify', 'bs4', 'requests'),
+    'llmstxt_generate_agent.utils.crawlers': ('google.adk', 'google.genai', 'markdownify', 'bs4'),
+    'llmstxt_generate_agent.generator': ('google.adk', 'google.genai'),
+    'llmstxt_generate_agent.agent': (),
+}
+
+_CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+# Peak RSS; kilobytes on Linux, bytes on macOS
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+print(json.dumps({{'ms': elapsed * 1000, 'rss_mb': rss / 2**20,
+                  'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure(module: str, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _CHILD.format(module=module, heavy=HEAVY)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'ms': round(statistics.median(s['ms'] for s in samples), 1),
+        'min_ms': round(min(s['ms'] for s in samples), 1),
+        'rss_mb': round(statistics.median(s['rss_mb'] for s in samples), 1),
+        'loaded': samples[-1]['loaded'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per module; the median is reported")
+    parser.add_argument('--max-ms', type=float, help="fail if a module other than agent takes longer to import")
+    parser.add_argument('--output', help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    print(f"{'module':<40} {'median ms':>10} {'min ms':>8} {'peak MB':>7}  heavy imports")
+    for module, forbidden in TARGETS.items():
+        try:
+            r = measure(module, args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"{module:<40} failed to import: {e.stderr.strip().splitlines()[-1]}")
+            failures.append(f"{module} failed to import")
+            continue
+        results[module] = r
+        print(f"{module:<40} {r['ms']:>10.1f} {r['min_ms']:>8.1f} {r['rss_mb']:>7.1f}  {', '.join(r['loaded']) or '-'}")
+
+        leaked = [m for m in r['loaded'] if m in forbidden]
+        if leaked:
+            failures.append(f"{module} imports {', '.join(leaked)}")
+        if args.max_ms and forbidden and r['ms'] > args.max_ms:
+            failures.append(f"{module} took {r['ms']:.0f} ms (budget {args.max_ms:.0f} ms)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
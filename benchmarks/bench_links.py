@@ -0,0 +1,91 @@
+"""
+Link extraction and scope filtering on a page with thousands of links.
+
+Compares the previous path (BeautifulSoup tree + find_all, then the
+startswith/substring/any() checks of is_valid_url) with the regex extractor
+and the compiled ScopeMatcher.
+
+    python benchmarks/bench_links.py [--links N] [--rounds N]
+"""
+import argparse
+import os
+import sys
+import time
+from urllib.parse import urljoin, urldefrag, urlparse
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+from llmstxt_generate_agent.utils.parser import extract_links
+from llmstxt_generate_agent.utils.crawlers.scope import ScopeMatcher
+
+BASE_URL = "https://example.com/docs"
+
+def make_link_page(links: int) -> str:
+    """Builds a navigation-heavy page: in-scope pages, anchors, assets and external links."""
+    items = []
+    for i in range(links):
+        kind = i % 5
+        if kind == 0:
+            href = f"/docs/guide/page{i}.html"
+        elif kind == 1:
+            href = f"../docs/api/module{i}.html#section-{i}"
+        elif kind == 2:
+            href = f"/static/img/figure{i}.png"
+        elif kind == 3:
+            href = f"https://github.com/example/repo/blob/main/file{i}.py"
+        else:
+            href = f"reference/item{i}?tab=usage&amp;lang=py"
+        items.append(f'<li class="toc-item"><a class="reference internal" href="{href}">Entry {i}</a></li>')
+    return (
+        '<html><head><title>Index</title></head><body>'
+        f'<nav><ul>{"".join(items)}</ul></nav><main><p>Body text.</p></main></body></html>'
+    )
+
+def legacy_links(url: str, html: str) -> list[str]:
+    domain = urlparse(BASE_URL).netloc
+    soup = BeautifulSoup(html, 'lxml')
+    kept = []
+    for link in soup.find_all('a', href=True):
+        full_url, _ = urldefrag(urljoin(url, link['href']))
+        if not full_url.startswith(BASE_URL) or domain not in full_url:
+            continue
+        if any(full_url.lower().endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.css', '.js', '.xml', '.json', '.pdf', '.svg', '.zip']):
+            continue
+        kept.append(full_url)
+    return kept
+
+def fast_links(url: str, html: str, scope: ScopeMatcher) -> list[str]:
+    return [link for link in extract_links(html, url) if scope(link)]
+
+def measure(func, rounds: int) -> float:
+    start = time.process_time()
+    for _ in range(rounds):
+        func()
+    return (time.process_time() - start) / rounds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--links', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    url = f"{BASE_URL}/index.html"
+    html = make_link_page(args.links)
+    scope = ScopeMatcher(BASE_URL, exclude=["*/changelog/*"])
+
+    legacy = legacy_links(url, html)
+    fast = fast_links(url, html, scope)
+    assert legacy == fast, "extractors disagree"
+
+    before = measure(lambda: legacy_links(url, html), args.rounds)
+    after = measure(lambda: fast_links(url, html, scope), args.rounds)
+
+    print(f"Page: {args.links} links, {len(html) / 1024:.0f} KiB, {len(fast)} in scope")
+    print(f"Soup + is_valid_url:  {before * 1000:8.2f} ms CPU/page")
+    print(f"Regex + ScopeMatcher: {after * 1000:8.2f} ms CPU/page")
+    print(f"Speedup:              {before / after:8.2f}x")
+
+if __name__ == "__main__":
+    main()
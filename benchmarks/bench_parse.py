@@ -0,0 +1,93 @@
+"""
+Per-page CPU time of the parse/convert stage: legacy path vs. ParsedPage.
+
+The legacy path mirrors the pre-ParsedPage code, which parsed each page with
+html.parser once for links, once for metadata and once more for Markdown.
+
+    python benchmarks/bench_parse.py [--pages N] [--sections N]
+"""
+import argparse
+import os
+import sys
+import time
+from urllib.parse import urljoin, urldefrag
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+from markdownify import markdownify as md
+from llmstxt_generate_agent.utils.parser import ParsedPage
+
+def make_api_reference_page(sections: int) -> str:
+    """Builds a large API-reference style page with navigation chrome, signatures and tables."""
+    nav = "".join(f'<li><a href="/api/module{i}.html">module{i}</a></li>' for i in range(200))
+    body = []
+    for i in range(sections):
+        body.append(
+            f'<section id="func{i}"><h2>function_{i}(arg, *, flag=False)</h2>'
+            f'<p>Performs operation <code>{i}</code>. See <a href="#func{i + 1}">next</a> '
+            f'and <a href="/api/types.html#T{i}">T{i}</a>.</p>'
+            f'<pre><code>result = function_{i}(value, flag=True)\nprint(result)</code></pre>'
+            '<table><tr><th>Name</th><th>Type</th><th>Description</th></tr>'
+            f'<tr><td>arg</td><td>int</td><td>Input {i}</td></tr>'
+            '<tr><td>flag</td><td>bool</td><td>Toggle</td></tr></table></section>'
+        )
+    return (
+        '<html><head><title>API Reference</title>'
+        '<meta name="description" content="Complete API reference.">'
+        '<style>body{margin:0}</style><script>var x = 1;</script></head>'
+        f'<body><header>Site</header><nav><ul>{nav}</ul></nav><main>{"".join(body)}</main>'
+        '<footer>Footer</footer></body></html>'
+    )
+
+def legacy_process(url: str, html: str):
+    # RecursiveCrawler link extraction
+    soup = BeautifulSoup(html, 'html.parser')
+    links = []
+    for link in soup.find_all('a', href=True):
+        full_url, _ = urldefrag(urljoin(url, link['href']))
+        links.append(full_url)
+
+    # _process_and_save_pages: html_to_markdown
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        tag.decompose()
+    markdown = "\n".join(line for line in md(str(soup), heading_style="ATX").splitlines() if line.strip())
+
+    # _process_and_save_pages: title and description
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.find('title').get_text().strip()
+    description = soup.find('meta', attrs={'name': 'description'})['content'].strip()
+    return links, title, description, markdown
+
+def parsed_page_process(url: str, html: str):
+    page = ParsedPage(url, html)
+    links = page.links()
+    return links, page.title, page.description, page.markdown
+
+def measure(func, url: str, html: str, pages: int) -> float:
+    start = time.process_time()
+    for _ in range(pages):
+        func(url, html)
+    return (time.process_time() - start) / pages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--sections', type=int, default=300)
+    args = parser.parse_args()
+
+    url = "https://example.com/api/reference.html"
+    html = make_api_reference_page(args.sections)
+
+    before = measure(legacy_process, url, html, args.pages)
+    after = measure(parsed_page_process, url, html, args.pages)
+
+    print(f"Page size: {len(html) / 1024:.0f} KiB, {args.pages} pages")
+    print(f"Legacy (html.parser x3): {before * 1000:8.1f} ms CPU/page")
+    print(f"ParsedPage (lxml x1):    {after * 1000:8.1f} ms CPU/page")
+    print(f"Speedup:                 {before / after:8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Offline end-to-end benchmark against a synthetic local docs site.
+
+Starts benchmarks/docsite.py in a separate process and runs each stage in a
+fresh process of its own, so CPU time and peak RSS belong to that stage alone:
+
+    sitemap    SitemapCrawler.iter_pages() over the whole site
+    recursive  RecursiveCrawler.iter_pages() over the whole site
+    convert    html_to_markdown() on the site's pages, no network
+    pipeline   generate_llms_txt() end to end
+
+Results are printed and saved as JSON; pass an earlier file to --compare to
+see the change per stage.
+
+    python benchmarks/bench_suite.py --pages 1000 --sitemap index --latency 0.01 \\
+        --output results.json --compare baseline.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from docsite import DocsSite, SITEMAP_SHAPES
+
+STAGES = ('sitemap', 'recursive', 'convert', 'pipeline')
+
+def _current_rss_mb() -> float | None:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return None
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def _cpu() -> tuple[float, float]:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime, children.ru_utime + children.ru_stime
+
+def _measure(run) -> dict:
+    """Runs `run()`, which returns (pages, bytes), and collects wall, CPU and memory figures."""
+    logging.disable(logging.INFO)
+    baseline_rss = _current_rss_mb()
+    cpu_before, children_before = _cpu()
+    started = time.perf_counter()
+
+    pages, size = run()
+
+    wall = time.perf_counter() - started
+    cpu_after, children_after = _cpu()
+    return {
+        'pages': pages,
+        'bytes': size,
+        'wall_s': round(wall, 3),
+        'pages_per_s': round(pages / wall, 1) if wall else None,
+        'cpu_s': round(cpu_after - cpu_before, 3),
+        # Conversion worker processes, if any
+        'children_cpu_s': round(children_after - children_before, 3),
+        'rss_before_mb': round(baseline_rss, 1) if baseline_rss is not None else None,
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+def run_stage(stage: str, base_url: str, options: dict) -> dict:
+    """Entry point of the per-stage process."""
+    from llmstxt_generate_agent.utils.crawlers import SitemapCrawler, RecursiveCrawler
+    from llmstxt_generate_agent.utils.converter import html_to_markdown
+
+    crawler_options = {
+        'concurrency': options['concurrency'],
+        'per_host_concurrency': options['per_host_concurrency'],
+    }
+
+    def crawl(crawler):
+        pages = size = 0
+        for _, page in crawler.iter_pages():
+            pages += 1
+            size += len(page.html)
+        return pages, size
+
+    if stage == 'sitemap':
+        return _measure(lambda: crawl(SitemapCrawler(base_url, **crawler_options)))
+
+    if stage == 'recursive':
+        crawler = RecursiveCrawler(base_url, max_pages=options['pages'] + 1, max_depth=10**6, **crawler_options)
+        return _measure(lambda: crawl(crawler))
+
+    if stage == 'convert':
+        site = DocsSite(options['pages'], options['page_kb'], options['fanout'], seed=options['seed'])
+        htmls = [site.page_html(i) for i in range(options['pages'])]
+
+        def convert():
+            for html in htmls:
+                html_to_markdown(html)
+            return len(htmls), sum(len(html) for html in htmls)
+        return _measure(convert)
+
+    if stage == 'pipeline':
+        from llmstxt_generate_agent import generate_llms_txt
+
+        def pipeline():
+            with tempfile.TemporaryDirectory() as output_dir:
+                generate_llms_txt(base_url, service_name='bench', output_dir=output_dir, checkpoint=False,
+                                  workers=options['workers'], **crawler_options)
+                path = os.path.join(output_dir, 'bench-llms-full-v1.0.0.txt')
+                with open(path, encoding='utf-8') as f:
+                    pages = sum(1 for line in f if line.startswith('## Page: '))
+                return pages, os.path.getsize(path)
+        return _measure(pipeline)
+
+    raise ValueError(f"Unknown stage {stage}")
+
+def _serve(options: dict, conn):
+    site = DocsSite(options['pages'], options['page_kb'], options['fanout'], options['sitemap'],
+                    options['latency'], options['seed'])
+    conn.send(site.start())
+    conn.recv() # Block until the parent is done
+    site.stop()
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _print_results(results: dict, previous: dict = None):
+    print(f"{'stage':<10} {'pages':>6} {'wall s':>8} {'pages/s':>9} {'cpu s':>8} {'peak MB':>8}")
+    for stage, r in results.items():
+        line = (f"{stage:<10} {r['pages']:>6} {r['wall_s']:>8.2f} {r['pages_per_s'] or 0:>9.1f} "
+                f"{r['cpu_s'] + r['children_cpu_s']:>8.2f} {r['peak_rss_mb']:>8.1f}")
+        before = (previous or {}).get(stage)
+        if before and before.get('pages_per_s') and r['pages_per_s']:
+            change = r['pages_per_s'] / before['pages_per_s'] - 1
+            line += f"   {change:+.0%} pages/s vs. {previous.get('_revision') or 'previous'}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--page-kb', type=int, default=20)
+    parser.add_argument('--fanout', type=int, default=10)
+    parser.add_argument('--sitemap', choices=SITEMAP_SHAPES, default='plain')
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--per-host-concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=1, help="conversion processes in the pipeline stage")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--output', default='bench-results.json')
+    parser.add_argument('--compare', help="results JSON of an earlier run")
+    args = parser.parse_args()
+
+    options = {k: v for k, v in vars(args).items() if k not in ('stages', 'output', 'compare')}
+    if 'sitemap' in args.stages and args.sitemap == 'none':
+        parser.error("the sitemap stage needs a sitemap shape other than 'none'")
+
+    ctx = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = ctx.Pipe()
+    server = ctx.Process(target=_serve, args=(options, child_conn), daemon=True)
+    server.start()
+    base_url = parent_conn.recv()
+    print(f"Synthetic site: {args.pages} pages x ~{args.page_kb} KiB, fan-out {args.fanout}, "
+          f"sitemap {args.sitemap}, latency {args.latency * 1000:.0f} ms at {base_url}")
+
+    results = {}
+    try:
+        for stage in args.stages:
+            # A fresh process per stage keeps CPU and peak RSS figures separate
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+                results[stage] = executor.submit(run_stage, stage, base_url, options).result()
+    finally:
+        parent_conn.send('stop')
+        server.join(timeout=5)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            data = json.load(f)
+        previous = dict(data['results'], _revision=data.get('revision'))
+    _print_results(results, previous)
+
+    report = {
+        'revision': _git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': options,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
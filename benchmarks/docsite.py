@@ -0,0 +1,206 @@
+"""
+Synthetic documentation site served over local HTTP for offline benchmarks.
+
+Pages are generated deterministically from a seed and rendered once up front,
+so the server itself does almost no work per request; `latency` adds a fixed
+delay per response to emulate a remote host.
+
+    python benchmarks/docsite.py --pages 1000 --sitemap index --port 8000
+"""
+import argparse
+import gzip
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SITEMAP_SHAPES = ('plain', 'index', 'gzip', 'none')
+
+# Pages per child sitemap for the 'index' shape
+SITEMAP_CHUNK = 500
+
+_WORDS = (
+    "request response client server session token config option value default "
+    "returns raises parameter argument module function class method instance stream "
+    "buffer cache index query result error retry timeout header payload schema"
+).split()
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections at exit are expected
+        pass
+
+class DocsSite:
+    """
+    A generated docs site under `/docs`.
+
+    Args:
+        pages: Number of content pages, `/docs/page-N.html`.
+        page_kb: Approximate size of each page in KiB, navigation included.
+        fanout: Number of links from each page to other pages.
+        sitemap: 'plain' (`/docs/sitemap.xml`), 'index' (a sitemap index of
+            chunked child sitemaps), 'gzip' (`/docs/sitemap.xml.gz`, announced
+            in robots.txt) or 'none'.
+        latency: Seconds added to every response.
+    """
+
+    def __init__(self, pages: int = 500, page_kb: int = 20, fanout: int = 10, sitemap: str = 'plain',
+                 latency: float = 0.0, seed: int = 0):
+        if sitemap not in SITEMAP_SHAPES:
+            raise ValueError(f"sitemap must be one of {SITEMAP_SHAPES}")
+        self.pages = pages
+        self.page_kb = page_kb
+        self.fanout = fanout
+        self.sitemap = sitemap
+        self.latency = latency
+        self.seed = seed
+        self.base_url = None
+        self._files = {}
+        self._server = None
+
+    def page_html(self, index: int) -> str:
+        """Renders page `index`: site chrome, headings, prose, code, a table, a list and links."""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        targets = [rng.randrange(self.pages) for _ in range(self.fanout)]
+        # Every page links to the next one, so a recursive crawl reaches them all
+        targets.append((index + 1) % self.pages)
+        links = "".join(f'<li><a href="/docs/page-{t}.html">Page {t}</a></li>' for t in targets)
+        nav = "".join(f'<li><a href="/docs/page-{t}.html#top">Section {t}</a></li>' for t in range(0, self.pages, max(1, self.pages // 40)))
+
+        def sentence():
+            return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 16))).capitalize() + "."
+
+        sections = []
+        size = 0
+        target_size = self.page_kb * 1024
+        n = 0
+        while size < target_size:
+            section = (
+                f'<h2 id="s{n}">Section {n}</h2>'
+                f'<p>{" ".join(sentence() for _ in range(4))} See <code>{rng.choice(_WORDS)}()</code>.</p>'
+                f'<pre><code class="language-python">result = client.{rng.choice(_WORDS)}(value={n})\n'
+                f'print(result)</code></pre>'
+                '<table><tr><th>Name</th><th>Type</th><th>Description</th></tr>'
+                f'<tr><td>{rng.choice(_WORDS)}</td><td>str</td><td>{sentence()}</td></tr>'
+                f'<tr><td>{rng.choice(_WORDS)}</td><td>int</td><td>{sentence()}</td></tr></table>'
+                f'<ul><li>{sentence()}</li><li>{sentence()}</li></ul>'
+            )
+            sections.append(section)
+            size += len(section)
+            n += 1
+
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>Page {index} - Synthetic Docs</title>'
+            f'<meta name="description" content="Synthetic documentation page {index}.">'
+            '<style>body{font-family:sans-serif}</style><script>var analytics = {};</script></head>'
+            f'<body><header>Synthetic Docs</header><nav><ul>{nav}</ul></nav>'
+            f'<main><h1>Page {index}</h1>{"".join(sections)}<h2>Related</h2><ul>{links}</ul></main>'
+            '<footer>Footer</footer></body></html>'
+        )
+
+    def _urlset(self, indexes) -> bytes:
+        entries = "".join(
+            f'<url><loc>{self.base_url}/page-{i}.html</loc><lastmod>2024-01-01</lastmod></url>' for i in indexes
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+        ).encode("utf-8")
+
+    def _render(self):
+        files = {}
+        index_html = self.page_html(0).replace("<h1>Page 0</h1>", "<h1>Synthetic Docs</h1>", 1)
+        files['/docs'] = files['/docs/'] = (index_html.encode("utf-8"), 'text/html; charset=utf-8')
+        for i in range(self.pages):
+            files[f'/docs/page-{i}.html'] = (self.page_html(i).encode("utf-8"), 'text/html; charset=utf-8')
+
+        robots = "User-agent: *\nAllow: /\n"
+        all_pages = range(self.pages)
+        if self.sitemap == 'plain':
+            files['/docs/sitemap.xml'] = (self._urlset(all_pages), 'application/xml')
+        elif self.sitemap == 'gzip':
+            files['/docs/sitemap.xml.gz'] = (gzip.compress(self._urlset(all_pages)), 'application/x-gzip')
+            robots += f"Sitemap: {self.base_url}/sitemap.xml.gz\n"
+        elif self.sitemap == 'index':
+            children = []
+            for n, start in enumerate(range(0, self.pages, SITEMAP_CHUNK)):
+                path = f'/docs/sitemaps/sitemap-{n}.xml'
+                files[path] = (self._urlset(range(start, min(start + SITEMAP_CHUNK, self.pages))), 'application/xml')
+                children.append(f'<sitemap><loc>{self.base_url}/sitemaps/sitemap-{n}.xml</loc></sitemap>')
+            files['/docs/sitemap.xml'] = ((
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{"".join(children)}</sitemapindex>'
+            ).encode("utf-8"), 'application/xml')
+        files['/robots.txt'] = (robots.encode("utf-8"), 'text/plain')
+        self._files = files
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Starts serving in a background thread and returns the site's base URL."""
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are separate writes; don't let Nagle delay the body
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if site.latency:
+                    time.sleep(site.latency)
+                entry = site._files.get(self.path.split('#', 1)[0])
+                if entry is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body, content_type = entry
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = _QuietServer((host, port), Handler)
+        self.base_url = f"http://{host}:{self._server.server_address[1]}/docs"
+        self._render()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--page-kb', type=int, default=20)
+    parser.add_argument('--fanout', type=int, default=10)
+    parser.add_argument('--sitemap', choices=SITEMAP_SHAPES, default='plain')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    site = DocsSite(args.pages, args.page_kb, args.fanout, args.sitemap, args.latency)
+    print(f"Serving {args.pages} pages at {site.start(port=args.port)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,26 @@
-from .agent import generate_llms_txt
+"""
+Generates llms.txt files for documentation sites.
+
+Submodules load on first use: importing the package, or just the crawlers
+and formatters under `utils`, does not pull in Google ADK. Only
+`llms_txt_agent` loads agent.py and the agent stack.
+"""
+import importlib
+
+__all__ = ["generate_llms_txt", "llms_txt_agent"]
+
+_LAZY = {
+    "generate_llms_txt": ".generator",
+    "llms_txt_agent": ".agent",
+}
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,287 @@
+"""
+Batch generation of llms.txt files for many sites from a manifest.
+
+    python -m llmstxt_generate_agent.batch sites.yaml --output-dir outputs --max-sites 8 --workers 4
+
+The manifest lists one site per entry with `url` and optional `service_name`,
+`version` and per-site options. JSON and YAML manifests are either a list of
+sites or a mapping with `defaults` (options applied to every site) and
+`sites`; CSV manifests have a header row, with `include`/`exclude` globs
+separated by spaces, `content_selectors` separated by commas and booleans
+written as true/false.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from .generator import _derive_service_name, _generate_site
+from .utils.cache import HttpCache, ConversionCache
+from .utils.dedup import NearDuplicateIndex
+from .utils.metrics import Metrics
+from .utils.pipeline import _mp_context
+from .utils.politeness import HostScheduler, RobotsPolicy
+from .utils.transport import HttpTransport, DEFAULT_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Per-site options a manifest may set, with the type of their values
+SITE_OPTIONS = {
+    'output_dir': str,
+    'ignore_sitemap': bool,
+    'incremental': bool,
+    'include': list,
+    'exclude': list,
+    'respect_robots': bool,
+    'checkpoint': bool,
+    'resume': bool,
+    'force_generate': bool,
+    'dedup_threshold': float,
+    'main_content': bool,
+    'content_selectors': list,
+    'converter_engine': str,
+    'max_pages': int,
+    'max_page_bytes': int,
+    'full_index': bool,
+}
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off', '')
+
+@dataclass
+class BatchJob:
+    """One site of a batch."""
+    url: str
+    service_name: str | None = None
+    version: str = "1.0.0"
+    options: dict = field(default_factory=dict)
+
+def _coerce(key: str, value, source: str):
+    kind = SITE_OPTIONS[key]
+    if kind is bool and isinstance(value, str):
+        if value.strip().lower() in _TRUE:
+            return True
+        if value.strip().lower() in _FALSE:
+            return False
+    elif kind is list and isinstance(value, str):
+        if key == 'content_selectors':
+            # CSS selectors contain spaces; separate them with commas
+            return [s.strip() for s in value.split(',') if s.strip()] or None
+        return value.split() or None
+    elif kind is float and isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    elif kind is int and isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    # bool is an int subclass, but `max_pages: true` is a mistake
+    if value is not None and (not isinstance(value, kind) or kind is int and isinstance(value, bool)):
+        raise ValueError(f"{source}: option '{key}' must be a {kind.__name__}, got {value!r}")
+    return value
+
+def _job(entry: dict, defaults: dict, source: str) -> BatchJob:
+    if isinstance(entry, str):
+        entry = {'url': entry}
+    entry = {**defaults, **{k: v for k, v in entry.items() if v not in (None, '')}}
+    url = entry.pop('url', None)
+    if not url:
+        raise ValueError(f"{source}: missing 'url'")
+    service_name = entry.pop('service_name', None)
+    version = str(entry.pop('version', None) or "1.0.0")
+    unknown = set(entry) - set(SITE_OPTIONS)
+    if unknown:
+        raise ValueError(f"{source}: unknown option(s) {', '.join(sorted(unknown))}")
+    options = {key: _coerce(key, value, source) for key, value in entry.items()}
+    if options.get('converter_engine'):
+        from .utils.converter import check_engine
+        try:
+            check_engine(options['converter_engine'])
+        except ValueError as e:
+            raise ValueError(f"{source}: {e}") from None
+    return BatchJob(url, service_name, version, options)
+
+def load_manifest(path: str) -> list[BatchJob]:
+    """Reads a JSON, YAML (needs PyYAML) or CSV batch manifest."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if ext == '.csv':
+            data = list(csv.DictReader(f))
+        elif ext in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML manifests need PyYAML: pip install 'llms-txt-generator[yaml]'") from None
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get('defaults') or {}
+        data = data.get('sites')
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of sites")
+
+    jobs = [_job(entry, defaults, f"{path} site {n + 1}") for n, entry in enumerate(data)]
+    outputs = {}
+    for job in jobs:
+        key = (job.options.get('output_dir'), _derive_service_name(job.url, job.service_name))
+        if key in outputs:
+            raise ValueError(f"{path}: {job.url} and {outputs[key]} would both write '{key[1]}' outputs")
+        outputs[key] = job.url
+    return jobs
+
+def run_batch(jobs: list[BatchJob], output_dir: str = "outputs", max_sites: int = 8, site_concurrency: int = 4,
+              per_host_concurrency: int = 4, workers: int = 1, max_retries: int = 3, cache_dir: str = None,
+              cache_max_bytes: int = 512 * 1024 * 1024, summary_path: str = None) -> list[dict]:
+    """
+    Generates llms.txt files for every job, `max_sites` sites at a time.
+
+    All sites share one HTTP transport, whose HostScheduler keeps every host
+    within `per_host_concurrency` however many sites live on it, one fetch
+    thread pool and, with `workers` above 1, one conversion process pool.
+    Each site may keep only `site_concurrency` fetches on the shared pool, so
+    a slow or throttled site holds its own share of the threads and never
+    the others'. A site that fails is recorded and the batch moves on.
+
+    Returns one summary dict per job, in manifest order, and writes them to
+    `summary_path` (default `{output_dir}/batch-summary.json`).
+    """
+    cache = HttpCache(cache_dir, cache_max_bytes) if cache_dir else None
+    conversion_cache = ConversionCache(os.path.join(cache_dir, "conversions.sqlite"), cache_max_bytes) if cache_dir else None
+    fetch_threads = max_sites * site_concurrency
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_threads, thread_name_prefix="batch-fetch")
+    convert_pool = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) if workers > 1 else None
+    results = [None] * len(jobs)
+    done = 0
+    lock = threading.Lock()
+
+    with HttpTransport(max_retries=max_retries, pool_connections=max_sites * 2, pool_maxsize=site_concurrency,
+                       cache=cache) as transport:
+        robots = RobotsPolicy(transport.session)
+        # Attached up front so _generate_site doesn't create one per site
+        transport.scheduler = HostScheduler(per_host_concurrency, robots=robots)
+
+        def run(job: BatchJob) -> dict:
+            options = dict(job.options)
+            site_output_dir = options.pop('output_dir', None) or output_dir
+            service_name = _derive_service_name(job.url, job.service_name)
+            crawler_options = {
+                'concurrency': site_concurrency,
+                'per_host_concurrency': per_host_concurrency,
+                'queue_size': site_concurrency,
+                'transport': transport,
+                'executor': fetch_pool,
+                'include': options.get('include'),
+                'exclude': options.get('exclude'),
+                'dedup': NearDuplicateIndex(options['dedup_threshold']) if options.get('dedup_threshold') else None,
+                'max_bytes': options.get('max_page_bytes', DEFAULT_MAX_BYTES),
+                'max_pages': options.get('max_pages', 500),
+            }
+            if options.get('respect_robots', True):
+                crawler_options['robots'] = robots
+            # Counts the pages this run writes for the site
+            site_metrics = Metrics()
+            process_options = {
+                'conversion_cache': conversion_cache,
+                'workers': workers,
+                'executor': convert_pool,
+                'main_content': options.get('content_selectors') or options.get('main_content', False),
+                'engine': options.get('converter_engine', 'markdownify'),
+                'metrics': site_metrics,
+                'full_options': {'index': options.get('full_index', False)},
+            }
+            checkpoint_options = {'resume': options.get('resume', False)} if options.get('checkpoint', True) else None
+
+            result = {'url': job.url, 'service_name': service_name, 'version': job.version,
+                      'output_dir': site_output_dir, 'status': 'ok', 'pages': 0, 'error': None}
+            started = time.perf_counter()
+            try:
+                msgs = _generate_site(job.url, service_name, job.version, site_output_dir,
+                                      options.get('ignore_sitemap', False), transport, robots, per_host_concurrency,
+                                      crawler_options, process_options, options.get('incremental', False),
+                                      checkpoint_options, force_generate=options.get('force_generate', False))
+                result['messages'] = msgs
+                # Not the manifest on disk, which may be left over from an earlier run
+                result['pages'] = site_metrics.counters.get('pages_written', 0)
+                if msgs[-1].startswith("[Done]"):
+                    result['status'] = 'official'
+                elif not result['pages']:
+                    result['status'] = 'empty'
+            except Exception as e:
+                logger.exception(f"Batch site {job.url} failed")
+                result['status'] = 'failed'
+                result['error'] = f"{type(e).__name__}: {e}"
+            result['duration_s'] = round(time.perf_counter() - started, 3)
+
+            nonlocal done
+            with lock:
+                done += 1
+                logger.info(f"[{done}/{len(jobs)}] {service_name}: {result['status']}, "
+                            f"{result['pages']} pages in {result['duration_s']:.1f}s")
+            return result
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_sites, thread_name_prefix="batch-site") as sites:
+                futures = {sites.submit(run, job): n for n, job in enumerate(jobs)}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        finally:
+            fetch_pool.shutdown(wait=True, cancel_futures=True)
+            if convert_pool is not None:
+                convert_pool.shutdown(wait=True, cancel_futures=True)
+            if conversion_cache is not None:
+                conversion_cache.close()
+
+    summary_path = summary_path or os.path.join(output_dir, "batch-summary.json")
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump({
+            'sites': len(results),
+            'succeeded': sum(r['status'] == 'ok' for r in results),
+            'failed': sum(r['status'] == 'failed' for r in results),
+            'pages': sum(r['pages'] for r in results),
+            'results': results,
+        }, f, indent=1)
+    logger.info(f"Batch summary written to {summary_path}")
+    return results
+
+def format_summary(results: list[dict]) -> str:
+    width = max([len(r['service_name']) for r in results] + [7])
+    lines = [f"{'service':<{width}}  {'status':<7} {'pages':>6} {'seconds':>8}  error"]
+    for r in results:
+        lines.append(f"{r['service_name']:<{width}}  {r['status']:<7} {r['pages']:>6} {r['duration_s']:>8.1f}  "
+                     f"{r['error'] or ''}")
+    failed = sum(r['status'] == 'failed' for r in results)
+    lines.append(f"{len(results)} sites, {sum(r['pages'] for r in results)} pages, {failed} failed")
+    return "\n".join(lines)
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('manifest', help="JSON, YAML or CSV list of sites")
+    parser.add_argument('--output-dir', default='outputs')
+    parser.add_argument('--max-sites', type=int, default=8, help="sites generated at once")
+    parser.add_argument('--site-concurrency', type=int, default=4, help="fetches in flight per site")
+    parser.add_argument('--per-host-concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=1, help="shared conversion processes")
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--cache-dir')
+    parser.add_argument('--summary', help="summary JSON path (default: OUTPUT_DIR/batch-summary.json)")
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)
+    results = run_batch(jobs, args.output_dir, args.max_sites, args.site_concurrency, args.per_host_concurrency,
+                        args.workers, args.max_retries, args.cache_dir, summary_path=args.summary)
+    print(format_summary(results))
+    return 1 if any(r['status'] == 'failed' for r in results) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,535 @@
+"""
+Crawl-and-generate workflow without the agent stack.
+
+Holds the tools the agent calls and the `generate_llms_txt` facade. Nothing
+here imports Google ADK, so crawler workers and scripts using the facade
+start quickly; agent.py builds the LlmAgent on top of these functions.
+"""
+from .utils.crawlers import SitemapCrawler, RecursiveCrawler
+from .utils.pipeline import convert_pages
+from .utils.converter import check_engine, converter_options_key
+from .utils.formatter import format_llms_txt, LlmsFullWriter
+from .utils.fetcher import fetch_official_llms_txt
+from .utils.discovery import DiscoveryResult, discover
+from .utils.transport import HttpTransport, DEFAULT_MAX_BYTES
+from .utils.archive import CrawlArchive
+from .utils.cache import HttpCache, ConversionCache
+from .utils.manifest import Manifest, ManifestEntry
+from .utils.checkpoint import Checkpoint
+from .utils.politeness import HostScheduler, RobotsPolicy
+from .utils.metrics import Metrics, NULL_METRICS
+from .utils.dedup import NearDuplicateIndex
+from collections import OrderedDict
+from urllib.parse import urlparse
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# --- Helper Functions ---
+
+# crawler_options only the recursive crawler takes
+_STRATEGIES = ('sitemap', 'recursive')
+
+_RECURSIVE_OPTIONS = ('max_pages', 'bloom_error_rate')
+
+def _derive_service_name(url: str, service_name: str = None) -> str:
+    if service_name:
+        return service_name
+    parsed_url = urlparse(url)
+    path_parts = [p for p in parsed_url.path.split('/') if p]
+    if path_parts:
+        return path_parts[-1]
+    return parsed_url.netloc.replace('.', '-')
+
+def _process_and_save_pages(pages, url: str, service_name: str, version: str, output_dir: str,
+                            previous: Manifest = None, conversion_cache: ConversionCache = None,
+                            workers: int = 1, checkpoint: Checkpoint = None, metrics=NULL_METRICS,
+                            executor=None, dedup: NearDuplicateIndex = None, full_options: dict = None,
+                            main_content=False, engine: str = 'markdownify') -> str:
+    """
+    Internal helper to process crawled pages and save them.
+    
+    `pages` is a dict or any iterable of `(url, content)` pairs. Pages are
+    converted and appended to llms-full.txt one at a time, so a crawler
+    generator feeding this function is only ever a few pages ahead of disk.
+    
+    A manifest of the run is written next to the outputs. When `previous` is
+    given, unchanged pages reuse its Markdown and a change report listing
+    added, changed and removed pages is written as well. A `conversion_cache`
+    lets byte-identical HTML skip conversion across runs, and `workers` above 1
+    spreads conversion over a process pool (`executor`, if one is shared).
+    `main_content` converts only each page's main content region, with the
+    converter `engine` given.
+    
+    With a `checkpoint`, pages finished by an interrupted attempt are written
+    first, new pages are recorded as they are converted, and the checkpoint
+    is deleted once the outputs are complete.
+    
+    `full_options` are passed to LlmsFullWriter (sidecar index, sharding,
+    compressed copies).
+    
+    When the crawler deduplicated pages into `dedup`, the merged URLs are
+    listed in a duplicates report next to the outputs.
+    
+    Time spent writing and formatting the outputs is reported to `metrics`.
+    """
+    if isinstance(pages, dict):
+        pages = pages.items()
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    llms_filename = f"{service_name}-llms-v{version}.txt"
+    llms_full_filename = f"{service_name}-llms-full-v{version}.txt"
+    
+    llms_path = os.path.join(output_dir, llms_filename)
+    llms_full_path = os.path.join(output_dir, llms_full_filename)
+    
+    processed_pages = []
+    manifest = Manifest(Manifest.path_for(output_dir, service_name), llms_full_filename,
+                        converter=converter_options_key(main_content, engine))
+    reused_count = 0
+    
+    # Try to find a main title from the base URL page
+    project_title = service_name
+    project_description = "Documentation for the project."
+    
+    converted = convert_pages(pages, previous, conversion_cache, workers, metrics=metrics, executor=executor,
+                              main_content=main_content, engine=engine)
+    if checkpoint is not None:
+        converted = itertools.chain(checkpoint.iter_converted_pages(), _record(converted, checkpoint))
+    
+    full_writer = LlmsFullWriter(llms_full_path, **(full_options or {}))
+    try:
+        for page in converted:
+            if page.url == url:
+                project_title = page.title or project_title
+                project_description = page.description or project_description
+            
+            # Extract metadata for llms.txt
+            processed_pages.append({
+                'url': page.url,
+                'title': page.title or page.url,
+                'description': page.description or ""
+            })
+            
+            with metrics.stage('write'):
+                offset, length = full_writer.write_page(page.url, page.markdown)
+            manifest.add(ManifestEntry(
+                url=page.url, lastmod=page.lastmod, etag=page.etag, content_hash=page.content_hash,
+                title=page.title, description=page.description, offset=offset, length=length
+            ))
+            reused_count += page.reused
+    except BaseException:
+        full_writer.abort()
+        if checkpoint is not None:
+            # Keep what was done for the next attempt
+            checkpoint.close()
+        raise
+    
+    if not processed_pages:
+        full_writer.abort()
+        if checkpoint is not None:
+            checkpoint.discard()
+        return f"No pages found for {url}."
+    
+    logger.info(f"Crawled {len(processed_pages)} pages.")
+    if conversion_cache is not None:
+        logger.info(
+            f"Conversion cache: {conversion_cache.hits} hits, {conversion_cache.misses} misses "
+            f"({conversion_cache.hit_rate:.0%} hit rate)"
+        )
+        
+    # Format and Save
+    with metrics.stage('format'):
+        full_writer.close(project_title)
+        
+        llms_txt_content = format_llms_txt(project_title, project_description, processed_pages)
+        with open(llms_path, "w", encoding="utf-8") as f:
+            f.write(llms_txt_content)
+        
+        # Offsets were recorded relative to the body; shift them past the header
+        for entry in manifest.entries.values():
+            entry.offset += full_writer.header_size
+        manifest.save()
+    metrics.incr('pages_written', len(processed_pages))
+    if checkpoint is not None:
+        checkpoint.discard()
+    
+    result = f"Successfully generated {llms_filename} and {llms_full_filename} in {output_dir}"
+    if full_writer.outputs:
+        result += f" (plus {len(full_writer.outputs)} index, shard and compressed files)"
+    
+    if dedup is not None and dedup.duplicates:
+        duplicates_filename = f"{service_name}-duplicates-v{version}.json"
+        with open(os.path.join(output_dir, duplicates_filename), "w", encoding="utf-8") as f:
+            json.dump({'threshold': dedup.threshold, 'merged': dedup.merged()}, f, indent=1)
+        metrics.incr('pages_deduplicated', len(dedup.duplicates))
+        result += f" ({len(dedup.duplicates)} near-duplicate pages skipped; see {duplicates_filename})"
+    
+    if previous is not None:
+        changes = manifest.diff(previous)
+        changes_filename = f"{service_name}-changes-v{version}.json"
+        with open(os.path.join(output_dir, changes_filename), "w", encoding="utf-8") as f:
+            json.dump(dict(changes, reused=reused_count), f, indent=1)
+        result += (
+            f" ({len(changes['added'])} added, {len(changes['changed'])} changed, "
+            f"{len(changes['removed'])} removed, {reused_count} reused; see {changes_filename})"
+        )
+    
+    return result
+
+def _record(pages, checkpoint: Checkpoint):
+    """Passes converted pages through, adding each to the checkpoint."""
+    for page in pages:
+        checkpoint.add_page(page)
+        yield page
+
+def _open_checkpoint(url: str, strategy: str, service_name: str, version: str, output_dir: str,
+                     checkpoint_options: dict = None, main_content=False,
+                     engine: str = 'markdownify') -> Checkpoint | None:
+    if checkpoint_options is None:
+        return None
+    params = {'url': url, 'strategy': strategy, 'version': version}
+    if main_content:
+        params['main_content'] = main_content
+    if engine != 'markdownify':
+        params['engine'] = engine
+    return Checkpoint(Checkpoint.path_for(output_dir, service_name, strategy), params, **checkpoint_options)
+
+def _load_previous(output_dir: str, service_name: str, main_content=False,
+                   engine: str = 'markdownify') -> Manifest | None:
+    """The previous run's manifest, unless its Markdown was converted with other settings."""
+    previous = Manifest.load(Manifest.path_for(output_dir, service_name))
+    if previous is not None and (previous.converter or converter_options_key()) != converter_options_key(main_content, engine):
+        logger.info("Previous run used other conversion settings; converting every page again")
+        return None
+    return previous
+
+# Discovery results shared by the tool calls of one agent run, so the
+# official check, the sitemap attempt and its fallback probe a site only once.
+# Probes may hold whole official files, so only the latest few sites are kept.
+_DISCOVERY_TTL = 300
+_DISCOVERY_CACHE_SIZE = 32
+_discoveries = OrderedDict() # url -> (monotonic time, DiscoveryResult), least recently used first
+_discoveries_lock = threading.Lock()
+
+def _discovery_for(url: str) -> DiscoveryResult:
+    now = time.monotonic()
+    with _discoveries_lock:
+        cached = _discoveries.get(url)
+        if cached is not None and now - cached[0] < _DISCOVERY_TTL:
+            _discoveries.move_to_end(url)
+            return cached[1]
+    discovery = discover(url)
+    with _discoveries_lock:
+        _discoveries[url] = (now, discovery)
+        _discoveries.move_to_end(url)
+        for key, (stored, _) in list(_discoveries.items()):
+            if now - stored >= _DISCOVERY_TTL:
+                del _discoveries[key]
+        while len(_discoveries) > _DISCOVERY_CACHE_SIZE:
+            _discoveries.popitem(last=False)
+    return discovery
+
+# --- Tools ---
+
+def check_official_docs(url: str, service_name: str = None) -> str:
+    """
+    Checks if the target website already provides an official `llms.txt`.
+    Downloads it to `real-llms-txt/` if found.
+    
+    Args:
+        url: The root URL of the documentation.
+        service_name: Optional name for saving the file.
+    """
+    return _check_official_docs(url, service_name, discovery=_discovery_for(url))
+
+def _check_official_docs(url: str, service_name: str, transport: HttpTransport = None,
+                         discovery: DiscoveryResult = None) -> str:
+    service_name = _derive_service_name(url, service_name)
+    msgs = fetch_official_llms_txt(url, service_name, transport=transport, discovery=discovery)
+    if msgs:
+        return "\n".join(msgs)
+    return "No official llms.txt found at standard locations."
+
+def generate_via_sitemap(url: str, service_name: str = None, version: str = "1.0.0", output_dir: str = "outputs",
+                         workers: int = 1) -> str:
+    """
+    Generates documentation by discovering and crawling sitemaps.
+    Use this method FIRST for generation.
+    Set `workers` above 1 to convert pages on that many CPU cores.
+    """
+    return _generate_via_sitemap(url, service_name, version, output_dir, process_options={'workers': workers},
+                                 discovery=_discovery_for(url))
+
+def generate_via_recursion(url: str, service_name: str = None, version: str = "1.0.0", output_dir: str = "outputs",
+                           workers: int = 1) -> str:
+    """
+    Generates documentation by recursively crawling links (spidering).
+    Use this ONLY if sitemap generation fails.
+    Set `workers` above 1 to convert pages on that many CPU cores.
+    """
+    return _generate_via_recursion(url, service_name, version, output_dir, process_options={'workers': workers})
+
+def _generate_via_sitemap(url: str, service_name: str, version: str, output_dir: str, crawler_options: dict = None,
+                          process_options: dict = None, incremental: bool = False,
+                          discovery: DiscoveryResult = None, checkpoint_options: dict = None) -> str:
+    service_name = _derive_service_name(url, service_name)
+    logger.info(f"Attempting sitemap crawl for {url}")
+    
+    main_content = (process_options or {}).get('main_content', False)
+    engine = (process_options or {}).get('engine', 'markdownify')
+    previous = _load_previous(output_dir, service_name, main_content, engine) if incremental else None
+    checkpoint = _open_checkpoint(url, 'sitemap', service_name, version, output_dir, checkpoint_options,
+                                  main_content, engine)
+    crawler_options = {k: v for k, v in (crawler_options or {}).items() if k not in _RECURSIVE_OPTIONS}
+    crawler = SitemapCrawler(url, manifest=previous, discovery=discovery, checkpoint=checkpoint,
+                             **crawler_options)
+    pages = crawler.iter_pages()
+    
+    # Peek at the first page so an empty sitemap is reported before any output is touched
+    first_page = next(pages, None)
+    if first_page is None and not (checkpoint and checkpoint.resumed_pages):
+        if checkpoint is not None:
+            checkpoint.discard()
+        return f"Sitemap crawl failed: No pages found for {url}. Please try recursive generation."
+        
+    pages = itertools.chain([first_page] if first_page else [], pages)
+    return _process_and_save_pages(pages, url, service_name, version, output_dir,
+                                   previous, checkpoint=checkpoint, dedup=crawler.dedup,
+                                   **(process_options or {}))
+
+def _generate_via_recursion(url: str, service_name: str, version: str, output_dir: str, crawler_options: dict = None,
+                            process_options: dict = None, incremental: bool = False,
+                            checkpoint_options: dict = None) -> str:
+    service_name = _derive_service_name(url, service_name)
+    logger.info(f"Starting recursive crawl for {url}")
+    
+    # Pages still have to be fetched for their links, but unchanged HTML skips conversion
+    main_content = (process_options or {}).get('main_content', False)
+    engine = (process_options or {}).get('engine', 'markdownify')
+    previous = _load_previous(output_dir, service_name, main_content, engine) if incremental else None
+    checkpoint = _open_checkpoint(url, 'recursive', service_name, version, output_dir, checkpoint_options,
+                                  main_content, engine)
+    crawler = RecursiveCrawler(url, checkpoint=checkpoint, **(crawler_options or {}))
+    pages = crawler.iter_pages()
+    
+    return _process_and_save_pages(pages, url, service_name, version, output_dir,
+                                   previous, checkpoint=checkpoint, dedup=crawler.dedup,
+                                   **(process_options or {}))
+
+# --- Facade for CLI Compatibility ---
+
+def _generate_site(url: str, service_name: str, version: str, output_dir: str, ignore_sitemap: bool,
+                   transport: HttpTransport, robots: RobotsPolicy, per_host_concurrency: int,
+                   crawler_options: dict, process_options: dict, incremental: bool,
+                   checkpoint_options: dict, metrics=NULL_METRICS, force_generate: bool = False) -> list[str]:
+    """
+    Runs discovery, the official check and the crawl strategies for one site; returns the step messages.
+    
+    Stops after the official check when the site publishes its own llms.txt,
+    unless `force_generate` is set. The sitemap attempt and its recursive
+    fallback share the discovery result, the robots.txt rules and the transport.
+    """
+    msgs = []
+    
+    # 0. Discovery: official files, robots.txt and sitemap candidates probed concurrently
+    with metrics.stage('discovery'):
+        discovery = discover(url, transport, stop_on_official=not force_generate)
+    msgs.append(
+        f"[Discovery]: {len(discovery.probes)} probes in {discovery.elapsed:.2f}s, "
+        f"sitemap: {discovery.sitemap_url or 'none found'}"
+    )
+    
+    # Throttle everything after discovery per host, reusing the robots.txt it fetched.
+    # A transport shared between sites (batch mode) comes with its scheduler attached,
+    # and one replaying an archive sends nothing to throttle.
+    if any(probe.kind == 'robots' for probe in discovery.probes):
+        robots.seed(url, discovery.robots_txt, discovery.robots_status)
+    replaying = transport.archive is not None and transport.archive.replay
+    if transport.scheduler is None and not replaying:
+        transport.scheduler = HostScheduler(per_host_concurrency, robots=robots)
+    
+    # 1. Official Check
+    with metrics.stage('official_check'):
+        official_res = _check_official_docs(url, service_name, transport, discovery)
+    msgs.append(f"[Official Check]: {official_res}")
+    if discovery.has_official and not force_generate:
+        msgs.append("[Done]: Using the official llms.txt; nothing to generate (pass force_generate=True to crawl anyway).")
+        return msgs
+    
+    # 2. Strategy Selection
+    if ignore_sitemap:
+        res = _generate_via_recursion(url, service_name, version, output_dir, crawler_options, process_options, incremental,
+                                      checkpoint_options)
+        msgs.append(f"[Recursive]: {res}")
+    else:
+        # Try Sitemap
+        res = _generate_via_sitemap(url, service_name, version, output_dir, crawler_options, process_options, incremental,
+                                    discovery, checkpoint_options)
+        if "failed" in res.lower() or "no pages" in res.lower():
+            msgs.append(f"[Sitemap]: {res}")
+            msgs.append("[Fallback]: Switching to recursive strategy...")
+            res_rec = _generate_via_recursion(url, service_name, version, output_dir, crawler_options, process_options, incremental,
+                                              checkpoint_options)
+            msgs.append(f"[Recursive]: {res_rec}")
+        else:
+            msgs.append(f"[Sitemap]: {res}")
+    
+    if checkpoint_options is not None and "Successfully generated" in msgs[-1]:
+        # The outputs are complete: no strategy's checkpoint, including one left by an
+        # earlier interrupted attempt with the other strategy, will be resumed
+        for strategy in _STRATEGIES:
+            Checkpoint.remove(Checkpoint.path_for(output_dir, _derive_service_name(url, service_name), strategy))
+    
+    return msgs
+
+def generate_llms_txt(url: str, service_name: str = None, version: str = "1.0.0", output_dir: str = "outputs", ignore_sitemap: bool = False,
+                      concurrency: int = 8, per_host_concurrency: int = 4,
+                      max_retries: int = 3, pool_size: int = None, incremental: bool = False,
+                      cache_dir: str = None, cache_max_bytes: int = 512 * 1024 * 1024, workers: int = 1,
+                      include: list[str] = None, exclude: list[str] = None,
+                      checkpoint: bool = True, resume: bool = False, respect_robots: bool = True,
+                      report: bool = False, prometheus_path: str = None, metrics: Metrics = None,
+                      force_generate: bool = False, dedup_threshold: float = None, full_index: bool = False,
+                      shard_size: int = None, shard_by_path: int = None, compress: list[str] = None,
+                      max_page_bytes: int = DEFAULT_MAX_BYTES, main_content: bool = False,
+                      content_selectors: list[str] = None, converter_engine: str = 'markdownify',
+                      archive: str = None, replay: bool = False, max_pages: int = 500,
+                      bloom_error_rate: float = None) -> str:
+    """
+    Orchestrator function (Facade) that mimics the agent's decision logic for CLI usage.
+    
+    Like the agent, it stops once an official llms.txt is found and saved;
+    set `force_generate` to crawl and generate regardless.
+    `concurrency` caps the number of pages fetched at once and
+    `per_host_concurrency` caps how many of those may target the same host;
+    within that cap each host's window adapts to its latency and throttling,
+    and requests are spaced by its robots.txt `Crawl-delay`. With
+    `respect_robots`, URLs disallowed by robots.txt are not crawled.
+    `max_retries` and `pool_size` configure the shared HTTP transport; the pool
+    defaults to one keep-alive connection per concurrent fetch.
+    With `incremental`, the manifest of the previous run in `output_dir` is
+    used to only fetch and convert new or changed pages; without `cache_dir`,
+    pages are revalidated against the ETags it recorded.
+    `cache_dir` enables a persistent HTTP cache that revalidates pages with
+    ETag/Last-Modified instead of re-downloading them, and a conversion cache
+    that skips Markdown conversion of HTML seen before. Each is capped at
+    `cache_max_bytes`.
+    `workers` above 1 converts pages to Markdown on that many processes.
+    `include`/`exclude` restrict the crawl with URL globs such as `*/api/*`
+    or regular expressions prefixed with `re:`.
+    The recursive crawl stops after `max_pages` pages. With
+    `bloom_error_rate` (e.g. 0.001) it remembers the URLs it has seen in a
+    fixed-size Bloom filter instead of an exact set, for very large sites.
+    Pages are streamed: responses that are not HTML are closed before their
+    body is downloaded, and pages over `max_page_bytes` are abandoned.
+    With `main_content`, only each page's main content region is converted:
+    the docs-theme container (Sphinx, MkDocs Material, Docusaurus) or
+    `<main>`/`<article>`/`role="main"`, else the block holding most of the
+    non-link text, leaving out sidebars, banners and TOC widgets.
+    `content_selectors` (CSS, implies `main_content`) are tried first, for
+    sites whose theme isn't recognized.
+    `converter_engine='lxml'` converts with a single pass over an lxml tree
+    instead of markdownify, for the same Markdown several times faster.
+    `dedup_threshold` (e.g. 0.95) skips pages whose content fingerprint
+    matches that share of bits with a page already crawled: aliases,
+    versioned copies, print views. They are neither converted nor written,
+    the recursive crawl doesn't follow their links, and the merged URLs are
+    listed in `{service}-duplicates-v{version}.json`.
+    `full_index` writes `{llms-full}.idx.json` next to llms-full.txt, mapping
+    each page URL and heading to byte offsets for utils.full_index.LlmsFullReader.
+    `shard_size` (bytes) or `shard_by_path` (number of leading URL path
+    segments) additionally splits llms-full.txt into shards listed in that
+    index, and `compress` ('gzip', 'zstd') writes compressed copies of it and
+    its shards.
+    `archive` records every response of the crawl (pages, sitemaps,
+    robots.txt, official llms.txt probes) to that WARC file, e.g.
+    `crawl.warc.gz`, with a URL index next to it; with `resume` the file is
+    added to rather than started over. `replay=True` then answers every
+    request from the archive instead of the network, to regenerate the
+    outputs with another service name, version, scope or converter in
+    seconds; URLs the archive lacks are treated as missing pages.
+    With `checkpoint` (the default), crawl progress is saved to `output_dir`
+    as it goes, in `.{service}-{strategy}-checkpoint.sqlite`; `resume=True`
+    continues an interrupted run from it instead of starting over. Only an
+    interrupted run leaves a checkpoint behind: once the outputs are written,
+    the checkpoints of both strategies are deleted.
+    With `report`, per-stage timings, fetch latencies, status codes, bytes
+    and cache hit rates are written to `{service}-run-report.json` next to
+    the outputs; `prometheus_path` writes them as a Prometheus textfile too.
+    Pass a Metrics instance to attach hooks or read the figures afterwards.
+    """
+    check_engine(converter_engine)
+    if replay and not archive:
+        raise ValueError("replay=True needs the path of a recorded archive")
+    if metrics is None:
+        metrics = Metrics() if report or prometheus_path else NULL_METRICS
+    # Replayed responses are never revalidated, so the HTTP cache has nothing to do
+    cache = HttpCache(cache_dir, cache_max_bytes) if cache_dir and not replay else None
+    conversion_cache = ConversionCache(os.path.join(cache_dir, "conversions.sqlite"), cache_max_bytes) if cache_dir else None
+    crawl_archive = CrawlArchive(archive, 'r' if replay else 'a' if resume else 'w') if archive else None
+    with HttpTransport(max_retries=max_retries, pool_maxsize=pool_size or concurrency, cache=cache,
+                       metrics=metrics, archive=crawl_archive) as transport:
+        crawler_options = {
+            'concurrency': concurrency,
+            'per_host_concurrency': per_host_concurrency,
+            'transport': transport,
+            'include': include,
+            'exclude': exclude,
+            'dedup': NearDuplicateIndex(dedup_threshold) if dedup_threshold else None,
+            'max_bytes': max_page_bytes,
+            'max_pages': max_pages,
+            'bloom_error_rate': bloom_error_rate,
+        }
+        process_options = {
+            'conversion_cache': conversion_cache,
+            'workers': workers,
+            'metrics': metrics,
+            'main_content': list(content_selectors) if content_selectors else main_content,
+            'engine': converter_engine,
+            'full_options': {
+                'index': full_index,
+                'shard_size': shard_size,
+                'shard_prefix_depth': shard_by_path,
+                'compress': compress,
+            },
+        }
+        checkpoint_options = {'resume': resume} if checkpoint else None
+        robots = RobotsPolicy(transport.session)
+        if respect_robots:
+            crawler_options['robots'] = robots
+        
+        msgs = _generate_site(url, service_name, version, output_dir, ignore_sitemap, transport, robots,
+                              per_host_concurrency, crawler_options, process_options, incremental,
+                              checkpoint_options, metrics, force_generate)
+        
+        if crawl_archive is not None and replay:
+            msgs.append(f"[Archive]: Replayed {archive}; {crawl_archive.misses} requested URLs were not in it")
+        elif crawl_archive is not None:
+            msgs.append(f"[Archive]: Recorded {crawl_archive.records} responses to {archive}")
+        
+        if metrics.enabled:
+            for name, store in (('http_cache', cache), ('conversion_cache', conversion_cache)):
+                if store is not None:
+                    metrics.set_gauge(f"{name}_hits", store.hits)
+                    metrics.set_gauge(f"{name}_misses", store.misses)
+                    metrics.set_gauge(f"{name}_hit_rate", round(store.hit_rate, 4))
+    
+    if conversion_cache is not None:
+        conversion_cache.close()
+    
+    if report:
+        os.makedirs(output_dir, exist_ok=True)
+        report_path = os.path.join(output_dir, f"{_derive_service_name(url, service_name)}-run-report.json")
+        metrics.write_json(report_path)
+        msgs.append(f"[Report]: {report_path}")
+    if prometheus_path:
+        metrics.write_prometheus(prometheus_path)
+            
+    return "\n\n".join(msgs)
@@ -0,0 +1,273 @@
+"""
+WARC capture of a crawl and offline replay from it.
+
+CrawlArchive appends the responses an HttpTransport receives to a WARC file
+(`.warc.gz`, one gzip member per record, readable by standard WARC tools)
+and writes a JSON-lines index next to it (`{archive}.idx`) with the byte
+range of each URL's latest record. A transport built on a recording archive
+copies every response into it; one built on a replaying archive answers
+every request from it without touching the network, so outputs can be
+regenerated with other settings in seconds.
+
+Payloads are stored as the transport reads them: already decoded, with the
+Content-Encoding and Transfer-Encoding headers removed and Content-Length
+set to the stored length.
+"""
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from .cache import _TRANSFER_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# Larger than any page the crawlers keep, and than the 50 MB sitemap limit
+DEFAULT_MAX_RECORD_BYTES = 64 * 1024 * 1024
+
+_CHUNK_SIZE = 64 * 1024
+
+# Bodies the generator reads: pages, sitemaps, robots.txt and llms.txt files.
+# Other responses (PDFs, images) are archived without their body, which is never read.
+_ARCHIVED_TYPES = ('text/', 'application/xhtml', 'application/xml', 'application/gzip', 'application/x-gzip',
+                   'application/octet-stream')
+
+def index_path_for(archive_path: str) -> str:
+    return f"{archive_path}.idx"
+
+def _archived_type(content_type: str | None) -> bool:
+    content_type = (content_type or '').split(';', 1)[0].strip().lower()
+    return not content_type or content_type.startswith(_ARCHIVED_TYPES) or content_type.endswith('+xml')
+
+def _warc_date() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _raw_response(status: int, reason: str, headers, body: bytes) -> urllib3.HTTPResponse:
+    return urllib3.HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                                preload_content=False, decode_content=False)
+
+class CrawlArchive:
+    """
+    WARC file of crawl responses with a URL index.
+
+    `mode` is 'w' to record a new archive, 'a' to add to an existing one
+    (e.g. when resuming a crawl) and 'r' to replay it. When a URL was
+    recorded more than once, its latest record is replayed. `misses` counts
+    lookups of URLs the archive has no record for.
+    """
+
+    def __init__(self, path: str, mode: str = 'r', max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES):
+        if mode not in ('r', 'w', 'a'):
+            raise ValueError(f"Unknown archive mode {mode!r}; use 'r', 'w' or 'a'")
+        self.path = path
+        self.replay = mode == 'r'
+        self.max_record_bytes = max_record_bytes
+        self.records = 0
+        self.misses = 0
+        self._index = {} # url -> (offset, length)
+        self._lock = threading.Lock()
+        index_path = index_path_for(path)
+
+        if self.replay:
+            if not os.path.exists(index_path):
+                raise FileNotFoundError(f"No crawl archive at {path} (missing index {index_path})")
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    # A crash may leave the last line incomplete
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._index[entry['url']] = (entry['offset'], entry['length'])
+            self._file = open(path, "rb")
+            self._index_file = None
+            logger.info(f"Replaying {len(self._index)} URLs from {path}")
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(path, "wb" if mode == 'w' else "ab")
+            self._index_file = open(index_path, "w" if mode == 'w' else "a", encoding="utf-8")
+            self._write_warcinfo()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def _append(self, url: str | None, warc_headers: list, block: bytes, status: int = None):
+        head = "".join(f"{name}: {value}\r\n" for name, value in warc_headers)
+        record = b"WARC/1.1\r\n" + head.encode("utf-8") + f"Content-Length: {len(block)}\r\n\r\n".encode("ascii")
+        data = gzip.compress(record + block + b"\r\n\r\n", compresslevel=6)
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            if url is not None:
+                self._index[url] = (offset, len(data))
+                self._index_file.write(json.dumps({'url': url, 'offset': offset, 'length': len(data),
+                                                   'status': status}) + "\n")
+                self._index_file.flush()
+                self.records += 1
+
+    def _write_warcinfo(self):
+        info = b"software: llms-txt-generator\r\nformat: WARC File Format 1.1\r\n"
+        self._append(None, [
+            ('WARC-Type', 'warcinfo'),
+            ('WARC-Record-ID', f"<urn:uuid:{uuid.uuid4()}>"),
+            ('WARC-Date', _warc_date()),
+            ('WARC-Filename', os.path.basename(self.path)),
+            ('Content-Type', 'application/warc-fields'),
+        ], info)
+
+    def record(self, url: str, status: int, reason: str | None, headers, body: bytes, truncated: str = None):
+        """
+        Appends a response record for `url`. `truncated` ('length',
+        'unspecified') marks a record whose body was cut short or left out;
+        a 'length' record keeps the Content-Length of `headers`, so a replay
+        turns the body down for its size again.
+        """
+        length = len(body)
+        if truncated == 'length':
+            length = CaseInsensitiveDict(headers).get('Content-Length', length)
+        lines = [f"HTTP/1.1 {status} {reason or ''}".rstrip()]
+        lines.extend(f"{name}: {value}" for name, value in headers.items() if name.lower() not in _TRANSFER_HEADERS)
+        lines.append(f"Content-Length: {length}")
+        block = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", "replace") + body
+        warc_headers = [
+            ('WARC-Type', 'response'),
+            ('WARC-Record-ID', f"<urn:uuid:{uuid.uuid4()}>"),
+            ('WARC-Date', _warc_date()),
+            ('WARC-Target-URI', url),
+            ('Content-Type', 'application/http;msgtype=response'),
+        ]
+        if truncated:
+            warc_headers.append(('WARC-Truncated', truncated))
+        self._append(url, warc_headers, block, status)
+
+    def load(self, url: str) -> tuple[int, str, list, bytes] | None:
+        """Returns `(status, reason, headers, body)` of the latest record for `url`, or None."""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._file.seek(entry[0])
+            data = self._file.read(entry[1])
+        record = gzip.decompress(data)
+        warc_head, _, rest = record.partition(b"\r\n\r\n")
+        length = next(int(line.split(b":", 1)[1]) for line in warc_head.split(b"\r\n")
+                      if line.lower().startswith(b"content-length:"))
+        http_head, _, body = rest[:length].partition(b"\r\n\r\n")
+        status_line, *header_lines = http_head.decode("latin-1").split("\r\n")
+        parts = status_line.split(" ", 2)
+        headers = []
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers.append((name.strip(), value.strip()))
+        return int(parts[1]), parts[2] if len(parts) > 2 else "", headers, body
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            if self._index_file is not None:
+                self._index_file.close()
+        if not self.replay:
+            logger.info(f"Archived {self.records} responses to {self.path}")
+        elif self.misses:
+            logger.info(f"{self.misses} requests were not in the archive {self.path}")
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that copies every GET response into a recording CrawlArchive.
+
+    Bodies of archived content types are read in full (up to the archive's
+    `max_record_bytes`) and handed to the caller from memory; other bodies
+    are left on the wire, and only their headers are archived. Inside
+    `limits()`, the caller's own size cap and content types apply instead,
+    so nothing the caller would reject is buffered.
+    """
+
+    def __init__(self, archive: CrawlArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+        self._local = threading.local()
+
+    @contextmanager
+    def limits(self, max_bytes: int, content_types: tuple | None):
+        """Applies `max_bytes` and `content_types` to the requests this thread sends in the block."""
+        previous = getattr(self._local, 'limits', None)
+        self._local.limits = (max_bytes, content_types)
+        try:
+            yield
+        finally:
+            self._local.limits = previous
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        response = super().send(request, stream=True, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        # A 304 answers our conditional request; the transport archives the cached body instead
+        if request.method != 'GET' or response.status_code == 304:
+            return response
+
+        headers = CaseInsensitiveDict(response.headers)
+        limits = getattr(self._local, 'limits', None)
+        if limits is None:
+            max_bytes, accepted = self.archive.max_record_bytes, _archived_type(headers.get('Content-Type'))
+        else:
+            max_bytes, content_types = limits
+            content_type = (headers.get('Content-Type') or '').split(';', 1)[0].strip().lower()
+            accepted = not content_types or not content_type or content_type in content_types
+        if not accepted:
+            self.archive.record(request.url, response.status_code, response.reason, headers, b'', 'unspecified')
+            return response
+        length = headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > max_bytes and not headers.get('Content-Encoding'):
+            self.archive.record(request.url, response.status_code, response.reason, headers, b'', 'length')
+            return response
+
+        body = bytearray()
+        with response:
+            for chunk in response.iter_content(_CHUNK_SIZE):
+                body += chunk
+                if len(body) > max_bytes:
+                    break
+        body = bytes(body)
+        if len(body) > max_bytes:
+            # The caller gives up on the body; only its headers and size are worth keeping
+            headers['Content-Length'] = str(len(body))
+            self.archive.record(request.url, response.status_code, response.reason, headers, b'', 'length')
+        else:
+            self.archive.record(request.url, response.status_code, response.reason, headers, body)
+
+        for name in _TRANSFER_HEADERS:
+            headers.pop(name, None)
+        headers['Content-Length'] = str(len(body))
+        return self.build_response(request, _raw_response(response.status_code, response.reason, headers, body))
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    HTTPAdapter answering every request from a replaying CrawlArchive.
+
+    URLs the archive has no record for get a 404, so they are skipped as if
+    the site had no such page.
+    """
+
+    def __init__(self, archive: CrawlArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        record = self.archive.load(request.url) if request.method in ('GET', 'HEAD') else None
+        if record is None:
+            logger.debug(f"{request.url} is not in the archive")
+            record = (404, "Not In Archive", [('Content-Type', 'text/plain')], b'')
+        status, reason, headers, body = record
+        return self.build_response(request, _raw_response(status, reason, headers, b'' if request.method == 'HEAD' else body))
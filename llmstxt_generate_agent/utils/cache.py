@@ -0,0 +1,237 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the wire format; cached bodies are stored already decoded
+_TRANSFER_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+class _LruIndex:
+    """
+    SQLite table of cache entries with sizes and access times.
+
+    Keeps a running byte total and evicts least recently used rows once it
+    exceeds `max_bytes`. Subclasses define the table's extra columns and may
+    release external storage in `_on_evict`.
+    """
+
+    table = None
+    columns = None
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        # Entries can always be recomputed, so trade durability for cheap commits
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            f" key TEXT PRIMARY KEY, {self.columns}, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed)")
+        self._db.commit()
+        self._total_bytes = self._db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        # The cap may have been lowered since the cache was last used
+        self._evict()
+        self._db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _touch(self, key: str):
+        self._db.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (time.time(), key))
+
+    def _put(self, key: str, size: int, values: dict):
+        """Inserts or replaces a row; must be called with the lock held."""
+        self._delete(key)
+        names = ", ".join(values)
+        placeholders = ", ".join("?" for _ in values)
+        self._db.execute(
+            f"INSERT INTO {self.table} (key, {names}, size, accessed) VALUES (?, {placeholders}, ?, ?)",
+            (key, *values.values(), size, time.time())
+        )
+        self._total_bytes += size
+        self._evict()
+        self._db.commit()
+
+    def _delete(self, key: str):
+        row = self._db.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        self._total_bytes -= row[0]
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, size in self._db.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed").fetchall():
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._total_bytes -= size
+            self._on_evict(key)
+
+    def _on_evict(self, key: str):
+        pass
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+class HttpCache(_LruIndex):
+    """
+    On-disk HTTP cache with conditional revalidation.
+
+    Stores response bodies plus their `ETag`/`Last-Modified` validators so a
+    repeat request can be sent as `If-None-Match`/`If-Modified-Since` and a
+    `304 Not Modified` answered from disk. Bodies live in individual files;
+    a SQLite index tracks sizes and access times and evicts the least recently
+    used entries once `max_bytes` is exceeded.
+    """
+
+    table = "responses"
+    columns = "etag TEXT, last_modified TEXT, headers TEXT, encoding TEXT"
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self._bodies_dir = os.path.join(directory, "bodies")
+        os.makedirs(self._bodies_dir, exist_ok=True)
+        super().__init__(os.path.join(directory, "index.sqlite"), max_bytes)
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self._bodies_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def validators(self, url: str) -> dict:
+        """Returns the conditional request headers for `url`, empty if it is not cached."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified FROM responses WHERE key = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def load(self, url: str) -> requests.Response | None:
+        """Rebuilds the cached 200 response for `url` and marks it as recently used."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT headers, encoding FROM responses WHERE key = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                with open(self._body_path(url), "rb") as f:
+                    body = f.read()
+            except OSError:
+                self._delete(url)
+                self._db.commit()
+                return None
+            self._touch(url)
+            self._db.commit()
+            self.hits += 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(row[0]))
+        response.encoding = row[1]
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def store(self, url: str, response: requests.Response):
+        """
+        Records a response that was not served from the cache, keeping it if it
+        is a 200 carrying validators that allow revalidation. Only 200s count
+        as misses: errors and redirects (e.g. discovery's 404 probes) are never
+        served from the cache.
+        """
+        if response.status_code != 200:
+            return
+        with self._lock:
+            self.misses += 1
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+
+        body = response.content
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _TRANSFER_HEADERS}
+        with self._lock:
+            with open(self._body_path(url), "wb") as f:
+                f.write(body)
+            self._put(url, len(body), {
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': json.dumps(headers),
+                'encoding': response.encoding,
+            })
+
+    def _on_evict(self, key: str):
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+        logger.debug(f"Evicted {key} from HTTP cache")
+
+class ConversionCache(_LruIndex):
+    """
+    Content-addressed cache of HTML-to-Markdown conversions.
+
+    Entries are keyed by the hash of the page HTML and the converter options,
+    so a byte-identical page skips parsing and conversion entirely no matter
+    which URL or run it came from. Stored in a single SQLite file and bounded
+    by `max_bytes` with LRU eviction. `hits` and `misses` count lookups.
+    """
+
+    table = "conversions"
+    columns = "title TEXT, description TEXT, markdown TEXT NOT NULL"
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(path, max_bytes)
+
+    @staticmethod
+    def key_for(html_hash: str, options: str) -> str:
+        return hashlib.sha256(f"{options}\0{html_hash}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple | None:
+        """Returns `(title, description, markdown)` for `key`, or None on a miss."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT title, description, markdown FROM conversions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(key)
+            self._db.commit()
+        return row
+
+    def put(self, key: str, title: str | None, description: str | None, markdown: str):
+        with self._lock:
+            self._put(key, len(markdown.encode("utf-8")), {
+                'title': title,
+                'description': description,
+                'markdown': markdown,
+            })
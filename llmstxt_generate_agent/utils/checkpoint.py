@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from .pipeline import ConvertedPage
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FORMAT = 1
+
+class Checkpoint:
+    """
+    On-disk crawl state that lets an interrupted run pick up where it stopped.
+
+    Records every URL queued by the recursive crawler (`frontier`) and every
+    page that made it through conversion (`pages`), in order, in a SQLite
+    database in WAL mode. Writes are buffered and committed together once
+    `flush_every` rows are pending or `flush_interval` seconds have passed,
+    so a crash loses at most the last batch; frontier rows are always
+    flushed before the pages whose links produced them.
+
+    The checkpoint belongs to one crawl, identified by `params`; opening it
+    with different params, or with `resume=False`, starts from scratch.
+    Each crawl strategy keeps its own file (see path_for()), so a sitemap
+    attempt never wipes the progress of the recursive crawl it falls back to.
+    """
+
+    def __init__(self, path: str, params: dict, resume: bool = True,
+                 flush_every: int = 256, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._frontier_rows = []
+        self._page_rows = []
+        self._last_flush = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            " seq INTEGER PRIMARY KEY, url TEXT NOT NULL, depth INTEGER NOT NULL, done INTEGER NOT NULL DEFAULT 0);"
+            "CREATE INDEX IF NOT EXISTS frontier_url ON frontier (url);"
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " seq INTEGER PRIMARY KEY, url TEXT NOT NULL, title TEXT, description TEXT, markdown TEXT NOT NULL,"
+            " content_hash TEXT, lastmod TEXT, etag TEXT);"
+        )
+
+        key = json.dumps(dict(params, format=CHECKPOINT_FORMAT), sort_keys=True)
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        if not resume or row is None or row[0] != key:
+            if row is not None:
+                logger.info(f"Discarding previous checkpoint {path}")
+            self._db.executescript("DELETE FROM frontier; DELETE FROM pages; DELETE FROM meta;")
+            self._db.execute("INSERT INTO meta (key, value) VALUES ('params', ?)", (key,))
+        self._db.commit()
+
+        self.resumed_pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        if self.resumed_pages:
+            logger.info(f"Resuming from checkpoint {path}: {self.resumed_pages} pages already done")
+
+    @staticmethod
+    def path_for(output_dir: str, service_name: str, strategy: str) -> str:
+        return os.path.join(output_dir, f".{service_name}-{strategy}-checkpoint.sqlite")
+
+    # --- Reading the previous attempt ---
+
+    def iter_converted_pages(self):
+        """Yields the ConvertedPage of every checkpointed page in the order it was written."""
+        cursor = self._db.execute(
+            "SELECT url, title, description, markdown, content_hash, lastmod, etag FROM pages ORDER BY seq"
+        )
+        for url, title, description, markdown, digest, lastmod, etag in cursor:
+            yield ConvertedPage(url, title, description, markdown,
+                                content_hash=digest, lastmod=lastmod, etag=etag)
+
+    def done_urls(self) -> set[str]:
+        return {url for (url,) in self._db.execute("SELECT url FROM pages")}
+
+    def iter_frontier(self):
+        """Yields `(url, depth, done)` for every queued URL in the order it was queued."""
+        yield from self._db.execute("SELECT url, depth, done FROM frontier ORDER BY seq")
+
+    # --- Recording this attempt ---
+
+    def add_frontier(self, url: str, depth: int):
+        self._frontier_rows.append((url, depth))
+        self._maybe_flush()
+
+    def add_page(self, page: ConvertedPage):
+        self._page_rows.append((page.url, page.title, page.description, page.markdown,
+                                page.content_hash, page.lastmod, page.etag))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        pending = len(self._frontier_rows) + len(self._page_rows)
+        if pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Commits all buffered rows in a single transaction."""
+        if self._frontier_rows or self._page_rows:
+            with self._db:
+                self._db.executemany("INSERT INTO frontier (url, depth) VALUES (?, ?)", self._frontier_rows)
+                self._db.executemany(
+                    "INSERT INTO pages (url, title, description, markdown, content_hash, lastmod, etag)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)", self._page_rows
+                )
+                self._db.executemany("UPDATE frontier SET done = 1 WHERE url = ?",
+                                     [(row[0],) for row in self._page_rows])
+            self._frontier_rows = []
+            self._page_rows = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def discard(self):
+        """Deletes the checkpoint once the run it protects has finished."""
+        self._db.close()
+        self.remove(self.path)
+
+    @staticmethod
+    def remove(path: str):
+        """Deletes the checkpoint database at `path` with its WAL and shared-memory files."""
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
@@ -1,19 +1,173 @@
-from markdownify import markdownify as md
-from bs4 import BeautifulSoup
+import functools
+import json
+from markdownify import MarkdownConverter
+from bs4 import BeautifulSoup, NavigableString, Tag
 
-def html_to_markdown(html_content):
+# lxml is a hard dependency and is several times faster than html.parser
+HTML_PARSER = 'lxml'
+
+# Common distractions removed before conversion
+DISTRACTION_TAGS = ["script", "style", "nav", "footer", "header", "aside"]
+
+# Use heading_style='ATX' for standard # Headings
+MARKDOWN_OPTIONS = {'heading_style': "ATX"}
+
+# markdownify over a BeautifulSoup tree, or the single-pass writer over an
+# lxml tree in lxml_converter.py, which produces the same Markdown faster
+CONVERTER_ENGINES = ('markdownify', 'lxml')
+
+# Main content regions of common docs themes, tried in order before the
+# generic landmarks. The first match with text in it is converted.
+CONTENT_SELECTORS = [
+    # MkDocs Material
+    "article.md-content__inner",
+    # Docusaurus
+    "div.theme-doc-markdown",
+    "article div.markdown",
+    # Sphinx: Read the Docs, Furo, PyData and the classic themes
+    "div[itemprop=articleBody]",
+    "article[role=main]",
+    "article.bd-article",
+    "div.body[role=main]",
+    "div.body",
+    # Generic landmarks
+    "main article",
+    "div[role=main]",
+    "section[role=main]",
+    "main",
+    "article",
+]
+
+# Elements the built-in selectors can match
+_REGION_TAGS = {'div', 'section', 'article', 'main'}
+
+# Text-density fallback: descend into a child while it holds this share of
+# its parent's non-link text
+CONTENT_SHARE = 0.75
+
+# Containers the density fallback may pick
+# (not <section>, which subdivides content rather than the page layout)
+_BLOCK_TAGS = {'div', 'article', 'main', 'td'}
+
+def check_engine(engine: str) -> str:
+    if engine not in CONVERTER_ENGINES:
+        raise ValueError(f"Unknown converter engine {engine!r}; use one of {', '.join(CONVERTER_ENGINES)}")
+    return engine
+
+def converter_options_key(main_content=False, engine: str = 'markdownify') -> str:
+    """Identifies the conversion settings; part of the conversion cache key."""
+    options = {
+        'parser': HTML_PARSER,
+        'distractions': DISTRACTION_TAGS,
+        'markdown': MARKDOWN_OPTIONS,
+    }
+    if main_content:
+        # Left out otherwise, so caches of full-page conversions stay valid
+        options['content_selectors'] = _site_selectors(main_content) + CONTENT_SELECTORS
+        options['content_share'] = CONTENT_SHARE
+    if engine != 'markdownify':
+        options['engine'] = engine
+    return json.dumps(options, sort_keys=True)
+
+def _site_selectors(main_content) -> list[str]:
+    """`main_content` is True for the built-in selectors only, or site-specific selectors tried before them."""
+    if isinstance(main_content, str):
+        return [main_content]
+    if isinstance(main_content, (list, tuple)):
+        return list(main_content)
+    return []
+
+@functools.cache
+def _compiled_selectors() -> list:
+    import soupsieve
+    return [soupsieve.compile(selector) for selector in CONTENT_SELECTORS]
+
+def _densest_block(root):
+    """
+    Text-density fallback for pages without a recognizable content region.
+
+    Sidebars, menus and TOC widgets are mostly link text, so starting from
+    `root` it descends into whichever block child holds most of the non-link
+    text, as long as that child holds CONTENT_SHARE of it.
+    """
+    text = {} # id(tag) -> non-link characters below it
+
+    def count(tag) -> int:
+        total = 0
+        for child in tag.children:
+            if isinstance(child, Tag):
+                if child.name != 'a':
+                    total += count(child)
+            # Plain text only: not comments, scripts or styles
+            elif type(child) is NavigableString:
+                total += len(child.strip())
+        text[id(tag)] = total
+        return total
+
+    count(root)
+    node = root
+    while True:
+        total = text.get(id(node), 0)
+        best = max(node.find_all(_BLOCK_TAGS, recursive=False), key=lambda child: text.get(id(child), 0),
+                   default=None)
+        if best is None or text.get(id(best), 0) < total * CONTENT_SHARE:
+            break
+        node = best
+    return node
+
+def find_main_content(soup, main_content=True):
+    """
+    Returns the tag holding the page's main content, or None to convert the whole page.
+
+    Tries the site-specific selectors in `main_content`, if it is a list,
+    then CONTENT_SELECTORS, and falls back to text density.
+    """
+    for selector in _site_selectors(main_content):
+        # Site-specific selectors may match any element, so they search the whole tree
+        tag = soup.select_one(selector)
+        if tag is not None and tag.get_text(strip=True):
+            return tag
+
+    # The built-in selectors all end in one of _REGION_TAGS, so only those are
+    # matched against them instead of running every selector over the tree
+    regions = [tag for tag in soup.descendants if isinstance(tag, Tag) and tag.name in _REGION_TAGS]
+    for selector in _compiled_selectors():
+        for tag in regions:
+            if selector.match(tag) and tag.get_text(strip=True):
+                return tag
+    root = soup.body or soup
+    node = _densest_block(root)
+    return None if node is root else node
+
+def html_to_markdown(html_content, main_content=False, engine: str = 'markdownify'):
+    """
+    Converts an HTML document to Markdown.
+
+    With `main_content`, only the page's main content region is converted
+    (see find_main_content); pass a list of CSS selectors to try before the
+    built-in docs-theme ones. `engine` is one of CONVERTER_ENGINES.
+    """
     if not html_content:
         return ""
+    if check_engine(engine) == 'lxml':
+        from .lxml_converter import html_to_markdown as lxml_html_to_markdown
+        return lxml_html_to_markdown(html_content, main_content)
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, HTML_PARSER)
+    return soup_to_markdown(soup, main_content)
+
+def soup_to_markdown(soup, main_content=False):
+    """Converts an already parsed document. Distraction tags are removed from `soup` in place."""
+    if main_content:
+        soup = find_main_content(soup, main_content) or soup
     
     # Remove common distractions
-    for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
+    for tag in soup(DISTRACTION_TAGS):
         tag.decompose()
     
-    # Convert remaining HTML to Markdown
-    # Use heading_style='ATX' for standard # Headings
-    markdown = md(str(soup), heading_style="ATX")
+    # Convert remaining HTML to Markdown straight from the tree instead of
+    # serializing it and letting markdownify parse it a second time
+    markdown = MarkdownConverter(**MARKDOWN_OPTIONS).convert_soup(soup)
     
     # Remove excessive blank lines
     lines = markdown.splitlines()
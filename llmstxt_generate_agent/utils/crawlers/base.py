@@ -1,39 +1,99 @@
-import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
+from .engine import FetchEngine
+from .scope import ScopeMatcher
+from ..transport import HttpTransport, FetchResult, DEFAULT_MAX_BYTES, HTML_CONTENT_TYPES, get_default_transport
+from ..parser import ParsedPage
+from ..checkpoint import Checkpoint
+from ..politeness import RobotsPolicy
+from ..dedup import NearDuplicateIndex, content_text, simhash
 
 logger = logging.getLogger(__name__)
 
 class BaseCrawler:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, concurrency: int = 8, per_host_concurrency: int = 4,
+                 transport: HttpTransport = None, queue_size: int = None, include=None, exclude=None,
+                 checkpoint: Checkpoint = None, robots: RobotsPolicy = None, executor: ThreadPoolExecutor = None,
+                 dedup: NearDuplicateIndex = None, max_bytes: int = DEFAULT_MAX_BYTES):
         self.base_url = base_url.rstrip('/')
         self.domain = urlparse(self.base_url).netloc
+        # include/exclude: glob or `re:` regex rules further restricting the crawl
+        self.scope = ScopeMatcher(self.base_url, include, exclude)
+        # Disallow rules are enforced when a robots.txt policy is given
+        self.robots = robots
         self.visited = set()
-        self.pages = {} # url -> content (html)
+        self.pages = {} # url -> ParsedPage, only filled by crawl()
+        self.transport = transport or get_default_transport()
+        # `executor`: fetch thread pool shared with other crawls
+        self.engine = FetchEngine(self.fetch_document, concurrency, per_host_concurrency, executor)
+        # Max pages fetched ahead of the consumer of iter_pages()
+        self.queue_size = queue_size or concurrency * 2
+        # Progress of an interrupted attempt at this crawl; its pages are skipped
+        self.checkpoint = checkpoint
+        # Near-duplicates of pages already crawled are dropped before conversion
+        self.dedup = dedup
+        # Pages larger than this are abandoned mid-download
+        self.max_bytes = max_bytes
+
+    def iter_pages(self):
+        """
+        Yields `(url, page)` pairs in a deterministic order as they are crawled.
+
+        Pages are not retained by the crawler, so memory stays bounded by
+        `queue_size` regardless of the site size.
+        """
+        raise NotImplementedError
+
+    def crawl(self) -> dict:
+        """Crawls the whole site into `self.pages`. Prefer iter_pages() for large sites."""
+        for url, content in self.iter_pages():
+            self.pages[url] = content
+        return self.pages
+
+    def fetch(self, url: str, content_types: tuple = HTML_CONTENT_TYPES, validators: dict = None) -> FetchResult:
+        """Streams `url`, skipping bodies of other content types or over `max_bytes`."""
+        result = self.transport.fetch(url, timeout=10, max_bytes=self.max_bytes, content_types=content_types,
+                                      validators=validators)
+        if result.error is not None:
+            if result.status is not None and result.status < 400:
+                logger.info(f"Skipped {url}: {result.error}")
+            else:
+                logger.warning(f"Failed to fetch {url}: {result.error}")
+        return result
 
     def fetch_page(self, url: str) -> str | None:
-        try:
-            # Basic header to avoid some bot detection, though sophisticated ones will still block
-            headers = {
-                'User-Agent': 'LLMs.txt-Generator/1.0 (+https://github.com/mostlytricks/llms-txt-generator)'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch {url}: {e}")
+        """Fetches any text resource, e.g. robots.txt."""
+        return self.fetch(url, content_types=None).text
+
+    def fetch_document(self, url: str) -> ParsedPage | None:
+        """Fetches an HTML page, keeping its validators for the run manifest."""
+        return self._parse_document(url, self.fetch(url))
+
+    def _parse_document(self, url: str, result: FetchResult) -> ParsedPage | None:
+        if not result.text:
             return None
-    
-    def is_valid_url(self, url: str) -> bool:
-        """Checks if URL is within scope and not an asset."""
-        if not url.startswith(self.base_url):
+        page = ParsedPage(url, result.text, etag=result.headers.get('ETag'))
+        if self.dedup is not None:
+            # Fingerprinted on the fetch thread, checked in crawl order by _is_duplicate()
+            page.fingerprint = simhash(content_text(page.html))
+        return page
+
+    def _is_duplicate(self, url: str, page: ParsedPage) -> bool:
+        if self.dedup is None:
             return False
-            
-        if self.domain not in url:
+        original = self.dedup.add(url, page.fingerprint)
+        if original is None:
             return False
+        logger.info(f"Skipping near-duplicate of {original}: {url}")
+        return True
 
-        # Filter out assets
-        if any(url.lower().endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.css', '.js', '.xml', '.json', '.pdf', '.svg', '.zip']):
+    def fetch_pages(self, urls):
+        """Fetches URLs concurrently, lazily yielding results in the same order as `urls`."""
+        return self.engine.imap(urls, window=self.queue_size)
+    
+    def is_valid_url(self, url: str) -> bool:
+        """Checks if URL is within scope, not an asset and not disallowed by robots.txt."""
+        if not self.scope(url):
             return False
-            
-        return True
+        return self.robots is None or self.robots.allowed(url)
@@ -0,0 +1,78 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class FetchEngine:
+    """
+    Bounded thread-pool fetcher with a global and a per-host concurrency limit.
+
+    Results are always returned in the order the URLs were submitted, no matter
+    which request finishes first, so crawl output stays deterministic.
+
+    Engines of several crawls can share one `executor`; each then keeps at
+    most its window of fetches queued on it, so no crawl can crowd out the
+    others.
+    """
+
+    def __init__(self, fetch, concurrency: int = 8, per_host_concurrency: int = 4,
+                 executor: ThreadPoolExecutor = None):
+        if concurrency < 1 or per_host_concurrency < 1:
+            raise ValueError("Concurrency limits must be at least 1.")
+        self.fetch = fetch
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.executor = executor
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_concurrency)
+                self._host_slots[host] = slot
+            return slot
+
+    def _fetch_limited(self, url: str):
+        with self._slot(url):
+            return self.fetch(url)
+
+    def imap(self, urls, window: int = None):
+        """
+        Lazily fetches `urls`, yielding results in input order.
+
+        At most `window` fetched-but-unconsumed results exist at any time, so
+        a slow consumer stalls the fetchers instead of letting results pile up
+        in memory.
+        """
+        window = max(window or self.concurrency * 2, 1)
+        urls = iter(urls)
+        if self.concurrency == 1 and self.executor is None:
+            for url in urls:
+                yield self.fetch(url)
+            return
+
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.concurrency)
+        pending = deque()
+        try:
+            for url in urls:
+                pending.append(executor.submit(self._fetch_limited, url))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if executor is not self.executor:
+                executor.shutdown(wait=True)
+
+    def map(self, urls: list[str]) -> list:
+        """Fetches all URLs concurrently and returns the results in input order."""
+        # On a shared executor, stay within this engine's share of the threads
+        return list(self.imap(urls, window=len(urls) if self.executor is None else self.concurrency))
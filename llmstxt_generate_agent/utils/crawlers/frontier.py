@@ -0,0 +1,204 @@
+import hashlib
+import logging
+import math
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = frozenset({'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'mc_cid', 'mc_eid', '_ga', 'ref_src'})
+TRACKING_PREFIXES = ('utm_',)
+
+INDEX_FILES = ('index.html', 'index.htm')
+
+def canonicalize_url(url: str) -> str:
+    """
+    Returns the form of `url` that is fetched and reported.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters (utm_*, gclid, fbclid, ...), sorts the remaining query and
+    turns `.../index.html` into its directory URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    netloc = (parts.hostname or '').lower()
+    if ':' in netloc:
+        netloc = f"[{netloc}]" # IPv6 literal
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}{':' + parts.password if parts.password else ''}@{netloc}"
+
+    path = parts.path or '/'
+    head, _, tail = path.rpartition('/')
+    if tail.lower() in INDEX_FILES:
+        path = head + '/'
+
+    query = parts.query
+    if query:
+        # Filter and sort the raw pairs so their encoding is left untouched
+        params = []
+        for pair in query.split('&'):
+            key = pair.split('=', 1)[0].lower()
+            if pair and key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES):
+                params.append(pair)
+        query = '&'.join(sorted(params))
+
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+def url_key(url: str, case_insensitive: bool = False) -> str:
+    """
+    Returns the identity of `url` for deduplication: its canonical form
+    without a trailing slash, so `/docs`, `/docs/` and `/docs/index.html`
+    are one page. Paths are lowercased too when the site is case-insensitive.
+    """
+    parts = urlsplit(canonicalize_url(url))
+    path = parts.path.rstrip('/')
+    if case_insensitive:
+        path = path.lower()
+    return urlunsplit((parts.scheme, parts.netloc, path, parts.query, ''))
+
+def _digest(key: str, size: int) -> bytes:
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=size).digest()
+
+class SeenSet:
+    """
+    Exact set of URL keys stored as 64-bit hashes instead of strings.
+
+    A collision between two distinct URLs is possible but, at around 2**-64
+    per pair, negligible even for millions of URLs.
+    """
+
+    def __init__(self):
+        self._hashes = set()
+
+    def add(self, key: str) -> bool:
+        """Adds `key`, returning False if it was already present."""
+        digest = int.from_bytes(_digest(key, 8), 'little')
+        if digest in self._hashes:
+            return False
+        self._hashes.add(digest)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return int.from_bytes(_digest(key, 8), 'little') in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+class BloomFilter:
+    """
+    Probabilistic set of URL keys with a fixed memory footprint.
+
+    Sized for `capacity` keys at a false-positive rate of `error_rate`; a
+    false positive makes the crawler skip a page it never saw. Beyond
+    `capacity` the rate degrades, which is logged once.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from two independent 64-bit hashes
+        digest = _digest(key, 16)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """Adds `key`, returning False if it was (probably) already present."""
+        new = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self._count += 1
+            if self._count == self.capacity + 1:
+                logger.warning(f"Bloom filter exceeded its capacity of {self.capacity} URLs; "
+                               f"false positives will exceed {self.error_rate}")
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+class Frontier:
+    """
+    Breadth-first queue of URLs to crawl with deduplication on canonical keys.
+
+    URLs are queued per depth level as plain strings rather than
+    `(url, depth)` tuples, and the seen-set holds fixed-width hashes (or
+    bits, with `bloom_error_rate`), so bookkeeping stays small for crawls of
+    hundreds of thousands of pages.
+    """
+
+    def __init__(self, case_insensitive: bool = False, bloom_error_rate: float = None,
+                 bloom_capacity: int = 1_000_000):
+        self.case_insensitive = case_insensitive
+        if bloom_error_rate:
+            self.seen = BloomFilter(bloom_capacity, bloom_error_rate)
+        else:
+            self.seen = SeenSet()
+        self._levels = deque() # deque of URL deques, one per depth
+        self._depth = 0 # Depth of self._levels[0]
+        self._size = 0
+
+    def add(self, url: str, depth: int) -> str | None:
+        """
+        Queues the canonical form of `url` at `depth` unless an equivalent URL
+        was seen before, and returns it (None if it was a duplicate). Depths
+        must not decrease between calls, as in BFS.
+        """
+        if not self.mark_seen(url):
+            return None
+        if not self._levels:
+            self._depth = depth
+        while self._depth + len(self._levels) <= depth:
+            self._levels.append(deque())
+        url = canonicalize_url(url)
+        self._levels[depth - self._depth].append(url)
+        self._size += 1
+        return url
+
+    def mark_seen(self, url: str) -> bool:
+        """Records `url` as seen without queuing it; returns False if it already was."""
+        return self.seen.add(url_key(url, self.case_insensitive))
+
+    def head_depth(self) -> int | None:
+        """Depth of the URL pop() returns next, None when the frontier is empty."""
+        if not self._size:
+            return None
+        while not self._levels[0]:
+            self._levels.popleft()
+            self._depth += 1
+        return self._depth
+
+    def pop(self) -> tuple[str, int]:
+        """Returns the next `(url, depth)` in BFS order."""
+        depth = self.head_depth()
+        self._size -= 1
+        return self._levels[0].popleft(), depth
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
@@ -1,51 +1,102 @@
 import logging
 from collections import deque
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urldefrag
 from .base import BaseCrawler
+from .frontier import Frontier, SeenSet, url_key
 
 logger = logging.getLogger(__name__)
 
 class RecursiveCrawler(BaseCrawler):
-    def __init__(self, base_url: str, max_pages: int = 500, max_depth: int = 5):
-        super().__init__(base_url)
+    """
+    Breadth-first crawl of the pages linked from `base_url`.
+
+    Links are deduplicated on their canonical form (see frontier.url_key);
+    pass `case_insensitive=True` for servers that ignore path case, and a
+    `bloom_error_rate` to track seen URLs in a fixed-size Bloom filter
+    instead of an exact hash set.
+    """
+
+    def __init__(self, base_url: str, max_pages: int = 500, max_depth: int = 5,
+                 case_insensitive: bool = False, bloom_error_rate: float = None, **kwargs):
+        super().__init__(base_url, **kwargs)
         self.max_pages = max_pages
         self.max_depth = max_depth
+        self.case_insensitive = case_insensitive
+        self.bloom_error_rate = bloom_error_rate
+        # Only counted and tested for membership, so keep hashes rather than URLs
+        self.visited = SeenSet()
 
-    def crawl(self):
-        # Queue stores (url, depth)
-        queue = deque([(self.base_url, 0)])
-        
-        # Mark start as seen
-        seen_urls = {self.base_url}
+    def iter_pages(self):
+        frontier = Frontier(
+            case_insensitive=self.case_insensitive,
+            bloom_error_rate=self.bloom_error_rate,
+            # Links beyond max_pages are never fetched, but are still remembered
+            bloom_capacity=max(self.max_pages * 20, 10_000),
+        )
+        if self.robots is not None and not self.robots.allowed(self.base_url):
+            logger.warning(f"robots.txt disallows crawling {self.base_url}")
+            return
+        if not self._restore(frontier):
+            self._queue(frontier, self.base_url, 0)
         
         logger.info(f"Starting recursive crawl from {self.base_url}")
         
-        while queue and len(self.visited) < self.max_pages:
-            current_url, depth = queue.popleft()
-            
+        while frontier and len(self.visited) < self.max_pages:
+            depth = frontier.head_depth()
             if depth > self.max_depth:
-                continue
-            
-            content = self.fetch_page(current_url)
-            if not content:
-                continue
-                
-            self.pages[current_url] = content
-            self.visited.add(current_url)
-            logger.info(f"Crawled (Recursive): {current_url} (Depth {depth})")
-            
-            # Extract links
-            soup = BeautifulSoup(content, 'html.parser')
-            for link in soup.find_all('a', href=True):
-                href = link['href']
+                break
+            # A level is complete before any of its pages is processed, and their links
+            # only go to the next level, so popping the level lazily, as fetch slots free
+            # up, gives exactly the BFS order of fetching pages one by one.
+            # Only `queue_size` URLs of the level are out of the frontier at a time.
+            in_flight = deque()
+            # Pages come back as ParsedPage so metadata and Markdown reuse this parse
+            for page in self.fetch_pages(self._pop_level(frontier, depth, in_flight)):
+                current_url = in_flight.popleft()
+                if page is None:
+                    continue
+                    
+                self.visited.add(url_key(current_url, self.case_insensitive))
+                # A copy of a page already crawled (an alias, a version, a print
+                # view) mostly links to copies too, so its links aren't followed
+                if self._is_duplicate(current_url, page):
+                    continue
+                logger.info(f"Crawled (Recursive): {current_url} (Depth {depth})")
                 
-                # Normalize
-                full_url = urljoin(current_url, href)
-                full_url, _ = urldefrag(full_url) # Remove #fragment
+                # Extract links; the frontier drops URLs it has already seen
+                if depth < self.max_depth:
+                    for full_url in page.links():
+                        if self.is_valid_url(full_url):
+                            self._queue(frontier, full_url, depth + 1)
                 
-                if full_url not in seen_urls and self.is_valid_url(full_url):
-                    seen_urls.add(full_url)
-                    queue.append((full_url, depth + 1))
-        
-        return self.pages
+                yield current_url, page
+
+    def _pop_level(self, frontier: Frontier, depth: int, in_flight: deque):
+        """Pops the URLs of one depth level while the page budget allows, noting each in `in_flight`."""
+        # Fetches still in flight may fail, so they only reserve budget; the caller
+        # comes back for the rest of the level if they do
+        while frontier.head_depth() == depth and len(self.visited) + len(in_flight) < self.max_pages:
+            url, _ = frontier.pop()
+            in_flight.append(url)
+            yield url
+
+    def _queue(self, frontier: Frontier, url: str, depth: int):
+        queued = frontier.add(url, depth)
+        if queued and self.checkpoint is not None:
+            self.checkpoint.add_frontier(queued, depth)
+
+    def _restore(self, frontier: Frontier) -> bool:
+        """Rebuilds the frontier of an interrupted crawl from the checkpoint, if there is one."""
+        if self.checkpoint is None:
+            return False
+        restored = False
+        for url, depth, done in self.checkpoint.iter_frontier():
+            restored = True
+            if done:
+                frontier.mark_seen(url)
+                self.visited.add(url_key(url, self.case_insensitive))
+            else:
+                # Fetched again, links included, since its page never reached the checkpoint
+                frontier.add(url, depth)
+        if restored:
+            logger.info(f"Restored frontier: {len(self.visited)} pages done, {len(frontier)} queued")
+        return restored
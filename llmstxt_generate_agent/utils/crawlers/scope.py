@@ -0,0 +1,53 @@
+import fnmatch
+import re
+
+# File types that are never documentation pages
+ASSET_EXTENSIONS = ('png', 'jpg', 'jpeg', 'gif', 'css', 'js', 'xml', 'json', 'pdf', 'svg', 'zip')
+_ASSET_RE = re.compile(r'\.(?:' + '|'.join(ASSET_EXTENSIONS) + r')$', re.IGNORECASE)
+
+def _compile_rules(patterns) -> re.Pattern | None:
+    """
+    Compiles glob and regex rules into one alternation.
+
+    Rules prefixed with `re:` are regular expressions searched anywhere in
+    the URL; anything else is a glob matched against the whole URL, e.g.
+    `*/api/*` or `https://example.com/docs/v2/*`.
+    """
+    if not patterns:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    parts = []
+    for pattern in patterns:
+        if pattern.startswith('re:'):
+            parts.append(f"(?:.*?(?:{pattern[3:]}))")
+        else:
+            # translate() yields '(?s:...)\\Z'; match() anchors the start
+            parts.append(fnmatch.translate(pattern))
+    return re.compile('|'.join(parts))
+
+class ScopeMatcher:
+    """
+    Decides whether a URL belongs to the crawl.
+
+    A URL is in scope if it starts with `base_url`, is not a static asset,
+    matches at least one `include` rule (when any are given) and no
+    `exclude` rule. Rules are compiled once, so each check is a prefix test
+    plus at most three regex matches.
+    """
+
+    def __init__(self, base_url: str, include=None, exclude=None):
+        self.base_url = base_url
+        self._include = _compile_rules(include)
+        self._exclude = _compile_rules(exclude)
+
+    def __call__(self, url: str) -> bool:
+        if not url.startswith(self.base_url):
+            return False
+        if _ASSET_RE.search(url):
+            return False
+        if self._include is not None and not self._include.match(url):
+            return False
+        if self._exclude is not None and self._exclude.match(url):
+            return False
+        return True
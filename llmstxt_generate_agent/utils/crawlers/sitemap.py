@@ -1,13 +1,46 @@
 import xml.etree.ElementTree as ET
 import logging
-from urllib.parse import urlparse
+from dataclasses import replace
+import requests
+import urllib3
 from .base import BaseCrawler
+from .engine import FetchEngine
+from .sitemap_parser import iter_sitemap, open_sitemap
+from ..discovery import DiscoveryResult, default_sitemap_candidates, robots_sitemaps, robots_url
+from ..manifest import Manifest, ManifestEntry
+from ..parser import ParsedPage
 
 logger = logging.getLogger(__name__)
 
 class SitemapCrawler(BaseCrawler):
+    def __init__(self, base_url: str, manifest: Manifest = None, max_sitemap_depth: int = 3,
+                 discovery: DiscoveryResult = None, **kwargs):
+        """
+        Args:
+            manifest: Manifest of a previous run. URLs whose sitemap `<lastmod>`
+                is unchanged since then are not fetched; their ManifestEntry is
+                yielded in place of a page. Without an HttpCache on the
+                transport, the other pages are requested with the ETag the
+                previous run recorded, and a 304 yields their entry as well.
+            max_sitemap_depth: How many levels of nested sitemap indexes to follow.
+            discovery: Result of discovery.discover() for this site; replaces
+                the robots.txt and sitemap probing done here otherwise.
+        """
+        super().__init__(base_url, **kwargs)
+        self.manifest = manifest
+        self.max_sitemap_depth = max_sitemap_depth
+        self.discovery = discovery
+        self.lastmods = {} # url -> <lastmod> text
+        self._seen_sitemaps = set()
+        self.sitemap_engine = FetchEngine(self._read_sitemap, self.engine.concurrency, self.engine.per_host_concurrency,
+                                          self.engine.executor)
+        if self.checkpoint is not None:
+            self.visited.update(self.checkpoint.done_urls())
+
     def get_sitemap_urls(self):
         """
+        Returns the in-scope page URLs of the first sitemap that has any.
+        
         Try to find sitemaps in 5 common locations/ways:
         1. base_url/sitemap.xml
         2. base_url/sitemap_index.xml
@@ -16,102 +49,146 @@ class SitemapCrawler(BaseCrawler):
         5. robots.txt Sitemap: directive
         """
         
-        candidates = [
-            f"{self.base_url}/sitemap.xml",
-            f"{self.base_url}/sitemap_index.xml",
-            f"{urlparse(self.base_url).scheme}://{self.domain}/sitemap.xml",
-            f"{urlparse(self.base_url).scheme}://{self.domain}/sitemap_index.xml"
-        ]
-        
-        # Add candidates from robots.txt
-        robots_url = f"{urlparse(self.base_url).scheme}://{self.domain}/robots.txt"
-        robots_content = self.fetch_page(robots_url)
-        if robots_content:
-            for line in robots_content.splitlines():
-                if line.lower().startswith('sitemap:'):
-                    candidates.append(line.split(':', 1)[1].strip())
+        if self.discovery is not None:
+            # Reuse the concurrent discovery probes, skipping confirmed misses
+            candidates = [url for url, found in self.discovery.sitemap_candidates if found is not False]
+        else:
+            candidates = default_sitemap_candidates(self.base_url)
+            
+            # Add candidates from robots.txt
+            robots_content = self.fetch_page(robots_url(self.base_url))
+            if robots_content:
+                candidates.extend(robots_sitemaps(robots_content))
 
         # Deduplicate
         candidates = list(dict.fromkeys(candidates))
         
         valid_urls = []
-        found_sitemap = False
 
         for sitemap_url in candidates:
-            # Avoid re-checking if we already found a good sitemap, 
-            # OR we can check all to be comprehensive. 
-            # Let's check until we find something, but sitemap_index might point to others.
-            # For simplicity, we'll try until we find *some* URLs.
-            if found_sitemap and valid_urls:
-                 break
+            # Stop at the first candidate (including its nested sitemaps) that
+            # yields in-scope URLs
+            if valid_urls:
+                break
 
             logger.info(f"Checking for sitemap at: {sitemap_url}")
-            content = self.fetch_page(sitemap_url)
-            if not content:
-                continue
-                
-            try:
-                # Basic check if it's XML-ish
-                if not content.strip().startswith('<'):
-                     continue
-                     
-                root = ET.fromstring(content)
-                # Handle standard namespaces
-                namespaces = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-                
-                # Check for sitemapindex FIRST
-                if 'sitemapindex' in root.tag:
-                    logger.info(f"Found sitemap index at {sitemap_url}, recursing...")
-                    for sitemap_tag in root.findall('.//ns:sitemap', namespaces) or root.findall('.//sitemap'):
-                        loc = sitemap_tag.find('ns:loc', namespaces) if root.find('.//ns:sitemap', namespaces) else sitemap_tag.find('loc')
-                        if loc is not None and loc.text:
-                            # Recurse (simple 1-level for now to avoid infinite loops)
-                            sub_sitemap_url = loc.text.strip()
-                            sub_content = self.fetch_page(sub_sitemap_url)
-                            if sub_content:
-                                try:
-                                    sub_root = ET.fromstring(sub_content)
-                                    valid_urls.extend(self._parse_urlset(sub_root, namespaces))
-                                    found_sitemap = True
-                                except:
-                                    pass
-                else:
-                    # Regular urlset
-                    urls = self._parse_urlset(root, namespaces)
-                    if urls:
-                        valid_urls.extend(urls)
-                        found_sitemap = True
-
-            except ET.ParseError as e:
-                logger.warning(f"Failed to parse sitemap at {sitemap_url}: {e}")
+            valid_urls = self._collect_sitemap_urls(sitemap_url)
                 
         return valid_urls
 
-    def _parse_urlset(self, root, namespaces):
+    def _collect_sitemap_urls(self, sitemap_url: str) -> list[str]:
+        """
+        Walks a sitemap and its nested indexes breadth-first, up to
+        `max_sitemap_depth` levels below `sitemap_url`. Child sitemaps of one
+        level are fetched concurrently, already visited sitemaps are skipped to
+        break cycles, and results keep document order.
+        """
         urls = []
-        for url_tag in root.findall('.//ns:url', namespaces) or root.findall('.//url'):
-            loc = url_tag.find('ns:loc', namespaces) if root.find('.//ns:url', namespaces) else url_tag.find('loc')
-            if loc is not None and loc.text:
-                urls.append(loc.text.strip())
+        level = [sitemap_url]
+        depth = 0
+        
+        while level:
+            self._seen_sitemaps.update(level)
+            next_level = []
+            for page_entries, child_sitemaps in self.sitemap_engine.map(level):
+                for url, lastmod in page_entries:
+                    urls.append(url)
+                    if lastmod:
+                        self.lastmods[url] = lastmod
+                next_level.extend(child_sitemaps)
+            
+            depth += 1
+            next_level = [u for u in dict.fromkeys(next_level) if u not in self._seen_sitemaps]
+            if next_level and depth > self.max_sitemap_depth:
+                logger.warning(f"Not following {len(next_level)} sitemaps nested deeper than {self.max_sitemap_depth} levels")
+                break
+            level = next_level
+            
         return urls
 
-    def crawl(self):
-        all_urls = self.get_sitemap_urls()
+    def _read_sitemap(self, sitemap_url: str) -> tuple[list, list]:
+        """
+        Streams one sitemap document.
         
-        # Filter URLs to match the base_url prefix
-        filtered_urls = [u for u in all_urls if self.is_valid_url(u)]
+        Returns `(entries, child_sitemaps)`: in-scope `(url, lastmod)` page
+        entries and the locations of child sitemaps. Out-of-scope URLs are
+        dropped as they are parsed, so they never accumulate in memory.
+        """
+        entries = []
+        children = []
+        try:
+            response = self.transport.get(sitemap_url, timeout=10, stream=True)
+        except requests.RequestException as e:
+            logger.warning(f"Failed to fetch {sitemap_url}: {e}")
+            return entries, children
         
-        logger.info(f"Sitemap: Found {len(all_urls)} URLs, {len(filtered_urls)} matched prefix {self.base_url}")
+        with response:
+            if response.status_code != 200:
+                logger.debug(f"No sitemap at {sitemap_url} (Status {response.status_code})")
+                return entries, children
+            
+            seen = 0
+            try:
+                for kind, loc, lastmod in iter_sitemap(open_sitemap(response)):
+                    if kind == 'sitemap':
+                        children.append(loc)
+                        continue
+                    seen += 1
+                    if self.is_valid_url(loc):
+                        entries.append((loc, lastmod))
+            except (ET.ParseError, OSError, EOFError, requests.RequestException, urllib3.exceptions.HTTPError) as e:
+                logger.warning(f"Failed to parse sitemap at {sitemap_url}: {e}")
+            
+        if children:
+            logger.info(f"Found sitemap index at {sitemap_url} with {len(children)} sitemaps")
+        if seen:
+            logger.info(f"Sitemap {sitemap_url}: {seen} URLs, {len(entries)} matched prefix {self.base_url}")
+        return entries, children
+
+    def _is_unchanged(self, url: str) -> bool:
+        if self.manifest is None:
+            return False
+        entry = self.manifest.get(url)
+        lastmod = self.lastmods.get(url)
+        return entry is not None and lastmod is not None and entry.lastmod == lastmod
+
+    def fetch_document(self, url: str) -> ParsedPage | ManifestEntry | None:
+        # An HttpCache revalidates on its own, with the body it stored
+        entry = self.manifest.get(url) if self.manifest is not None and self.transport.cache is None else None
+        if entry is None or not entry.etag:
+            return super().fetch_document(url)
+        result = self.fetch(url, validators={'If-None-Match': entry.etag})
+        if result.status == 304:
+            return entry
+        return self._parse_document(url, result)
+
+    def iter_pages(self):
+        # Already filtered to the base_url prefix while the sitemaps were parsed
+        filtered_urls = self.get_sitemap_urls()
         
-        for url in filtered_urls:
-             # Basic safety
-            if url in self.visited:
+        logger.info(f"Sitemap: Found {len(filtered_urls)} URLs matching prefix {self.base_url}")
+        
+        # Preserve sitemap order and drop duplicates before fetching concurrently
+        urls = [u for u in dict.fromkeys(filtered_urls) if u not in self.visited]
+        fetched = self.fetch_pages(u for u in urls if not self._is_unchanged(u))
+        
+        for url in urls:
+            if self._is_unchanged(url):
+                self.visited.add(url)
+                logger.debug(f"Unchanged since last run: {url}")
+                yield url, self.manifest.get(url)
                 continue
 
-            content = self.fetch_page(url)
-            if content:
-                self.pages[url] = content
+            page = next(fetched)
+            if isinstance(page, ManifestEntry):
                 self.visited.add(url)
+                logger.debug(f"Not modified since last run: {url}")
+                yield url, replace(page, lastmod=self.lastmods.get(url))
+                continue
+            if page is not None:
+                page.lastmod = self.lastmods.get(url)
+                self.visited.add(url)
+                if self._is_duplicate(url, page):
+                    continue
                 logger.info(f"Crawled: {url}")
-        
-        return self.pages
+                yield url, page
@@ -0,0 +1,61 @@
+import gzip
+import io
+import xml.etree.ElementTree as ET
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+def open_sitemap(response) -> io.BufferedReader:
+    """
+    Returns a readable stream over a sitemap response body.
+
+    `Content-Encoding` is undone by urllib3 while reading; `.xml.gz` files
+    served as plain binaries are recognised by their magic bytes and
+    decompressed on the fly, so neither is ever fully loaded into memory.
+    """
+    response.raw.decode_content = True
+    # Keep the raw stream readable after EOF so the buffered wrapper can drain it
+    response.raw.auto_close = False
+    stream = io.BufferedReader(response.raw)
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return io.BufferedReader(gzip.GzipFile(fileobj=stream))
+    return stream
+
+def _local_name(tag: str) -> str:
+    # '{http://www.sitemaps.org/schemas/sitemap/0.9}loc' -> 'loc'
+    return tag.rsplit('}', 1)[-1]
+
+def iter_sitemap(stream):
+    """
+    Incrementally parses a `<urlset>` or `<sitemapindex>` document.
+
+    Yields `(kind, loc, lastmod)` where kind is 'url' for pages and 'sitemap'
+    for child sitemaps of an index. Elements are cleared as soon as they are
+    read, so memory does not grow with the number of entries. Namespaced and
+    namespace-less documents are both accepted. Raises ET.ParseError on
+    documents that are not XML.
+    """
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+
+        kind = _local_name(elem.tag)
+        if kind not in ('url', 'sitemap'):
+            continue
+
+        loc = lastmod = None
+        for child in elem:
+            name = _local_name(child.tag)
+            if name == 'loc' and child.text:
+                loc = child.text.strip()
+            elif name == 'lastmod' and child.text:
+                lastmod = child.text.strip()
+        if loc:
+            yield kind, loc, lastmod
+
+        # Drop the finished entry from the tree
+        elem.clear()
+        if root is not None:
+            root.clear()
@@ -0,0 +1,119 @@
+import hashlib
+import html as html_lib
+import re
+import threading
+
+FINGERPRINT_BITS = 64
+
+# Pages with fewer words than this are never treated as duplicates: there is
+# too little text for a meaningful fingerprint (e.g. pages rendered by JavaScript)
+MIN_WORDS = 20
+
+_SKIP_RE = re.compile(
+    r'<!--.*?-->|<(script|style|noscript|svg|template)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL
+)
+# Site chrome shared by every page would make all pages look alike
+_CHROME_RE = re.compile(r'<(nav|header|footer|aside)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_MAIN_RE = re.compile(r'<(main|article)\b[^>]*>(.*?)</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+')
+
+def content_text(html: str) -> str:
+    """
+    Cheap visible-text extraction for fingerprinting, without building a tree.
+
+    Uses the first `<main>` or `<article>` if there is one, and drops
+    scripts, styles and navigation, header, footer and aside blocks.
+    """
+    html = _SKIP_RE.sub(' ', html)
+    main = _MAIN_RE.search(html)
+    if main:
+        html = main.group(2)
+    html = _CHROME_RE.sub(' ', html)
+    return html_lib.unescape(_TAG_RE.sub(' ', html))
+
+def simhash(text: str, shingle: int = 3) -> int | None:
+    """
+    64-bit SimHash of the word `shingle`-grams of `text`, or None if it has fewer than MIN_WORDS words.
+
+    Similar texts get fingerprints differing in few bits, so the share of
+    matching bits estimates how much of the content two pages have in common.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = {" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)}
+    # Count set bits per position over all shingle hashes: one string slice per
+    # bit position instead of a Python loop per bit and shingle
+    bits = "".join(
+        format(int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big"), "064b")
+        for s in shingles
+    )
+    half = len(shingles) / 2
+    fingerprint = 0
+    for position in range(FINGERPRINT_BITS):
+        if bits[position::FINGERPRINT_BITS].count("1") > half:
+            fingerprint |= 1 << (FINGERPRINT_BITS - 1 - position)
+    return fingerprint
+
+def similarity(a: int, b: int) -> float:
+    """Share of the fingerprint bits of `a` and `b` that match."""
+    return 1 - (a ^ b).bit_count() / FINGERPRINT_BITS
+
+class NearDuplicateIndex:
+    """
+    Finds pages whose SimHash is within `threshold` similarity of a page seen before.
+
+    Lookups are sub-linear: the 64 bits are split into `max_distance + 1`
+    bands, and two fingerprints that differ in at most `max_distance` bits
+    agree exactly on at least one band (pigeonhole), so only fingerprints
+    sharing a band are compared. The first page seen of each group is kept;
+    `duplicates` maps every later near-duplicate URL to the URL it matched.
+    """
+
+    def __init__(self, threshold: float = 0.95):
+        if not 0.5 <= threshold <= 1:
+            raise ValueError("threshold must be between 0.5 and 1.")
+        self.threshold = threshold
+        self.max_distance = int(round((1 - threshold) * FINGERPRINT_BITS, 6))
+        bands = self.max_distance + 1
+        width = FINGERPRINT_BITS // bands
+        # (shift, mask) per band; the last band takes the remaining bits
+        self._bands = [
+            (i * width, (1 << (width if i < bands - 1 else FINGERPRINT_BITS - i * width)) - 1)
+            for i in range(bands)
+        ]
+        self._buckets = {} # (band, value) -> [(fingerprint, url)]
+        self.duplicates = {} # duplicate url -> kept url
+        self._lock = threading.Lock()
+
+    def find(self, fingerprint: int) -> str | None:
+        """Returns the URL of a kept page within the threshold of `fingerprint`, if any."""
+        for band, (shift, mask) in enumerate(self._bands):
+            for other, url in self._buckets.get((band, (fingerprint >> shift) & mask), ()):
+                if (fingerprint ^ other).bit_count() <= self.max_distance:
+                    return url
+        return None
+
+    def add(self, url: str, fingerprint: int | None) -> str | None:
+        """
+        Records a page. Returns the URL of the kept page it duplicates, or
+        None if it is kept itself (including pages without a fingerprint).
+        """
+        if fingerprint is None:
+            return None
+        with self._lock:
+            original = self.find(fingerprint)
+            if original is not None:
+                self.duplicates[url] = original
+                return original
+            for band, (shift, mask) in enumerate(self._bands):
+                self._buckets.setdefault((band, (fingerprint >> shift) & mask), []).append((fingerprint, url))
+            return None
+
+    def merged(self) -> dict:
+        """Kept URL -> the near-duplicate URLs collapsed into it, in the order they were found."""
+        groups = {}
+        for url, original in self.duplicates.items():
+            groups.setdefault(original, []).append(url)
+        return groups
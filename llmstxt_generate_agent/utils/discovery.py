@@ -0,0 +1,228 @@
+import logging
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlparse
+import requests
+from .transport import HttpTransport, get_default_transport
+
+logger = logging.getLogger(__name__)
+
+OFFICIAL_FILES = ("llms.txt", "llms-full.txt")
+
+# Bytes read from a sitemap candidate to decide whether it is really a sitemap
+_SITEMAP_SNIFF_BYTES = 1024
+
+# An XML prolog or a sitemap root element, after any BOM and whitespace. SPAs and
+# soft-404 pages answer 200 with HTML, which also starts with '<'.
+_SITEMAP_HEAD_RE = re.compile(rb'^(?:\xef\xbb\xbf)?\s*(?:<\?xml|(?:<!--.*?-->\s*)*<(?:[\w-]+:)?(?:urlset|sitemapindex)\b)',
+                              re.IGNORECASE | re.DOTALL)
+
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+@dataclass
+class ProbeResult:
+    kind: str # 'official', 'robots' or 'sitemap'
+    url: str
+    found: bool = False
+    status: int | None = None
+    elapsed: float = 0.0
+    error: str | None = None
+    text: str | None = None # Body of found official files and robots.txt
+
+@dataclass
+class DiscoveryResult:
+    """
+    Everything learned about a site before crawling it.
+
+    `sitemap_candidates` lists sitemap locations in priority order with their
+    probe outcome: True if the URL served an XML document (gzipped or not)
+    rather than HTML, False if it did not, None if the probe was skipped because a higher-priority
+    sitemap had already been confirmed.
+    """
+    base_url: str
+    probes: list = field(default_factory=list)
+    official: dict = field(default_factory=dict) # file name -> ProbeResult
+    robots_txt: str | None = None
+    robots_status: int | None = None # None if robots.txt could not be fetched
+    sitemap_candidates: list = field(default_factory=list) # [(url, True | False | None)]
+    elapsed: float = 0.0
+
+    @property
+    def has_official(self) -> bool:
+        return bool(self.official)
+
+    @property
+    def sitemap_url(self) -> str | None:
+        """The highest-priority confirmed sitemap, if any."""
+        for url, found in self.sitemap_candidates:
+            if found:
+                return url
+        return None
+
+    def timings(self) -> dict:
+        """Per-probe timings in seconds, keyed by URL."""
+        return {probe.url: round(probe.elapsed, 3) for probe in self.probes}
+
+def official_llms_urls(base_url: str) -> dict:
+    """Maps each official file name to where it is looked for under `base_url`."""
+    root = base_url if base_url.endswith('/') else base_url + '/'
+    return {filename: urljoin(root, filename) for filename in OFFICIAL_FILES}
+
+def default_sitemap_candidates(base_url: str) -> list[str]:
+    """
+    Common sitemap locations, in priority order:
+    1. base_url/sitemap.xml
+    2. base_url/sitemap_index.xml
+    3. domain_root/sitemap.xml
+    4. domain_root/sitemap_index.xml
+    """
+    base_url = base_url.rstrip('/')
+    parsed = urlparse(base_url)
+    root = f"{parsed.scheme}://{parsed.netloc}"
+    return [
+        f"{base_url}/sitemap.xml",
+        f"{base_url}/sitemap_index.xml",
+        f"{root}/sitemap.xml",
+        f"{root}/sitemap_index.xml",
+    ]
+
+def robots_url(base_url: str) -> str:
+    parsed = urlparse(base_url)
+    return f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+
+def robots_sitemaps(robots_txt: str) -> list[str]:
+    """Returns the URLs of `Sitemap:` directives in a robots.txt body."""
+    sitemaps = []
+    for line in robots_txt.splitlines():
+        if line.lower().startswith('sitemap:'):
+            sitemaps.append(line.split(':', 1)[1].strip())
+    return sitemaps
+
+def discover(base_url: str, transport: HttpTransport = None, timeout: float = 10,
+             official_timeout: float = 5, max_workers: int = 8, stop_on_official: bool = False) -> DiscoveryResult:
+    """
+    Probes official llms.txt files, robots.txt and sitemap candidates concurrently.
+
+    Sitemap candidates announced in robots.txt are probed as soon as it
+    arrives. Once the highest-priority sitemap still in the running is
+    confirmed and the official-file probes are done, discovery returns without
+    waiting for lower-priority probes. With `stop_on_official`, an official
+    llms.txt is authoritative on its own: discovery ends as soon as the
+    official-file probes are done, without waiting for robots.txt or sitemaps.
+    """
+    transport = transport or get_default_transport()
+    started = time.perf_counter()
+    result = DiscoveryResult(base_url=base_url)
+
+    candidates = default_sitemap_candidates(base_url)
+    states = {}  # sitemap url -> True | False | None while pending
+    futures = {}
+    robots_pending = True
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(kind, url, probe_timeout):
+        futures[executor.submit(_probe, transport, kind, url, probe_timeout)] = (kind, url)
+
+    for filename, url in official_llms_urls(base_url).items():
+        submit('official', url, official_timeout)
+    submit('robots', robots_url(base_url), timeout)
+    for url in candidates:
+        states[url] = None
+        submit('sitemap', url, timeout)
+
+    def settled() -> bool:
+        if any(kind == 'official' for kind, _ in futures.values()):
+            return False
+        if stop_on_official and 'llms.txt' in result.official:
+            return True
+        for url in candidates:
+            if states[url] is None:
+                # A higher-priority sitemap is still pending, or robots.txt may add more
+                return False
+            if states[url]:
+                # Confirmed candidates are real XML, never an HTML soft 404
+                return True
+        return not robots_pending
+
+    try:
+        while futures and not settled():
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, url = futures.pop(future)
+                probe = future.result()
+                result.probes.append(probe)
+
+                if kind == 'official' and probe.found:
+                    result.official[url.rsplit('/', 1)[-1]] = probe
+                elif kind == 'robots':
+                    robots_pending = False
+                    result.robots_status = probe.status
+                    if probe.found:
+                        result.robots_txt = probe.text
+                        for sitemap_url in robots_sitemaps(probe.text):
+                            if sitemap_url not in states:
+                                candidates.append(sitemap_url)
+                                states[sitemap_url] = None
+                                submit('sitemap', sitemap_url, timeout)
+                elif kind == 'sitemap':
+                    states[url] = probe.found
+    finally:
+        # Lower-priority probes still running are abandoned, not awaited
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    result.sitemap_candidates = [(url, states[url]) for url in candidates]
+    result.elapsed = time.perf_counter() - started
+    logger.info(
+        f"Discovery for {base_url} took {result.elapsed:.2f}s: "
+        f"official={sorted(result.official) or 'none'}, sitemap={result.sitemap_url or 'none'}"
+    )
+    return result
+
+def is_llms_txt(response: requests.Response) -> bool:
+    """
+    Whether a 200 answer to an llms.txt URL is the file itself. HTML, which
+    SPA and soft-404 hosts serve for every path, is not.
+    """
+    content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    if content_type in _HTML_CONTENT_TYPES:
+        return False
+    head = response.text[:256].lstrip('\ufeff \t\r\n').lower()
+    return bool(head) and not head.startswith(('<!doctype', '<html'))
+
+def is_sitemap_head(head: bytes) -> bool:
+    """Whether the first bytes of a body, gzipped or not, start an XML document rather than HTML."""
+    if head.startswith(b'\x1f\x8b'):
+        try:
+            head = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(head)
+        except zlib.error:
+            return False
+    return _SITEMAP_HEAD_RE.match(head) is not None
+
+def _probe(transport: HttpTransport, kind: str, url: str, timeout: float) -> ProbeResult:
+    probe = ProbeResult(kind=kind, url=url)
+    started = time.perf_counter()
+    try:
+        if kind == 'sitemap':
+            # Only sniff the start of the document; the crawler streams the rest
+            with transport.get(url, timeout=timeout, stream=True) as response:
+                probe.status = response.status_code
+                content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+                if response.status_code == 200 and content_type not in _HTML_CONTENT_TYPES:
+                    response.raw.decode_content = True
+                    probe.found = is_sitemap_head(response.raw.read(_SITEMAP_SNIFF_BYTES) or b'')
+        else:
+            response = transport.get(url, timeout=timeout)
+            probe.status = response.status_code
+            if response.status_code == 200:
+                probe.found = kind == 'robots' or is_llms_txt(response)
+                if probe.found:
+                    probe.text = response.text
+    except requests.RequestException as e:
+        probe.error = str(e)
+        logger.debug(f"Discovery probe {url} failed: {e}")
+    probe.elapsed = time.perf_counter() - started
+    return probe
@@ -1,14 +1,19 @@
 import requests
 import os
 import logging
-from urllib.parse import urljoin
+from .discovery import DiscoveryResult, is_llms_txt, official_llms_urls
+from .transport import HttpTransport, get_default_transport
 
 logger = logging.getLogger(__name__)
 
-def fetch_official_llms_txt(base_url: str, service_name: str, output_dir: str = "real-llms-txt") -> list[str]:
+def fetch_official_llms_txt(base_url: str, service_name: str, output_dir: str = "real-llms-txt",
+                            transport: HttpTransport = None, discovery: DiscoveryResult = None) -> list[str]:
     """
     Checks for and downloads official llms.txt and llms-full.txt from the base URL.
     Returns a list of messages describing what was found.
+    
+    When a DiscoveryResult for `base_url` is passed, its probes are used and
+    nothing is fetched again.
     """
     os.makedirs(output_dir, exist_ok=True)
     messages = []
@@ -18,33 +23,29 @@ def fetch_official_llms_txt(base_url: str, service_name: str, output_dir: str =
     # Sometimes it might be at the root of the domain, or at the base_path.
     # We will check the provided base_url location.
     
-    files_to_check = [
-        ("llms.txt", f"{service_name}-official-llms.txt"),
-        ("llms-full.txt", f"{service_name}-official-llms-full.txt")
-    ]
-    
-    headers = {
-        'User-Agent': 'LLMs.txt-Generator/1.0 (+https://github.com/mostlytricks/llms-txt-generator)'
+    save_names = {
+        "llms.txt": f"{service_name}-official-llms.txt",
+        "llms-full.txt": f"{service_name}-official-llms-full.txt"
     }
+    
+    transport = transport or get_default_transport()
 
-    for filename, save_name in files_to_check:
-        target_url = urljoin(base_url if base_url.endswith('/') else base_url + '/', filename)
+    for filename, target_url in official_llms_urls(base_url).items():
+        if discovery is not None:
+            probe = discovery.official.get(filename)
+            if probe is not None:
+                messages.append(_save_official(filename, probe.text, output_dir, save_names[filename]))
+            continue
+        
         try:
             logger.info(f"Checking for official {filename} at {target_url}")
-            response = requests.get(target_url, headers=headers, timeout=5)
+            response = transport.get(target_url, timeout=5)
             
             if response.status_code == 200:
-                # Basic validation that it looks like text
-                if 'text' in response.headers.get('Content-Type', '') or response.text.strip():
-                    save_path = os.path.join(output_dir, save_name)
-                    with open(save_path, 'w', encoding='utf-8') as f:
-                        f.write(response.text)
-                    
-                    msg = f"FOUND and SAVED official {filename} to {save_path}"
-                    logger.info(msg)
-                    messages.append(msg)
+                if is_llms_txt(response):
+                    messages.append(_save_official(filename, response.text, output_dir, save_names[filename]))
                 else:
-                    logger.info(f"Found {target_url} but content-type was not text.")
+                    logger.info(f"Found {target_url} but it was an HTML page, not an llms.txt file.")
             else:
                 logger.debug(f"Official {filename} not found (Status {response.status_code})")
                 
@@ -52,3 +53,12 @@ def fetch_official_llms_txt(base_url: str, service_name: str, output_dir: str =
             logger.warning(f"Error checking for {target_url}: {e}")
 
     return messages
+
+def _save_official(filename: str, text: str, output_dir: str, save_name: str) -> str:
+    save_path = os.path.join(output_dir, save_name)
+    with open(save_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    
+    msg = f"FOUND and SAVED official {filename} to {save_path}"
+    logger.info(msg)
+    return msg
@@ -1,3 +1,11 @@
+import json
+import os
+import shutil
+from .full_index import (
+    COMPRESSIONS, INDEX_FORMAT, check_compression, compress_file, index_path_for, markdown_headings,
+    prefix_shard_key
+)
+
 def format_llms_txt(title, description, pages_info):
     """
     Generates content for llms.txt
@@ -34,6 +42,12 @@ def format_llms_txt(title, description, pages_info):
     
     return "\n".join(lines)
 
+def _format_llms_full_header(title):
+    return f"# {title} - Full Documentation\n"
+
+def _format_llms_full_section(url, content):
+    return f"\n## Page: {url}\n\n{content}\n\n---\n"
+
 def format_llms_full_txt(title, content_map):
     """
     Generates content for llms-full.txt
@@ -45,16 +59,178 @@ def format_llms_full_txt(title, content_map):
     Returns:
         str: Content of llms-full.txt
     """
-    lines = []
-    lines.append(f"# {title} - Full Documentation")
-    lines.append("")
-    
+    parts = [_format_llms_full_header(title)]
     for url, content in content_map.items():
-        lines.append(f"## Page: {url}")
-        lines.append("")
-        lines.append(content)
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        parts.append(_format_llms_full_section(url, content))
+    return "".join(parts)
+
+class LlmsFullWriter:
+    """
+    Writes llms-full.txt incrementally, one page at a time.
+
+    The project title is usually only known once the base page has been seen,
+    so sections are streamed to a `.part` file and the header is prepended on
+    close(). Memory use is independent of the number of pages and the target
+    file is only replaced once the whole document has been written.
+    
+    Optionally also writes:
+    - a sidecar index (`{path}.idx.json`, see full_index.LlmsFullReader)
+      mapping every URL and heading to byte offsets;
+    - shards of the document, split by size or by URL path prefix, each a
+      complete llms-full document of its own, recorded in the index;
+    - gzip and/or zstd compressed copies of the document and its shards.
+    
+    Shards, compressed copies and an index left by an earlier run at `path`
+    that this run does not write again are removed on close().
+    
+    Args:
+        path (str): Destination of llms-full.txt
+        index (bool): Write the sidecar index
+        shard_size (int): Start a new shard once one reaches this many bytes
+        shard_prefix_depth (int): Shard by the first N URL path segments instead
+        compress (list): 'gzip' and/or 'zstd'
+    """
+
+    def __init__(self, path, index=False, shard_size=None, shard_prefix_depth=None, compress=None):
+        self.path = path
+        self.body_path = f"{path}.part"
+        self.page_count = 0
+        self.header_size = 0
+        self.compress = check_compression(compress)
+        self.shard_size = shard_size
+        self.shard_prefix_depth = shard_prefix_depth
+        # Shards are listed in the index, so sharding implies one
+        self.index = index or bool(shard_size or shard_prefix_depth)
+        self.outputs = [] # Extra files written on close()
+        self._sections = [] # (url, section offset, section length, content offset, content length, headings)
+        self._body = open(self.body_path, "wb")
+        self._body_size = 0
+
+    def write_page(self, url, content):
+        """
+        Appends one page section.
         
-    return "\n".join(lines)
+        Returns:
+            tuple: (offset, length) in bytes of `content` within the body. Add
+            `header_size` once the writer is closed to get file offsets.
+        """
+        section = _format_llms_full_section(url, content).encode("utf-8")
+        content_size = len(content.encode("utf-8"))
+        # The content sits between the "## Page" heading and the "---" trailer
+        offset = self._body_size + len(section) - content_size - len("\n\n---\n")
+        if self.index:
+            headings = markdown_headings(section[offset - self._body_size:][:content_size])
+            self._sections.append((url, self._body_size, len(section), offset, content_size, headings))
+        self._body.write(section)
+        self._body_size += len(section)
+        self.page_count += 1
+        return offset, content_size
+
+    def close(self, title):
+        """Writes the final file with `title` as header and removes the temporary body."""
+        self._body.close()
+        previous = self._previous_outputs()
+        header = _format_llms_full_header(title).encode("utf-8")
+        self.header_size = len(header)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(header)
+            with open(self.body_path, "rb") as body:
+                shutil.copyfileobj(body, out)
+        os.replace(tmp_path, self.path)
+        os.remove(self.body_path)
+        
+        shards = self._write_shards(header) if self.shard_size or self.shard_prefix_depth else {}
+        if self.index:
+            self._write_index(title, shards)
+        for method in self.compress:
+            for path in [self.path] + [os.path.join(os.path.dirname(self.path), name) for name in shards]:
+                self.outputs.append(compress_file(path, method))
+        for path in previous.difference(self.outputs):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _previous_outputs(self):
+        """Extra files an earlier run may have left for `path`: its index, the shards it lists and compressed copies."""
+        directory = os.path.dirname(self.path)
+        shards = []
+        try:
+            with open(index_path_for(self.path), "r", encoding="utf-8") as f:
+                shards = [os.path.join(directory, os.path.basename(name)) for name in json.load(f).get('shards', [])]
+        except (OSError, ValueError, AttributeError):
+            pass
+        outputs = {index_path_for(self.path)}
+        for path in [self.path] + shards:
+            if path != self.path:
+                outputs.add(path)
+            outputs.update(path + ext for ext in COMPRESSIONS.values())
+        return outputs
+    
+    def _shard_path(self, key):
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}.{key}{ext}"
+    
+    def _write_shards(self, header):
+        """Copies the sections into shard files; returns shard name -> {url: content offset in the shard}."""
+        assignments = {} # shard key -> [section]
+        if self.shard_prefix_depth:
+            for section in self._sections:
+                assignments.setdefault(prefix_shard_key(section[0], self.shard_prefix_depth), []).append(section)
+        else:
+            part, size = 0, 0
+            for section in self._sections:
+                if size and size + section[2] > self.shard_size:
+                    part, size = part + 1, 0
+                assignments.setdefault(f"part-{part + 1:03d}", []).append(section)
+                size += section[2]
+        
+        shards = {}
+        with open(self.path, "rb") as document:
+            for key, sections in assignments.items():
+                shard_path = self._shard_path(key)
+                offsets = {}
+                with open(f"{shard_path}.tmp", "wb") as out:
+                    out.write(header)
+                    position = len(header)
+                    for url, section_offset, section_length, content_offset, _, _ in sections:
+                        document.seek(self.header_size + section_offset)
+                        out.write(document.read(section_length))
+                        offsets[url] = position + content_offset - section_offset
+                        position += section_length
+                os.replace(f"{shard_path}.tmp", shard_path)
+                shards[os.path.basename(shard_path)] = offsets
+                self.outputs.append(shard_path)
+        return shards
+    
+    def _write_index(self, title, shards):
+        shard_names = list(shards)
+        shard_of = {url: (n, offset) for n, name in enumerate(shard_names) for url, offset in shards[name].items()}
+        pages = {}
+        for url, _, _, content_offset, content_size, headings in self._sections:
+            entry = {
+                'offset': self.header_size + content_offset,
+                'length': content_size,
+                'headings': [list(h) for h in headings],
+            }
+            if url in shard_of:
+                entry['shard'], entry['shard_offset'] = shard_of[url]
+            pages[url] = entry
+        
+        index_path = index_path_for(self.path)
+        with open(f"{index_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                'format': INDEX_FORMAT,
+                'title': title,
+                'file': os.path.basename(self.path),
+                'shards': shard_names,
+                'compressed': list(self.compress),
+                'pages': pages,
+            }, f, ensure_ascii=False)
+        os.replace(f"{index_path}.tmp", index_path)
+        self.outputs.append(index_path)
+
+    def abort(self):
+        """Discards everything written so far, leaving any previous output untouched."""
+        self._body.close()
+        if os.path.exists(self.body_path):
+            os.remove(self.body_path)
@@ -0,0 +1,187 @@
+"""
+Random access to llms-full.txt through a sidecar index.
+
+The index (`{llms-full}.idx.json`) maps every page URL to the byte range of
+its Markdown in the `## Page: {url}` sections, and every Markdown heading of
+the page to its offset within that range. When the output is sharded, it
+also records which shard holds each page and where.
+"""
+import gzip
+import json
+import logging
+import mmap
+import os
+import re
+import shutil
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = 1
+
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+_HEADING_RE = re.compile(rb'^(#{1,6})[ \t]+(.+?)[ \t#]*$')
+_FENCE_RE = re.compile(rb'^[ \t]{0,3}(```|~~~)')
+
+def index_path_for(llms_full_path: str) -> str:
+    return f"{llms_full_path}.idx.json"
+
+def markdown_headings(content: bytes) -> list[tuple[int, str, int]]:
+    """Returns `(level, text, byte offset)` of the ATX headings in `content`, skipping fenced code."""
+    headings = []
+    position = 0
+    fence = None
+    for line in content.split(b'\n'):
+        marker = _FENCE_RE.match(line)
+        if marker:
+            if fence is None:
+                fence = marker.group(1)
+            elif marker.group(1) == fence:
+                fence = None
+        elif fence is None and line.startswith(b'#'):
+            match = _HEADING_RE.match(line)
+            if match:
+                headings.append((len(match.group(1)), match.group(2).decode('utf-8', 'replace'), position))
+        position += len(line) + 1
+    return headings
+
+def prefix_shard_key(url: str, depth: int = 1) -> str:
+    """Shard name for path-prefix sharding: the first `depth` path segments of `url`, as a file-name slug."""
+    segments = [s for s in urlsplit(url).path.split('/') if s][:depth]
+    # The last segment is usually the page itself
+    if segments and '.' in segments[-1]:
+        segments = segments[:-1]
+    return re.sub(r'[^A-Za-z0-9._-]+', '-', '-'.join(segments)).strip('-.') or 'root'
+
+def compress_file(path: str, method: str) -> str:
+    """Writes a compressed copy of `path` next to it and returns its path."""
+    target = path + COMPRESSIONS[method]
+    tmp_path = f"{target}.tmp"
+    with open(path, 'rb') as src:
+        if method == 'gzip':
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        else:
+            import zstandard
+            with open(tmp_path, 'wb') as dst:
+                zstandard.ZstdCompressor(level=10).copy_stream(src, dst)
+    os.replace(tmp_path, target)
+    return target
+
+def check_compression(methods) -> tuple[str, ...]:
+    """Validates compression method names, failing early if zstd is asked for but unavailable."""
+    methods = (methods,) if isinstance(methods, str) else tuple(methods or ())
+    for method in methods:
+        if method not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {method!r}; use one of {', '.join(COMPRESSIONS)}")
+        if method == 'zstd':
+            try:
+                import zstandard # noqa: F401
+            except ImportError:
+                raise ImportError("zstd output needs zstandard: pip install 'llms-txt-generator[compression]'") from None
+    return methods
+
+class LlmsFullReader:
+    """
+    Reads single pages out of llms-full.txt in O(1) using its sidecar index.
+
+    The document, or the shard holding a page when only shards are present,
+    is memory-mapped, so looking up a page reads just its bytes. Shards that
+    are only available compressed are decompressed once, on first access.
+
+        with LlmsFullReader("outputs/adk-llms-full-v1.0.0.txt") as reader:
+            markdown = reader.get("https://example.com/docs/quickstart")
+            section = reader.section("https://example.com/docs/quickstart", "Install")
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(index_path_for(path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('format') != INDEX_FORMAT:
+            raise ValueError(f"Unsupported llms-full index format {index.get('format')}")
+        self.title = index.get('title')
+        self.shards = index.get('shards', [])
+        self.pages = index['pages']
+        self._directory = os.path.dirname(path)
+        self._data = {} # file path -> mmap or bytes
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.pages
+
+    def urls(self) -> list[str]:
+        return list(self.pages)
+
+    def headings(self, url: str) -> list[tuple[int, str]]:
+        """`(level, text)` of the page's headings, in document order."""
+        return [(level, text) for level, text, _ in self.pages[url].get('headings', [])]
+
+    def _open(self, path: str):
+        data = self._data.get(path)
+        if data is None:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+            self._data[path] = data
+        return data
+
+    def _locate(self, url: str):
+        """Returns (buffer, offset, length) of the page's Markdown."""
+        entry = self.pages[url]
+        if os.path.exists(self.path):
+            return self._open(self.path), entry['offset'], entry['length']
+
+        shard = os.path.join(self._directory, self.shards[entry['shard']])
+        if os.path.exists(shard):
+            return self._open(shard), entry['shard_offset'], entry['length']
+        for method, ext in COMPRESSIONS.items():
+            if os.path.exists(shard + ext):
+                data = self._data.get(shard)
+                if data is None:
+                    logger.info(f"Decompressing {shard + ext}")
+                    if method == 'gzip':
+                        with gzip.open(shard + ext, 'rb') as f:
+                            data = f.read()
+                    else:
+                        import zstandard
+                        with open(shard + ext, 'rb') as f:
+                            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+                    self._data[shard] = data
+                return data, entry['shard_offset'], entry['length']
+        raise FileNotFoundError(f"Neither {self.path} nor shard {shard} exists")
+
+    def get(self, url: str) -> str | None:
+        """The page's Markdown, or None if the URL is not in the document."""
+        if url not in self.pages:
+            return None
+        data, offset, length = self._locate(url)
+        return bytes(data[offset:offset + length]).decode('utf-8')
+
+    def section(self, url: str, heading: str) -> str | None:
+        """The part of the page from `heading` up to the next heading of the same or a higher level."""
+        if url not in self.pages:
+            return None
+        headings = self.pages[url].get('headings', [])
+        for n, (level, text, start) in enumerate(headings):
+            if text == heading:
+                end = next((h[2] for h in headings[n + 1:] if h[0] <= level), None)
+                data, offset, length = self._locate(url)
+                end = length if end is None else end
+                return bytes(data[offset + start:offset + end]).decode('utf-8').rstrip('\n')
+        return None
+
+    def close(self):
+        for data in self._data.values():
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._data.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,669 @@
+"""
+The 'lxml' converter engine: HTML to Markdown straight from an lxml tree.
+
+It writes the Markdown the markdownify engine does (converter.MARKDOWN_OPTIONS,
+blank lines removed) for the elements documentation pages are made of, but
+walks the tree libxml2 builds once and appends finished lines to a buffer as
+it goes. There is no BeautifulSoup tree, no string built per element to be
+re-split by its parent, and no blank-line pass over the result.
+
+Only inline markup (links, emphasis, code spans), headings, table cells and
+<pre> blocks are rendered to a string first, since their text has to be
+trimmed or wrapped as a whole.
+"""
+import re
+from lxml import etree
+from .converter import DISTRACTION_TAGS, CONTENT_SELECTORS, CONTENT_SHARE, _BLOCK_TAGS, _site_selectors
+
+_NEWLINE_WS_RE = re.compile(r'[\t \r\n]*[\r\n][\t \r\n]*')
+_WS_RE = re.compile(r'[\t ]+')
+_ALL_WS_RE = re.compile(r'[\t \r\n]+')
+_NEWLINES_RE = re.compile(r'(\n+)')
+_BACKTICKS_RE = re.compile(r'`+')
+_PRE_LSTRIP_RE = re.compile(r'^[ \n]*\n')
+_PRE_RSTRIP_RE = re.compile(r'[ \n]*$')
+
+_HEADINGS = {f'h{n}': n for n in range(1, 10)}
+# Whitespace just inside these is dropped, and just outside them too
+_BLOCK_INSIDE = frozenset({
+    'p', 'blockquote', 'article', 'div', 'section', 'ol', 'ul', 'li', 'dl', 'dt', 'dd',
+    'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th', *_HEADINGS,
+})
+_BLOCK_OUTSIDE = _BLOCK_INSIDE | {'pre'}
+_SKIPPED = frozenset(DISTRACTION_TAGS)
+_STRIP = ' \t\r\n'
+
+# Context flags, the markdownify parent tags that change how text is written
+_PRE = 1 # inside <pre>: whitespace is kept
+_NOFORMAT = 2 # inside <pre> or code: no escaping or inline markup
+_INLINE = 4 # inside a heading or table cell: blocks become spaces
+_LI = 8 # inside a list item
+_UL = 16 # added per enclosing <ul>, for the bullet style
+
+_CHILD_FLAGS = {'pre': _PRE | _NOFORMAT, 'code': _NOFORMAT, 'kbd': _NOFORMAT, 'samp': _NOFORMAT,
+                'td': _INLINE, 'th': _INLINE, 'li': _LI, **{h: _INLINE for h in _HEADINGS}}
+
+_BULLETS = '*+-'
+
+_INLINE_MARKUP = {'b': '**', 'strong': '**', 'em': '*', 'i': '*', 'del': '~~', 's': '~~', 'sub': '', 'sup': ''}
+
+# Site chrome and scripts do not count towards a block's text
+_NO_TEXT = frozenset({'script', 'style', 'template'})
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# XPath equivalents of converter.CONTENT_SELECTORS
+_CONTENT_XPATHS = {
+    "article.md-content__inner": f"//article[{_has_class('md-content__inner')}]",
+    "div.theme-doc-markdown": f"//div[{_has_class('theme-doc-markdown')}]",
+    "article div.markdown": f"//article//div[{_has_class('markdown')}]",
+    "div[itemprop=articleBody]": "//div[@itemprop='articleBody']",
+    "article[role=main]": "//article[@role='main']",
+    "article.bd-article": f"//article[{_has_class('bd-article')}]",
+    "div.body[role=main]": f"//div[{_has_class('body')}][@role='main']",
+    "div.body": f"//div[{_has_class('body')}]",
+    "main article": "//main//article",
+    "div[role=main]": "//div[@role='main']",
+    "section[role=main]": "//section[@role='main']",
+    "main": "//main",
+    "article": "//article",
+}
+_CONTENT_MATCHERS = [etree.XPath(_CONTENT_XPATHS[selector]) for selector in CONTENT_SELECTORS]
+_TEXT_NODES = etree.XPath('.//text()')
+
+class _Frame:
+    """An element whose text is trimmed as a whole (markdownify's text.strip())."""
+    __slots__ = ('lstrip', 'rstrip', 'prefix', 'saved', 'content')
+
+    def __init__(self, lstrip, rstrip, prefix, saved):
+        self.lstrip = lstrip # characters, None for any whitespace, or False to keep
+        self.rstrip = rstrip
+        self.prefix = prefix
+        self.saved = saved # deferred output to restore if the element turns out empty
+        self.content = False
+
+class _Prefix:
+    """Line prefix of a list item, definition or blockquote: `first` on its first line, `rest` after."""
+    __slots__ = ('first', 'rest', 'quote', 'used')
+
+    def __init__(self, first: str, rest: str, quote: bool = False):
+        self.first = first
+        self.rest = rest
+        self.quote = quote
+        self.used = False
+
+class _Writer:
+    """
+    Line buffer the tree is written to.
+
+    Newlines and whitespace after the last text are held back in `deferred`
+    until more text follows: that is where consecutive block separators
+    collapse, and an element that trims its text can drop them. Finished
+    lines get the list and blockquote prefixes open at the time; in the
+    top-level writer, lines without text are dropped as they are finished.
+    """
+
+    def __init__(self, top: bool = True, collapse: bool = True):
+        self.top = top
+        self.collapse = collapse # False inside <pre>, where newlines add up
+        self.lines = []
+        self.parts = [] # the current line
+        self.line_open = False
+        self.deferred = [] # newline counts and whitespace strings
+        self.frames = []
+        self.prefixes = []
+        self.unstarted = 0 # frames trimming leading whitespace that have no text yet
+        self.lead = 0 # newlines before the first line, kept by captures
+
+    def newline(self, count: int, add: bool = False):
+        if self.unstarted:
+            return
+        deferred = self.deferred
+        if deferred and type(deferred[-1]) is int:
+            if add or not self.collapse:
+                deferred[-1] += count
+            else:
+                deferred[-1] = min(2, max(deferred[-1], count))
+        else:
+            deferred.append(count)
+
+    def write(self, s: str):
+        """Writes text without newlines."""
+        if self.unstarted:
+            s = s.lstrip(self._lstrip_chars())
+            if not s:
+                return
+        elif not s.strip(_STRIP):
+            # Whitespace is only written once text follows it
+            if self.deferred or (self.frames and not self.frames[-1].content):
+                self.deferred.append(s)
+            elif s:
+                self._append(s)
+            return
+        if self.frames and not self.frames[-1].content:
+            for frame in reversed(self.frames):
+                if frame.content:
+                    break
+                frame.content = True
+            self.unstarted = 0
+        if self.deferred:
+            self._materialize()
+        if self.line_open and self.prefixes and not self.prefixes[-1].used:
+            # A list item starting mid-line still gets its bullet
+            for prefix in self.prefixes:
+                if not prefix.used:
+                    self.parts.append(prefix.first)
+                    prefix.used = True
+        self._append(s)
+
+    def text(self, s: str):
+        """Writes text that may contain newlines."""
+        if '\n' not in s:
+            if s:
+                self.write(s)
+            return
+        for n, piece in enumerate(_NEWLINES_RE.split(s)):
+            if n % 2:
+                self.newline(len(piece))
+            elif piece:
+                self.write(piece)
+
+    def open_frame(self, lead: int, lstrip, rstrip, prefix: _Prefix = None):
+        frame = _Frame(lstrip, rstrip, prefix, list(self.deferred))
+        if lead:
+            self.newline(lead)
+        self.frames.append(frame)
+        if lstrip is not False:
+            self.unstarted += 1
+        if prefix is not None:
+            self.prefixes.append(prefix)
+
+    def close_frame(self, trail: int = 0, empty: int = 0):
+        frame = self.frames.pop()
+        if frame.prefix is not None:
+            self.prefixes.pop()
+        if frame.content:
+            if frame.rstrip is not False:
+                self.deferred = []
+                if self.line_open:
+                    line = "".join(self.parts)
+                    self.parts = [line.rstrip(frame.rstrip)]
+            if trail:
+                self.newline(trail)
+        else:
+            if frame.lstrip is not False:
+                self.unstarted -= 1
+            self.deferred = frame.saved
+            if empty:
+                self.newline(empty)
+
+    def getvalue(self) -> str:
+        if self.top:
+            if self.line_open:
+                self._end_line()
+            return "\n".join(self.lines)
+        lines = self.lines + ["".join(self.parts)] if self.line_open else self.lines
+        trailing = "".join('\n' * item if type(item) is int else item for item in self.deferred)
+        return '\n' * self.lead + "\n".join(lines) + trailing
+
+    def _lstrip_chars(self):
+        for frame in reversed(self.frames):
+            if frame.content:
+                break
+            if frame.lstrip is None:
+                return None
+        return _STRIP
+
+    def _materialize(self):
+        for item in self.deferred:
+            if type(item) is not int:
+                self._append(item)
+            elif self.line_open:
+                self._end_line()
+                for _ in range(item - 1):
+                    self._blank_line()
+            elif not self.lines:
+                self.lead += item
+        self.deferred = []
+
+    def _append(self, s: str):
+        if self.line_open:
+            self.parts.append(s)
+            return
+        prefix = ""
+        for p in reversed(self.prefixes):
+            prefix = (p.rest if p.used else p.first) + prefix
+            p.used = True
+        self.parts = [prefix, s] if prefix else [s]
+        self.line_open = True
+
+    def _end_line(self):
+        line = "".join(self.parts)
+        self.parts = []
+        self.line_open = False
+        if not self.top:
+            self.lines.append(line)
+        else:
+            # Like str.splitlines() on the whole document: \r and the like end lines too
+            self.lines.extend(piece for piece in line.splitlines() if piece.strip())
+
+    def _blank_line(self):
+        # Blank lines only survive inside blockquotes, as '>'
+        line = ""
+        for p in reversed(self.prefixes):
+            if p.quote:
+                if p.used:
+                    line = "> " + line if line else ">"
+            elif line:
+                line = p.rest + line
+        if line or not self.top:
+            self.lines.append(line)
+
+def _outside(item) -> bool:
+    return item is not None and type(item) is not str and item.tag in _BLOCK_OUTSIDE
+
+def _chomp(text: str) -> tuple[str, str, str]:
+    prefix = ' ' if text and text[0] == ' ' else ''
+    suffix = ' ' if text and text[-1] == ' ' else ''
+    return prefix, suffix, text.strip()
+
+def _colspan(cell) -> int:
+    value = cell.get('colspan')
+    return max(1, min(1000, int(value))) if value is not None and value.isdigit() else 1
+
+def _previous_tag(el):
+    el = el.getprevious()
+    while el is not None and (type(el.tag) is not str or el.tag in _SKIPPED):
+        el = el.getprevious()
+    return el
+
+class _Converter:
+    """Walks an element tree into a _Writer; one instance per document."""
+
+    def convert(self, root) -> str:
+        out = _Writer()
+        self.element(root, out, 0)
+        return out.getvalue()
+
+    def children(self, el, out: _Writer, ctx: int):
+        items = []
+        if el.text:
+            items.append(el.text)
+        for child in el:
+            if child.tag not in _SKIPPED:
+                items.append(child)
+            if child.tail:
+                items.append(child.tail)
+
+        inside = el.tag in _BLOCK_INSIDE
+        last = len(items) - 1
+        for n, item in enumerate(items):
+            if type(item) is str:
+                prev = items[n - 1] if n else None
+                nxt = items[n + 1] if n < last else None
+                if not item.strip():
+                    if (inside and (prev is None or nxt is None)) or _outside(prev) or _outside(nxt):
+                        continue
+                if not ctx & _PRE:
+                    item = _WS_RE.sub(' ', _NEWLINE_WS_RE.sub('\n', item))
+                if not ctx & _NOFORMAT:
+                    item = item.replace('*', r'\*').replace('_', r'\_')
+                if _outside(prev) or (inside and prev is None):
+                    item = item.lstrip(_STRIP)
+                if _outside(nxt) or (inside and nxt is None):
+                    item = item.rstrip()
+                out.text(item)
+            elif type(item.tag) is str:
+                if item.tag in ('ul', 'ol') and not ctx & _LI:
+                    self.list(item, out, ctx, self._before_paragraph(items, n))
+                else:
+                    self.element(item, out, ctx)
+
+    def element(self, el, out: _Writer, ctx: int):
+        tag = el.tag
+        handler = self._handlers.get(tag)
+        if handler is not None:
+            handler(self, el, out, ctx)
+        elif tag in _HEADINGS:
+            self.heading(el, out, ctx)
+        else:
+            self.children(el, out, ctx | _CHILD_FLAGS.get(tag, 0))
+
+    def capture(self, el, ctx: int, collapse: bool = True) -> str:
+        """Renders the children of `el` to a string, markdownify style."""
+        if not len(el):
+            # No child elements: just the text
+            text = el.text
+            if not text or (not text.strip() and el.tag in _BLOCK_INSIDE):
+                return ""
+            if not ctx & _PRE:
+                text = _WS_RE.sub(' ', _NEWLINE_WS_RE.sub('\n', text))
+            if not ctx & _NOFORMAT:
+                text = text.replace('*', r'\*').replace('_', r'\_')
+            if el.tag in _BLOCK_INSIDE:
+                text = text.lstrip(_STRIP).rstrip()
+            return text
+        out = _Writer(top=False, collapse=collapse)
+        self.children(el, out, ctx)
+        return out.getvalue()
+
+    @staticmethod
+    def _before_paragraph(items: list, n: int) -> bool:
+        for item in items[n + 1:]:
+            if type(item) is str:
+                if item.strip():
+                    return True
+            elif type(item.tag) is str:
+                return item.tag not in ('ul', 'ol')
+        return False
+
+    # --- Blocks ---
+
+    def block(self, el, out: _Writer, ctx: int):
+        """<p>, <div>, <article>, <section>, <dl>: a paragraph."""
+        chars = _STRIP if el.tag == 'p' else None
+        if ctx & _INLINE:
+            out.text(' ' + self.capture(el, ctx).strip(chars) + ' ')
+            return
+        out.open_frame(2, chars, chars)
+        self.children(el, out, ctx)
+        out.close_frame(2)
+
+    def heading(self, el, out: _Writer, ctx: int):
+        if ctx & _INLINE:
+            self.children(el, out, ctx)
+            return
+        text = _ALL_WS_RE.sub(' ', self.capture(el, ctx | _INLINE).strip())
+        out.newline(2)
+        out.write('#' * min(6, _HEADINGS[el.tag]) + ' ' + text)
+        out.newline(2)
+
+    def blockquote(self, el, out: _Writer, ctx: int):
+        if ctx & _INLINE:
+            out.text(' ' + self.capture(el, ctx).strip(_STRIP) + ' ')
+            return
+        out.open_frame(1, _STRIP, _STRIP, _Prefix("> ", "> ", quote=True))
+        self.children(el, out, ctx)
+        out.close_frame(2, empty=1)
+
+    def list(self, el, out: _Writer, ctx: int, before_paragraph: bool = False):
+        if el.tag == 'ul':
+            ctx += _UL
+        if ctx & _LI:
+            # Nested list: on the lines after its item's text
+            out.open_frame(1, False, None)
+            self.children(el, out, ctx)
+            out.close_frame(empty=1)
+            return
+        out.newline(2)
+        self.children(el, out, ctx)
+        if before_paragraph:
+            out.newline(1, add=True)
+
+    def li(self, el, out: _Writer, ctx: int):
+        parent = el.getparent()
+        if parent is not None and parent.tag == 'ol':
+            start = parent.get('start')
+            start = int(start) if start and start.isnumeric() else 1
+            bullet = f"{start + sum(1 for _ in el.itersiblings('li', preceding=True))}. "
+        else:
+            bullet = _BULLETS[(ctx // _UL - 1) % len(_BULLETS)] + ' '
+        out.open_frame(0, None, None, _Prefix(bullet, ' ' * len(bullet)))
+        self.children(el, out, ctx | _LI)
+        out.close_frame(1, empty=1)
+
+    def pre(self, el, out: _Writer, ctx: int):
+        text = self.capture(el, ctx | _PRE | _NOFORMAT, collapse=False)
+        if not text:
+            return
+        text = _PRE_RSTRIP_RE.sub('', _PRE_LSTRIP_RE.sub('', text))
+        out.newline(2)
+        out.write('```')
+        out.newline(1)
+        out.text(text)
+        out.newline(1, add=True)
+        out.write('```')
+        out.newline(2)
+
+    def hr(self, el, out: _Writer, ctx: int):
+        out.newline(2)
+        out.write('---')
+        out.newline(2)
+
+    def br(self, el, out: _Writer, ctx: int):
+        if ctx & _INLINE:
+            out.write(' ')
+        else:
+            out.write('  ')
+            out.newline(1)
+
+    def table(self, el, out: _Writer, ctx: int):
+        out.open_frame(2, None, None)
+        self.children(el, out, ctx)
+        out.close_frame(2, empty=2)
+
+    def tr(self, el, out: _Writer, ctx: int):
+        cells = list(el.iter('td', 'th'))
+        parent = el.getparent()
+        first_row = _previous_tag(el) is None
+        head_row = (all(cell.tag == 'th' for cell in cells)
+                    or (parent.tag == 'thead' and sum(1 for _ in parent.iter('tr')) == 1))
+        grandparent = parent.getparent()
+        head_row_missing = first_row and (
+            parent.tag != 'tbody'
+            or grandparent is None or next(grandparent.iter('thead'), None) is None
+        )
+        columns = sum(_colspan(cell) for cell in cells)
+        underline = None
+        if head_row and first_row:
+            underline = '| ' + ' | '.join(['---'] * columns) + ' |'
+        elif head_row_missing or (first_row and (parent.tag == 'table' or (
+                parent.tag == 'tbody' and _previous_tag(parent) is None))):
+            out.write('| ' + ' | '.join([''] * columns) + ' |')
+            out.newline(1)
+            out.write('| ' + ' | '.join(['---'] * columns) + ' |')
+            out.newline(1)
+        out.write('|')
+        self.children(el, out, ctx)
+        out.newline(1)
+        if underline:
+            out.write(underline)
+            out.newline(1)
+
+    def cell(self, el, out: _Writer, ctx: int):
+        text = self.capture(el, ctx | _INLINE).strip().replace('\n', ' ')
+        out.write(' ' + text + ' |' * _colspan(el))
+
+    def caption(self, el, out: _Writer, ctx: int):
+        out.open_frame(0, None, None)
+        self.children(el, out, ctx)
+        out.close_frame(2, empty=2)
+
+    def figcaption(self, el, out: _Writer, ctx: int):
+        out.open_frame(2, None, None)
+        self.children(el, out, ctx)
+        out.close_frame(2, empty=2)
+
+    def dt(self, el, out: _Writer, ctx: int):
+        text = _ALL_WS_RE.sub(' ', self.capture(el, ctx).strip())
+        if ctx & _INLINE:
+            out.text(' ' + text + ' ')
+        elif not text:
+            out.newline(1)
+        else:
+            out.newline(2)
+            out.write(text)
+            out.newline(1)
+
+    def dd(self, el, out: _Writer, ctx: int):
+        if ctx & _INLINE:
+            out.text(' ' + self.capture(el, ctx).strip() + ' ')
+            return
+        out.open_frame(0, None, None, _Prefix(':   ', '    '))
+        self.children(el, out, ctx)
+        out.close_frame(1, empty=1)
+
+    # --- Inline ---
+
+    def a(self, el, out: _Writer, ctx: int):
+        if ctx & _NOFORMAT:
+            self.children(el, out, ctx)
+            return
+        prefix, suffix, text = _chomp(self.capture(el, ctx))
+        if not text:
+            return
+        href = el.get('href')
+        title = el.get('title')
+        if text.replace(r'\_', '_') == href and not title:
+            # Autolinks and links without a target lose the spaces around them, as in markdownify
+            out.text(f"<{href}>")
+        elif href:
+            title_part = ' "%s"' % title.replace('"', r'\"') if title else ''
+            out.text(f"{prefix}[{text}]({href}{title_part}){suffix}")
+        else:
+            out.text(text)
+
+    def markup(self, el, out: _Writer, ctx: int):
+        """<b>, <strong>, <em>, <i>, <del>, <s>, <sub>, <sup>."""
+        if ctx & _NOFORMAT:
+            self.children(el, out, ctx)
+            return
+        prefix, suffix, text = _chomp(self.capture(el, ctx))
+        if text:
+            marker = _INLINE_MARKUP[el.tag]
+            out.text(prefix + marker + text + marker + suffix)
+
+    def code(self, el, out: _Writer, ctx: int):
+        """<code>, <kbd>, <samp>."""
+        if ctx & _NOFORMAT:
+            self.children(el, out, ctx)
+            return
+        prefix, suffix, text = _chomp(self.capture(el, ctx | _NOFORMAT))
+        if not text:
+            return
+        ticks = max((len(run) for run in _BACKTICKS_RE.findall(text)), default=0)
+        if ticks:
+            text = f" {text} "
+        delimiter = '`' * (ticks + 1)
+        out.text(prefix + delimiter + text + delimiter + suffix)
+
+    def q(self, el, out: _Writer, ctx: int):
+        out.text('"' + self.capture(el, ctx) + '"')
+
+    def img(self, el, out: _Writer, ctx: int):
+        alt = el.get('alt') or ''
+        if ctx & _INLINE:
+            out.text(alt)
+            return
+        title = el.get('title') or ''
+        title_part = ' "%s"' % title.replace('"', r'\"') if title else ''
+        out.text(f"![{alt}]({el.get('src') or ''}{title_part})")
+
+    def video(self, el, out: _Writer, ctx: int):
+        text = self.capture(el, ctx)
+        if ctx & _INLINE:
+            out.text(text)
+            return
+        src = el.get('src') or next((s.get('src') for s in el.iter('source') if s.get('src')), None) or ''
+        poster = el.get('poster') or ''
+        if src and poster:
+            out.text(f"[![{text}]({poster})]({src})")
+        elif src:
+            out.text(f"[{text}]({src})")
+        elif poster:
+            out.text(f"![{text}]({poster})")
+        else:
+            out.text(text)
+
+    _handlers = {
+        'p': block, 'div': block, 'article': block, 'section': block, 'dl': block,
+        'blockquote': blockquote, 'ul': list, 'ol': list, 'li': li, 'pre': pre, 'hr': hr, 'br': br,
+        'table': table, 'tr': tr, 'td': cell, 'th': cell, 'caption': caption, 'figcaption': figcaption,
+        'dt': dt, 'dd': dd, 'a': a, 'code': code, 'kbd': code, 'samp': code, 'q': q, 'img': img,
+        'video': video, **dict.fromkeys(_INLINE_MARKUP, markup),
+    }
+
+def parse_html(html: str):
+    """Parses a document with libxml2; returns its root element, or None if there is none."""
+    parser = etree.HTMLParser(encoding='utf-8')
+    try:
+        return etree.fromstring(html.encode('utf-8', 'replace'), parser)
+    except etree.XMLSyntaxError:
+        return None
+
+def tree_metadata(root) -> tuple[str | None, str | None]:
+    """Title and meta description of a parsed document, as ParsedPage reads them from the soup."""
+    if root is None:
+        return None, None
+    title_tag = next(root.iter('title'), None)
+    title = "".join(_TEXT_NODES(title_tag)).strip() if title_tag is not None else None
+    description = None
+    for meta in root.iter('meta'):
+        if meta.get('name') == 'description':
+            if meta.get('content'):
+                description = meta.get('content').strip()
+            break
+    return title, description
+
+def _has_text(el) -> bool:
+    return any(text.strip() for text in _TEXT_NODES(el))
+
+def _densest_block(root):
+    """converter._densest_block for lxml elements."""
+    text = {}
+
+    def count(el) -> int:
+        total = len(el.text.strip()) if el.text and el.tag not in _NO_TEXT else 0
+        for child in el:
+            if type(child.tag) is str and child.tag != 'a':
+                total += count(child)
+            if child.tail:
+                total += len(child.tail.strip())
+        text[el] = total
+        return total
+
+    count(root)
+    node = root
+    while True:
+        best = max((child for child in node if child.tag in _BLOCK_TAGS), key=text.get, default=None)
+        if best is None or text[best] < text[node] * CONTENT_SHARE:
+            return node
+        node = best
+
+def find_main_content(root, main_content=True):
+    """converter.find_main_content for an lxml tree."""
+    selectors = _site_selectors(main_content)
+    if selectors:
+        try:
+            from lxml.cssselect import CSSSelector
+        except ImportError:
+            raise ImportError("content_selectors with the lxml converter need cssselect: "
+                              "pip install 'llms-txt-generator[selectors]'") from None
+        for selector in selectors:
+            for el in CSSSelector(selector)(root):
+                if _has_text(el):
+                    return el
+    for matcher in _CONTENT_MATCHERS:
+        for el in matcher(root):
+            if _has_text(el):
+                return el
+    body = root.find('body')
+    body = root if body is None else body
+    node = _densest_block(body)
+    return None if node is body else node
+
+def tree_to_markdown(root, main_content=False) -> str:
+    """Converts a parsed document (see parse_html)."""
+    if root is None:
+        return ""
+    if main_content:
+        region = find_main_content(root, main_content)
+        if region is not None:
+            root = region
+    return _Converter().convert(root)
+
+def html_to_markdown(html: str, main_content=False) -> str:
+    if not html:
+        return ""
+    return tree_to_markdown(parse_html(html), main_content)
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FORMAT = 1
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8", "surrogatepass")).hexdigest()
+
+@dataclass
+class ManifestEntry:
+    """What a previous run knew about one page, and where its Markdown lives in llms-full.txt."""
+    url: str
+    lastmod: str | None = None
+    etag: str | None = None
+    content_hash: str | None = None
+    title: str | None = None
+    description: str | None = None
+    offset: int = 0
+    length: int = 0
+
+class Manifest:
+    """
+    Per-run record written next to the `{service}-llms-v{version}.txt` outputs.
+
+    Maps every page URL to its sitemap lastmod, ETag, HTML content hash and the
+    byte range of its converted Markdown in the run's llms-full.txt, so the
+    next run can skip unchanged pages and splice their Markdown back in.
+    """
+
+    def __init__(self, path: str, llms_full: str = None, entries: dict = None, converter: str = None):
+        self.path = path
+        self.llms_full = llms_full # file name, relative to the manifest
+        self.entries = entries or {} # url -> ManifestEntry
+        # converter_options_key() of the run; None in manifests written before it was recorded
+        self.converter = converter
+
+    @staticmethod
+    def path_for(output_dir: str, service_name: str) -> str:
+        # Not versioned, so a version bump still finds the previous run
+        return os.path.join(output_dir, f"{service_name}-manifest.json")
+
+    @classmethod
+    def load(cls, path: str) -> "Manifest | None":
+        """Loads a manifest, or returns None if it is missing, unreadable or its llms-full.txt is gone."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.info(f"No usable manifest at {path}: {e}")
+            return None
+
+        if data.get("format") != MANIFEST_FORMAT:
+            logger.info(f"Ignoring manifest {path} with unsupported format {data.get('format')}")
+            return None
+
+        manifest = cls(path, data.get("llms_full"), {
+            url: ManifestEntry(url=url, **fields) for url, fields in data.get("pages", {}).items()
+        }, data.get("converter"))
+        if not manifest.llms_full or not os.path.exists(manifest.llms_full_path):
+            logger.info(f"Ignoring manifest {path}: {manifest.llms_full} no longer exists")
+            return None
+        return manifest
+
+    @property
+    def llms_full_path(self) -> str:
+        return os.path.join(os.path.dirname(self.path), self.llms_full)
+
+    def get(self, url: str) -> ManifestEntry | None:
+        return self.entries.get(url)
+
+    def add(self, entry: ManifestEntry):
+        self.entries[entry.url] = entry
+
+    def read_markdown(self, entry: ManifestEntry) -> str:
+        """Reads the Markdown recorded for `entry` from this run's llms-full.txt."""
+        with open(self.llms_full_path, "rb") as f:
+            f.seek(entry.offset)
+            return f.read(entry.length).decode("utf-8")
+
+    def save(self):
+        data = {
+            "format": MANIFEST_FORMAT,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "llms_full": self.llms_full,
+            "converter": self.converter,
+            "pages": {
+                url: {k: v for k, v in asdict(entry).items() if k != "url"}
+                for url, entry in self.entries.items()
+            },
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def diff(self, previous: "Manifest | None") -> dict:
+        """Returns the URLs added, changed and removed relative to `previous`."""
+        old_entries = previous.entries if previous else {}
+        added = [url for url in self.entries if url not in old_entries]
+        changed = [
+            url for url, entry in self.entries.items()
+            if url in old_entries and entry.content_hash != old_entries[url].content_hash
+        ]
+        removed = [url for url in old_entries if url not in self.entries]
+        return {"added": added, "changed": changed, "removed": removed}
@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the fetch latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+class Histogram:
+    """Cumulative-friendly bucketed distribution, in the Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the `q` quantile, capped at the largest value seen."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'max': round(self.max, 6),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': {('+Inf' if b == float('inf') else str(b)): c for b, c in zip(self.buckets, self.counts)},
+        }
+
+class Metrics:
+    """
+    Instrumentation of one generation run.
+
+    Collects wall time per stage (discovery, fetch, parse, convert, write,
+    format), counters, a fetch latency histogram, bytes and status codes
+    fetched, and cache hit rates. Stages of the streaming pipeline overlap,
+    so stage times add up to more than the run's wall time.
+
+    Hooks registered with add_hook() are called as `hook(event, data)` for
+    every 'stage' and 'fetch' event, e.g. to feed a live dashboard.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages = {} # name -> [seconds, calls]
+        self.counters = {}
+        self.gauges = {}
+        self.statuses = {}
+        self.fetch_latency = Histogram()
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def _emit(self, event: str, data: dict):
+        for hook in self._hooks:
+            try:
+                hook(event, data)
+            except Exception as e:
+                logger.warning(f"Metrics hook {hook!r} failed: {e}")
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - started)
+
+    def add_stage_time(self, name: str, seconds: float, calls: int = 1):
+        with self._lock:
+            totals = self.stages.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += calls
+        if self._hooks:
+            self._emit('stage', {'stage': name, 'seconds': seconds})
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe_fetch(self, url: str, status: int | None, seconds: float, size: int = 0, from_cache: bool = False):
+        """Records one HTTP request; `status` is None when it failed without a response."""
+        key = str(status) if status is not None else 'error'
+        with self._lock:
+            self.fetch_latency.observe(seconds)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            self.counters['fetch_requests'] = self.counters.get('fetch_requests', 0) + 1
+            self.counters['fetch_bytes'] = self.counters.get('fetch_bytes', 0) + size
+            if from_cache:
+                self.counters['http_cache_revalidated'] = self.counters.get('http_cache_revalidated', 0) + 1
+        if self._hooks:
+            self._emit('fetch', {'url': url, 'status': status, 'seconds': seconds, 'bytes': size,
+                                 'from_cache': from_cache})
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                'started': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started)),
+                'wall_s': round(time.time() - self.started, 3),
+                'stages': {name: {'seconds': round(s, 6), 'calls': c} for name, (s, c) in self.stages.items()},
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'fetch_statuses': dict(self.statuses),
+                'fetch_latency_s': self.fetch_latency.as_dict(),
+            }
+
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+
+    def write_prometheus(self, path: str, prefix: str = "llmstxt"):
+        """Writes the report in the Prometheus textfile-collector format, replacing `path` atomically."""
+        report = self.report()
+        lines = [
+            f"# TYPE {prefix}_run_seconds gauge",
+            f"{prefix}_run_seconds {report['wall_s']}",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{name}"}} {v["seconds"]}' for name, v in report['stages'].items()]
+        for name, value in report['counters'].items():
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        for name, value in report['gauges'].items():
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        lines.append(f"# TYPE {prefix}_fetch_responses_total counter")
+        lines += [f'{prefix}_fetch_responses_total{{status="{s}"}} {c}' for s, c in report['fetch_statuses'].items()]
+
+        histogram = self.fetch_latency
+        lines.append(f"# TYPE {prefix}_fetch_latency_seconds histogram")
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else bound
+            lines.append(f'{prefix}_fetch_latency_seconds_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{prefix}_fetch_latency_seconds_sum {histogram.sum}")
+        lines.append(f"{prefix}_fetch_latency_seconds_count {histogram.count}")
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+class NullMetrics:
+    """Stand-in used when instrumentation is off; every call is a no-op."""
+
+    enabled = False
+    _null_stage = nullcontext()
+
+    def add_hook(self, hook):
+        pass
+
+    def stage(self, name: str):
+        return self._null_stage
+
+    def add_stage_time(self, name: str, seconds: float, calls: int = 1):
+        pass
+
+    def incr(self, name: str, value: int = 1):
+        pass
+
+    def set_gauge(self, name: str, value: float):
+        pass
+
+    def observe_fetch(self, url: str, status: int | None, seconds: float, size: int = 0, from_cache: bool = False):
+        pass
+
+NULL_METRICS = NullMetrics()
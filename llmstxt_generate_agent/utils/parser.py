@@ -0,0 +1,176 @@
+import html as html_lib
+import re
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin, urlsplit
+
+# BeautifulSoup, lxml and the converters are imported on first use, so
+# crawling (which only needs links) doesn't pay for them
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# An <a> start tag; quoted attribute values may contain '>'. A '<' in a value,
+# or a stray quote, makes the tag fail to match and the page fall back to the parser.
+_A_TAG_RE = re.compile(r"""<a\s([^>"'<]*(?:(?:"[^"<]*"|'[^'<]*')[^>"'<]*)*)>|(<a\s)""", re.IGNORECASE)
+# One attribute of a tag: its name and optional value, double-quoted, single-quoted or bare.
+# Matched one after another from the start of the tag's attributes, so href= inside another
+# attribute's value is never taken for the link.
+_ATTR_RE = re.compile(r"""\s*([^\s"'=>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+# Comments, scripts and styles may contain markup that is not part of the page
+_SKIP_RE = re.compile(r'<!--.*?-->|<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_SKIP_START_RE = re.compile(r'<!--|<script|<style', re.IGNORECASE)
+
+def extract_links(html: str, base_url: str) -> list[str]:
+    """
+    Returns absolute, fragment-free URLs of all `<a href>` links in document order.
+
+    Scans the raw HTML with a regular expression instead of building a tree,
+    which is several times faster on link-heavy pages; entity references in
+    the href are decoded like an HTML parser would. Pages with an anchor tag
+    the expression can't delimit are handed to the HTML parser instead.
+    """
+    if _SKIP_START_RE.search(html):
+        html = _SKIP_RE.sub('', html)
+    parts = urlsplit(base_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    links = []
+    for tag in _A_TAG_RE.finditer(html):
+        if tag.group(2) is not None:
+            return _parser_links(html, base_url)
+        href = _href(tag.group(1))
+        if href is None:
+            continue
+        if '&' in href:
+            href = html_lib.unescape(href)
+        href = href.strip().split('#', 1)[0] # Remove #fragment
+        if href.startswith('/') and not href.startswith('//') and '/.' not in href:
+            # Root-relative paths, the common case in site navigation, need no urljoin
+            links.append(origin + href)
+        else:
+            links.append(urljoin(base_url, href))
+    return links
+
+def _href(attributes: str) -> str | None:
+    """The href value among a tag's attributes, or None."""
+    position = 0
+    while True:
+        match = _ATTR_RE.match(attributes, position)
+        if match is None:
+            if position >= len(attributes):
+                return None
+            # A stray '=' or quote; browsers skip it too
+            position += 1
+            continue
+        if match.group(1).lower() == 'href':
+            value = match.group(2)
+            if value is None:
+                value = match.group(3) if match.group(3) is not None else match.group(4)
+            return value
+        position = match.end()
+
+def _parser_links(html: str, base_url: str) -> list[str]:
+    from bs4 import BeautifulSoup
+    from .converter import HTML_PARSER
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return [urljoin(base_url, link['href'].strip().split('#', 1)[0]) for link in soup.find_all('a', href=True)]
+
+class ParsedPage:
+    """
+    A fetched page that is parsed at most once.
+
+    Link extraction, metadata extraction and Markdown conversion all read the
+    same lazily built soup instead of re-parsing the HTML for each step, or
+    the same lxml tree with the 'lxml' converter `engine`. Markdown
+    conversion strips distraction tags from the soup, so title and
+    description are captured before it runs and the tree is released after.
+    """
+
+    def __init__(self, url: str, html: str, etag: str = None, lastmod: str = None, engine: str = 'markdownify'):
+        self.url = url
+        self.html = html
+        self.engine = engine
+        # Validators carried along for the run manifest
+        self.etag = etag
+        self.lastmod = lastmod
+        # SimHash of the content, set by crawlers that deduplicate
+        self.fingerprint = None
+        self._soup = None
+        self._tree = None
+        self._metadata = None
+        self._markdown = None
+
+    @property
+    def soup(self) -> "BeautifulSoup":
+        if self._soup is None:
+            from bs4 import BeautifulSoup
+            from .converter import HTML_PARSER
+            self._soup = BeautifulSoup(self.html, HTML_PARSER)
+        return self._soup
+
+    @property
+    def tree(self):
+        """The lxml root element (None for an empty document), for the lxml engine."""
+        if self._tree is None:
+            from .lxml_converter import parse_html
+            self._tree = parse_html(self.html)
+        return self._tree
+
+    def _extract_metadata(self):
+        if self._metadata is None and self.engine == 'lxml':
+            from .lxml_converter import tree_metadata
+            self._metadata = tree_metadata(self.tree)
+        elif self._metadata is None:
+            title = None
+            title_tag = self.soup.find('title')
+            if title_tag:
+                title = title_tag.get_text().strip()
+
+            description = None
+            meta_desc = self.soup.find('meta', attrs={'name': 'description'})
+            if meta_desc and meta_desc.get('content'):
+                description = meta_desc['content'].strip()
+
+            self._metadata = (title, description)
+        return self._metadata
+
+    @property
+    def title(self) -> str | None:
+        return self._extract_metadata()[0]
+
+    @property
+    def description(self) -> str | None:
+        return self._extract_metadata()[1]
+
+    def links(self) -> list[str]:
+        """Returns absolute, fragment-free URLs of all `<a href>` links in document order."""
+        # Does not need the soup, so crawling alone never builds a tree
+        return extract_links(self.html, self.url)
+
+    @property
+    def markdown(self) -> str:
+        return self.to_markdown()
+
+    def to_markdown(self, main_content=False) -> str:
+        """
+        Converts the page once; later calls return the same Markdown whatever
+        their `main_content` (see converter.html_to_markdown).
+        """
+        if self._markdown is None:
+            self._extract_metadata()
+            if not self.html:
+                self._markdown = ""
+            elif self.engine == 'lxml':
+                from .lxml_converter import tree_to_markdown
+                self._markdown = tree_to_markdown(self.tree, main_content)
+            else:
+                from .converter import soup_to_markdown
+                self._markdown = soup_to_markdown(self.soup, main_content)
+            # The soup has been pruned by the conversion; drop the trees to free memory
+            self._soup = self._tree = None
+        return self._markdown
+
+def as_parsed_page(url: str, content, engine: str = 'markdownify') -> ParsedPage:
+    """Wraps raw HTML in a ParsedPage; existing ParsedPage instances are returned set to convert with `engine`."""
+    if isinstance(content, ParsedPage):
+        content.engine = engine
+        return content
+    return ParsedPage(url, content, engine=engine)
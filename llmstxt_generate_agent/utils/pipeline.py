@@ -0,0 +1,178 @@
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from .cache import ConversionCache
+from .manifest import Manifest, ManifestEntry, content_hash
+from .metrics import NULL_METRICS
+from .parser import ParsedPage, as_parsed_page
+
+# Pages sent to a worker process per task, to amortize pickling and IPC overhead
+DEFAULT_BATCH_SIZE = 16
+
+@dataclass
+class ConvertedPage:
+    url: str
+    title: str | None
+    description: str | None
+    markdown: str
+    content_hash: str | None = None
+    lastmod: str | None = None
+    etag: str | None = None
+    reused: bool = False # Markdown was spliced from the previous run
+
+def convert_pages(pages, previous: Manifest = None, cache: ConversionCache = None,
+                  workers: int = 1, batch_size: int = DEFAULT_BATCH_SIZE, metrics=NULL_METRICS,
+                  executor: ProcessPoolExecutor = None, main_content=False, engine: str = 'markdownify'):
+    """
+    Conversion stage of the crawl pipeline.
+
+    Consumes `(url, content)` pairs, where content is raw HTML, a ParsedPage
+    or a ManifestEntry of `previous`, and lazily yields a ConvertedPage for
+    each in the same order. Pages whose HTML hashes the same as in `previous`
+    reuse the stored Markdown instead of being converted again, and a
+    `cache` hit skips parsing and conversion for HTML seen in any run.
+
+    With `workers` above 1, pages that do need converting are sent in batches
+    of `batch_size` to a process pool; results are still yielded in input
+    order. Only a few batches per worker are in flight at once, so pulling
+    from this generator is still what drives the crawler behind it. An
+    `executor` shared between several runs may be passed instead of having
+    one started here; `workers` then only sizes how many batches are queued.
+
+    `main_content` converts only each page's main content region, and
+    `engine` picks the converter engine, see converter.html_to_markdown.
+
+    Parse and convert time (measured in the workers when there are any) and
+    reuse and cache counters are reported to `metrics`.
+    """
+    # Imported here so checkpoints and crawlers can use this module without markdownify
+    from .converter import converter_options_key
+    options_key = converter_options_key(main_content, engine)
+
+    def resolve(url, content):
+        """Returns a finished ConvertedPage, or the ParsedPage plus its hash if it must be converted."""
+        if isinstance(content, ManifestEntry):
+            metrics.incr('pages_reused')
+            return _reuse(previous, content, content.lastmod, content.etag), None
+
+        page = as_parsed_page(url, content, engine)
+        digest = content_hash(page.html)
+
+        entry = previous.get(url) if previous else None
+        if entry is not None and entry.content_hash == digest:
+            metrics.incr('pages_reused')
+            return _reuse(previous, entry, page.lastmod, page.etag), None
+
+        if cache is not None:
+            cached = cache.get(ConversionCache.key_for(digest, options_key))
+            if cached is not None:
+                metrics.incr('conversion_cache_hits')
+                title, description, markdown = cached
+                return ConvertedPage(url, title, description, markdown,
+                                     content_hash=digest, lastmod=page.lastmod, etag=page.etag), None
+
+        return None, (page, digest)
+
+    def finish(page: ParsedPage, digest: str, title, description, markdown) -> ConvertedPage:
+        metrics.incr('pages_converted')
+        if cache is not None:
+            cache.put(ConversionCache.key_for(digest, options_key), title, description, markdown)
+        return ConvertedPage(page.url, title, description, markdown,
+                             content_hash=digest, lastmod=page.lastmod, etag=page.etag)
+
+    if workers <= 1:
+        for url, content in pages:
+            converted, pending = resolve(url, content)
+            if converted is None:
+                # Each page is parsed once and shared by metadata and Markdown extraction
+                page, digest = pending
+                with metrics.stage('parse'):
+                    title, description = page.title, page.description
+                with metrics.stage('convert'):
+                    markdown = page.to_markdown(main_content)
+                converted = finish(page, digest, title, description, markdown)
+            yield converted
+        return
+
+    # Output slots in input order: a ConvertedPage, or (future, batch, index) awaiting a worker
+    slots = deque()
+    in_flight = 0
+    batch = []
+    max_in_flight = workers * 2
+
+    def submit(executor):
+        nonlocal batch, in_flight
+        future = executor.submit(_convert_batch, [(page.url, page.html) for page, _ in batch], main_content, engine)
+        slots.extend((future, batch, index) for index in range(len(batch)))
+        in_flight += 1
+        batch = []
+
+    def drain_head():
+        nonlocal in_flight
+        head = slots.popleft()
+        if isinstance(head, ConvertedPage):
+            return head
+        future, batch_pages, index = head
+        results, parse_time, convert_time = future.result()
+        title, description, markdown = results[index]
+        page, digest = batch_pages[index]
+        if index == len(batch_pages) - 1:
+            in_flight -= 1
+            metrics.add_stage_time('parse', parse_time, len(batch_pages))
+            metrics.add_stage_time('convert', convert_time, len(batch_pages))
+        return finish(page, digest, title, description, markdown)
+
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context())
+    try:
+        for url, content in pages:
+            converted, pending = resolve(url, content)
+            if converted is not None:
+                slots.append(converted)
+            else:
+                batch.append(pending)
+                if len(batch) >= batch_size:
+                    submit(executor)
+
+            # Apply backpressure: hold off reading input while enough work is queued
+            while in_flight >= max_in_flight or (slots and isinstance(slots[0], ConvertedPage)):
+                yield drain_head()
+
+        if batch:
+            submit(executor)
+        while slots:
+            yield drain_head()
+    finally:
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def _convert_batch(batch: list[tuple[str, str]], main_content=False,
+                   engine: str = 'markdownify') -> tuple[list[tuple], float, float]:
+    """
+    Worker entry point: converts `(url, html)` pairs to `(title, description, markdown)`.
+    Also returns the time spent parsing and converting the batch.
+    """
+    results = []
+    parse_time = convert_time = 0.0
+    for url, html in batch:
+        page = ParsedPage(url, html, engine=engine)
+        started = time.perf_counter()
+        title, description = page.title, page.description
+        parsed = time.perf_counter()
+        markdown = page.to_markdown(main_content)
+        convert_time += time.perf_counter() - parsed
+        parse_time += parsed - started
+        results.append((title, description, markdown))
+    return results, parse_time, convert_time
+
+def _mp_context():
+    # Forking a process that runs fetcher threads can deadlock, so prefer a clean server process
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+def _reuse(previous: Manifest, entry: ManifestEntry, lastmod: str | None, etag: str | None) -> ConvertedPage:
+    return ConvertedPage(entry.url, entry.title, entry.description, previous.read_markdown(entry),
+                         content_hash=entry.content_hash, lastmod=lastmod, etag=etag, reused=True)
@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Statuses a host uses to tell us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+# Longest pause, in seconds, a Crawl-delay or Retry-After may impose
+DEFAULT_MAX_DELAY = 60.0
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Returns the delay in seconds of a `Retry-After` header (seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RobotsPolicy:
+    """
+    Per-origin robots.txt rules, fetched once and cached.
+
+    Answers whether a URL may be crawled and how long to wait between
+    requests (`Crawl-delay`, or the interval implied by `Request-rate`).
+    Missing or unreachable robots.txt files allow everything, as do 4xx
+    answers other than 401/403, which disallow everything.
+    """
+
+    def __init__(self, session: requests.Session, user_agent: str = None, timeout: float = 10):
+        self.session = session
+        self.user_agent = user_agent or session.headers.get('User-Agent', '*')
+        self.timeout = timeout
+        self._parsers = {} # origin -> RobotFileParser
+        self._fetches = {} # origin -> Future of the robots.txt download in progress
+        self._lock = threading.Lock()
+
+    def seed(self, url: str, robots_txt: str | None, status: int | None = 200):
+        """
+        Uses an already downloaded robots.txt (e.g. from discovery) for the
+        origin of `url`: its body, or None with the HTTP `status` it got
+        instead (None if the request failed).
+        """
+        parser = _robots_parser(_origin(url), status if robots_txt is None else 200, robots_txt)
+        with self._lock:
+            self._parsers.setdefault(_origin(url), parser)
+
+    def _parser(self, url: str) -> RobotFileParser:
+        origin = _origin(url)
+        with self._lock:
+            parser = self._parsers.get(origin)
+            if parser is not None:
+                return parser
+            future = self._fetches.get(origin)
+            fetching = future is None
+            if fetching:
+                future = self._fetches[origin] = Future()
+        if not fetching:
+            # Another thread is downloading this origin's robots.txt; other origins aren't held up
+            return future.result()
+
+        try:
+            parser = self._fetch(origin)
+        except BaseException as e:
+            with self._lock:
+                del self._fetches[origin]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            # seed() may have filled it in meanwhile
+            parser = self._parsers.setdefault(origin, parser)
+            del self._fetches[origin]
+        future.set_result(parser)
+        return parser
+
+    def _fetch(self, origin: str) -> RobotFileParser:
+        url = origin + "/robots.txt"
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.info(f"Could not fetch {url}, assuming everything is allowed: {e}")
+            return _robots_parser(origin, None, None)
+        return _robots_parser(origin, response.status_code, response.text)
+
+    def allowed(self, url: str) -> bool:
+        return self._parser(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> float:
+        parser = self._parser(url)
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is not None:
+            return float(delay)
+        rate = parser.request_rate(self.user_agent)
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+        return 0.0
+
+def _robots_parser(origin: str, status: int | None, robots_txt: str | None) -> RobotFileParser:
+    """Rules for a robots.txt answer; `status` is None when it could not be fetched."""
+    parser = RobotFileParser(origin + "/robots.txt")
+    if status in (401, 403):
+        parser.disallow_all = True
+    elif status is None or status >= 400 or robots_txt is None:
+        parser.allow_all = True
+    else:
+        parser.parse(robots_txt.splitlines())
+    return parser
+
+class _HostState:
+    """Adaptive request window and pacing for one host."""
+
+    def __init__(self, limit: float, max_limit: int, min_interval: float):
+        self.limit = limit
+        self.max_limit = max_limit
+        self.min_interval = min_interval # Crawl-delay floor
+        self.interval = min_interval
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.blocked_until = 0.0
+        self.latency = None # EWMA of response times
+        self.base_latency = None # Lowest EWMA seen: the host's unloaded latency
+        self.last_decrease = 0.0
+        self.cond = threading.Condition()
+
+class HostScheduler:
+    """
+    Per-host admission control for HTTP requests.
+
+    Each host gets a concurrency window that grows by about one request per
+    round trip while responses are healthy and is halved (AIMD) on throttling
+    (429/503, including retries urllib3 absorbed), errors, or latency rising
+    well above the host's baseline. Requests are spaced by the robots.txt
+    `Crawl-delay`; a `Retry-After` pauses the whole host, and repeated
+    throttling at a window of one stretches the spacing until the host
+    recovers. `max_concurrency` caps the window.
+    """
+
+    def __init__(self, max_concurrency: int = 4, initial_concurrency: int = 2, robots: RobotsPolicy = None,
+                 max_delay: float = DEFAULT_MAX_DELAY, latency_factor: float = 2.0):
+        self.max_concurrency = max_concurrency
+        self.initial_concurrency = max(1, min(initial_concurrency, max_concurrency))
+        self.robots = robots
+        self.max_delay = max_delay
+        self.latency_factor = latency_factor
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> _HostState:
+        origin = _origin(url)
+        with self._lock:
+            host = self._hosts.get(origin)
+        if host is None:
+            # Looked up outside the lock: it may download robots.txt
+            delay = min(self.robots.crawl_delay(url), self.max_delay) if self.robots else 0.0
+            if delay:
+                logger.info(f"Honoring Crawl-delay of {delay}s for {origin}")
+            with self._lock:
+                host = self._hosts.setdefault(
+                    origin, _HostState(self.initial_concurrency, self.max_concurrency, delay)
+                )
+        return host
+
+    def acquire(self, url: str) -> _HostState:
+        """Blocks until a request to the host of `url` may start."""
+        host = self._host(url)
+        with host.cond:
+            while True:
+                now = time.monotonic()
+                wait = max(host.next_start, host.blocked_until) - now
+                if host.in_flight < int(host.limit) and wait <= 0:
+                    host.in_flight += 1
+                    host.next_start = now + host.interval
+                    return host
+                host.cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, host: _HostState, response: requests.Response | None, elapsed: float):
+        """Returns the slot and adapts the host's window to how the request went."""
+        with host.cond:
+            host.in_flight -= 1
+            now = time.monotonic()
+
+            if response is not None and response.status_code in THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after:
+                    host.blocked_until = max(host.blocked_until, now + min(retry_after, self.max_delay))
+                self._decrease(host, now, throttled=True)
+            elif response is None or response.status_code >= 500 or _was_throttled(response):
+                self._decrease(host, now, throttled=_was_throttled(response))
+            else:
+                host.latency = elapsed if host.latency is None else 0.8 * host.latency + 0.2 * elapsed
+                if host.base_latency is None or host.latency < host.base_latency:
+                    host.base_latency = host.latency
+                if host.latency > host.base_latency * self.latency_factor:
+                    # The host is queueing our requests
+                    self._decrease(host, now)
+                else:
+                    host.limit = min(host.max_limit, host.limit + 1 / host.limit)
+                    host.interval = max(host.min_interval, host.interval * 0.9)
+                    if host.interval < 0.01:
+                        host.interval = host.min_interval
+            host.cond.notify_all()
+
+    def _decrease(self, host: _HostState, now: float, throttled: bool = False):
+        # Requests already in flight report the same congestion; back off once per round trip
+        if now - host.last_decrease < (host.latency or 0.0):
+            return
+        host.last_decrease = now
+        if throttled and host.limit <= 1:
+            host.interval = min(self.max_delay, max(host.interval * 2, 0.25))
+        host.limit = max(1.0, host.limit / 2)
+        logger.debug(f"Backing off: window {host.limit:.1f}, interval {host.interval:.2f}s")
+
+def _was_throttled(response: requests.Response | None) -> bool:
+    """True if urllib3 retried this request after a 429/503 before it succeeded."""
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    history = getattr(retries, 'history', None) or ()
+    return any(entry.status in THROTTLE_STATUSES for entry in history)
@@ -0,0 +1,355 @@
+import codecs
+import logging
+import re
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from .archive import CrawlArchive, RecordingAdapter, ReplayAdapter
+from .cache import HttpCache
+from .politeness import HostScheduler, DEFAULT_MAX_DELAY
+from .metrics import NULL_METRICS
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'LLMs.txt-Generator/1.0 (+https://github.com/mostlytricks/llms-txt-generator)'
+
+# Throttling and transient server errors worth another attempt
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Content types crawled as documentation pages
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Bodies larger than this (after decompression) are abandoned
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+_CHUNK_SIZE = 64 * 1024
+
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+_UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+_BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of HttpTransport.fetch(). `text` is None when the body was not
+    read or kept; `error` then says why (HTTP status, content type, size or
+    the request exception).
+    """
+    url: str
+    status: int | None = None
+    final_url: str | None = None # After redirects
+    headers: dict = field(default_factory=dict)
+    content_type: str | None = None
+    encoding: str | None = None
+    text: str | None = None
+    size: int = 0 # Body bytes read, after content decoding
+    elapsed: float = 0.0
+    from_cache: bool = False
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.text is not None
+
+class _CappedRetry(Retry):
+    """Retry that waits at most `max_retry_after` seconds on a server's Retry-After."""
+
+    max_retry_after = DEFAULT_MAX_DELAY
+
+    def get_retry_after(self, response) -> float | None:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.max_retry_after)
+
+    def new(self, **kwargs) -> 'Retry':
+        retry = super().new(**kwargs)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+def _codec(name: str | None) -> str | None:
+    if not name:
+        return None
+    try:
+        info = codecs.lookup(name.strip())
+    except LookupError:
+        return None
+    # hex, base64, rot13, zlib... are codecs too, but not text encodings
+    if not getattr(info, '_is_text_encoding', True):
+        return None
+    codec = info.name
+    # Browsers read Latin-1 labels as its Windows superset
+    return 'cp1252' if codec == 'iso8859-1' else codec
+
+def decode_html(body: bytes, content_type: str | None = None) -> tuple[str, str]:
+    """
+    Decodes an HTML body; returns `(text, encoding)`.
+
+    Uses the Content-Type charset, then a byte-order mark, then a `<meta>`
+    charset in the first 4 KiB. Without any of them it tries UTF-8 and falls
+    back to cp1252, instead of running statistical detection over the body.
+    """
+    match = _CHARSET_RE.search(content_type or '')
+    encoding = _codec(match.group(1)) if match else None
+    if encoding is None:
+        encoding = next((name for bom, name in _BOMS if body.startswith(bom)), None)
+    if encoding is None:
+        match = _META_CHARSET_RE.search(body, 0, 4096)
+        encoding = _codec(match.group(1).decode('ascii')) if match else None
+        # A UTF-16 meta label in an ASCII-compatible document is wrong by definition
+        if encoding and encoding.startswith('utf-16'):
+            encoding = 'utf-8'
+    if encoding is None:
+        try:
+            return body.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            encoding = 'cp1252'
+    return body.decode(encoding, errors='replace'), encoding
+
+class HttpTransport:
+    """
+    Shared HTTP layer for the crawlers and the official-docs fetcher.
+
+    Wraps a single `requests.Session` so connections are pooled per host and
+    kept alive between requests, advertises every content encoding urllib3 can
+    decode (gzip/deflate always, br and zstd when `brotli`/`zstandard` are
+    installed) and retries idempotent requests with exponential backoff and
+    jitter on 429/5xx responses and connection resets.
+
+    With an HttpCache, GETs are sent as conditional requests and a
+    `304 Not Modified` is answered with the cached body.
+
+    With a HostScheduler, every request first waits for a slot on its host,
+    and the outcome (status, Retry-After, latency) is fed back to it. fetch()
+    holds the slot until the body has been read.
+    Every request is reported to `metrics` when instrumentation is on.
+
+    With a recording CrawlArchive, every response is also written to it; with
+    a replaying one, requests are answered from it and nothing is sent.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5, backoff_jitter: float = 0.5,
+                 pool_connections: int = 10, pool_maxsize: int = 16, cache: HttpCache = None,
+                 scheduler: HostScheduler = None, metrics=None, archive: CrawlArchive = None,
+                 max_retry_after: float = DEFAULT_MAX_DELAY):
+        self.cache = cache
+        self.archive = archive
+        self._recorder = None
+        self.scheduler = scheduler
+        self.metrics = metrics or NULL_METRICS
+        retry = _CappedRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        retry.max_retry_after = max_retry_after
+        if archive is None:
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        elif archive.replay:
+            adapter = ReplayAdapter(archive)
+        else:
+            adapter = self._recorder = RecordingAdapter(archive, pool_connections=pool_connections,
+                                                        pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING,
+        })
+
+    def get(self, url: str, timeout: float = 10, **kwargs) -> requests.Response:
+        if self.scheduler is None and not self.metrics.enabled:
+            return self._get(url, timeout, **kwargs)
+        with self._slot(url, streamed=kwargs.get('stream', False)) as outcome:
+            outcome['response'] = self._get(url, timeout, **kwargs)
+            return outcome['response']
+
+    @contextmanager
+    def _slot(self, url: str, streamed: bool = False):
+        """
+        Holds a slot on the host of `url` for the duration of the block, then
+        reports the `response` (and body `size`, if known) the block put in
+        the yielded dict to the scheduler and metrics.
+        """
+        # Time spent waiting for the host's slot is not part of the request latency
+        host = self.scheduler.acquire(url) if self.scheduler is not None else None
+        started = time.monotonic()
+        outcome = {'response': None, 'size': None}
+        try:
+            yield outcome
+        finally:
+            elapsed = time.monotonic() - started
+            if host is not None:
+                self.scheduler.release(host, outcome['response'], elapsed)
+            if self.metrics.enabled:
+                self._observe(url, outcome['response'], elapsed, streamed, outcome['size'])
+
+    def fetch(self, url: str, timeout: float = 10, max_bytes: int = DEFAULT_MAX_BYTES,
+              content_types: tuple = HTML_CONTENT_TYPES, validators: dict = None) -> FetchResult:
+        """
+        Streams a page and decodes it, giving up as early as possible on
+        bodies that would be thrown away.
+        
+        Responses whose Content-Type is not in `content_types` (pass None to
+        accept any) are closed before their body is read, as are bodies over
+        `max_bytes` (checked against Content-Length up front and while reading)
+        and bodies that turn out to be binary. With an HttpCache, the request is
+        conditional and a 304 is answered from the cache. Without one, the
+        conditional headers in `validators` (e.g. an ETag recorded by an
+        earlier run) are sent instead, and a 304 is returned as is: `status`
+        304 and no `text`.
+        """
+        result = FetchResult(url)
+        started = time.monotonic()
+        try:
+            # The host's slot is held while the body downloads, so the scheduler's
+            # window bounds concurrent downloads and adapts to their full duration
+            recording = self._recorder.limits(max_bytes, content_types) if self._recorder else nullcontext()
+            with recording, self._slot(url, streamed=True) as outcome:
+                if self.cache is not None:
+                    validators = self.cache.validators(url)
+                response = outcome['response'] = self._get(url, timeout, stream=True, headers=validators)
+                if response.status_code == 304 and self.cache is None:
+                    response.close()
+                    result.status = 304
+                    result.final_url = response.url or url
+                    result.headers = response.headers
+                    return result
+                if response.status_code == 304:
+                    response.close()
+                    cached = self.cache.load(url)
+                    if cached is not None:
+                        self._archive_cached(url, cached)
+                        self.metrics.incr('http_cache_revalidated')
+                        result.from_cache = True
+                        self._read_into(result, cached, max_bytes, content_types)
+                        outcome['size'] = result.size
+                        return result
+                    # Evicted between the lookup and the answer; fetch unconditionally
+                    response = outcome['response'] = self._get(url, timeout, stream=True)
+                with response:
+                    body = self._read_into(result, response, max_bytes, content_types)
+                    outcome['size'] = result.size
+                    if self.cache is not None and (body is not None or result.status != 200):
+                        response._content = body
+                        response.encoding = result.encoding
+                        self.cache.store(url, response)
+        except requests.RequestException as e:
+            result.error = str(e)
+        except (LookupError, UnicodeError) as e:
+            # One undecodable page must not stop the crawl
+            result.text = None
+            result.error = f"undecodable body: {e}"
+        finally:
+            result.elapsed = time.monotonic() - started
+        return result
+
+    def _read_into(self, result: FetchResult, response: requests.Response, max_bytes: int,
+                   content_types: tuple) -> bytes | None:
+        """Fills `result` from `response`, reading the body only if it passes the checks."""
+        result.status = response.status_code
+        result.final_url = response.url or result.url
+        result.headers = response.headers
+        header = response.headers.get('Content-Type')
+        result.content_type = header.split(';', 1)[0].strip().lower() if header else None
+        if response.status_code >= 400:
+            result.error = f"HTTP {response.status_code}"
+            return None
+        if content_types and result.content_type and result.content_type not in content_types:
+            result.error = f"content type {result.content_type}"
+            return None
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > max_bytes and not response.headers.get('Content-Encoding'):
+            result.error = f"{length} bytes is over the {max_bytes} byte limit"
+            return None
+
+        if getattr(response, 'from_cache', False):
+            body = response.content
+        else:
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(_CHUNK_SIZE):
+                # UTF-16 text is full of NULs, but starts with a BOM
+                if not size and b'\x00' in chunk[:1024] and not chunk.startswith(_UTF16_BOMS):
+                    result.error = "binary content"
+                    return None
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > max_bytes:
+                    result.error = f"body is over the {max_bytes} byte limit"
+                    return None
+            body = b''.join(chunks)
+        result.size = len(body)
+        result.text, result.encoding = decode_html(body, header)
+        return body
+
+    def _observe(self, url: str, response: requests.Response | None, elapsed: float, streamed: bool,
+                 size: int = None):
+        if response is None:
+            self.metrics.observe_fetch(url, None, elapsed)
+        else:
+            if size is None:
+                # Streamed bodies have not been read yet; count what the server announced
+                size = int(response.headers.get('Content-Length') or 0) if streamed else len(response.content)
+            self.metrics.observe_fetch(url, response.status_code, elapsed, size,
+                                       from_cache=getattr(response, 'from_cache', False))
+        self.metrics.add_stage_time('fetch', elapsed)
+
+    def _get(self, url: str, timeout: float, **kwargs) -> requests.Response:
+        if self.cache is None or kwargs.get('stream'):
+            return self.session.get(url, timeout=timeout, **kwargs)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(self.cache.validators(url))
+        response = self.session.get(url, timeout=timeout, headers=headers, **kwargs)
+
+        if response.status_code == 304:
+            cached = self.cache.load(url)
+            if cached is not None:
+                self._archive_cached(url, cached)
+                return cached
+            # Evicted between the lookup and the answer; fetch unconditionally
+            response = self.session.get(url, timeout=timeout, **kwargs)
+
+        self.cache.store(url, response)
+        return response
+
+    def _archive_cached(self, url: str, response: requests.Response):
+        # The recording adapter only saw the 304; archive the body it confirmed
+        if self.archive is not None and not self.archive.replay:
+            self.archive.record(url, 200, 'OK', response.headers, response.content)
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.archive is not None:
+            self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_default_transport = None
+
+def get_default_transport() -> HttpTransport:
+    """Returns the process-wide transport used when none is passed explicitly."""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = HttpTransport()
+    return _default_transport
@@ -0,0 +1,88 @@
+"""
+Shared fixtures: a local HTTP site whose responses each test sets up, and a
+scratch working directory.
+"""
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections are expected
+        pass
+
+class LocalSite:
+    """
+    Serves the `routes` a test sets up on 127.0.0.1.
+
+    A route maps a request path to `(status, headers, body)`, or to a callable
+    taking the request handler and returning one, for responses that depend on
+    the request or change between runs. Paths without a route get `default`
+    (a 404 unless set). `requests` counts the requests per path.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.default = (404, {}, b'')
+        self.requests = Counter()
+        self.origin = None
+        self._server = None
+
+    def url(self, path: str) -> str:
+        return self.origin + path
+
+    def add(self, path: str, body: bytes | str = b'', content_type: str = 'text/html; charset=utf-8',
+            status: int = 200, headers: dict = None):
+        """Serves a fixed response at `path`."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.routes[path] = (status, dict(headers or {}, **{'Content-Type': content_type}), body)
+
+    def _respond(self, handler: BaseHTTPRequestHandler):
+        self.requests[handler.path] += 1
+        route = self.routes.get(handler.path, self.default)
+        status, headers, body = route(handler) if callable(route) else route
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        if status != 304:
+            handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        if status != 304:
+            handler.wfile.write(body)
+
+    def start(self) -> str:
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                site._respond(self)
+
+        self._server = _QuietServer(('127.0.0.1', 0), Handler)
+        self.origin = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.origin
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+@pytest.fixture
+def local_site():
+    site = LocalSite()
+    site.start()
+    yield site
+    site.stop()
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """`tmp_path`, also made the working directory, where the official check writes real-llms-txt/."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,68 @@
+"""
+Routing of agent prompts: a prompt that only names a URL is generated without
+calling the model, whoever runs the agent.
+
+    python -m pytest tests/test_agent.py
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google.adk.models.google_llm import Gemini
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from llmstxt_generate_agent.agent import USE_LLM_STATE_KEY, llms_txt_agent
+
+class _ModelCalled(Exception):
+    pass
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+
+    async def generate_content_async(self, llm_request, stream=False):
+        calls.append(llm_request)
+        raise _ModelCalled
+        yield
+
+    monkeypatch.setattr(Gemini, 'generate_content_async', generate_content_async)
+    return calls
+
+def _run(prompt: str, state: dict = None) -> list[str]:
+    async def run():
+        sessions = InMemorySessionService()
+        await sessions.create_session(app_name="test", user_id="user", session_id="session", state=state)
+        runner = Runner(agent=llms_txt_agent, app_name="test", session_service=sessions)
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        texts = []
+        async for event in runner.run_async(user_id="user", session_id="session", new_message=message):
+            if event.content and event.content.parts:
+                texts.extend(part.text for part in event.content.parts if part.text)
+        return texts
+    return asyncio.run(run())
+
+def test_explicit_url_skips_the_model(local_site, workdir, model_calls):
+    local_site.add('/docs', '<html><head><title>Docs</title></head><body><h1>Docs</h1>'
+                            '<a href="/docs/a">A</a></body></html>')
+    local_site.add('/docs/a', '<html><head><title>A</title></head><body><h1>Page A</h1></body></html>')
+
+    texts = _run(f"Generate docs for {local_site.url('/docs')}")
+    assert not model_calls
+    assert any("Successfully generated" in text for text in texts)
+    assert os.path.exists(workdir / "outputs")
+
+@pytest.mark.parametrize('prompt, state', [
+    ("Which docs sites publish an llms.txt?", None),
+    ("https://example.invalid/docs", {USE_LLM_STATE_KEY: True}),
+])
+def test_other_prompts_reach_the_model(workdir, model_calls, prompt, state):
+    with pytest.raises(_ModelCalled):
+        _run(prompt, state)
+    assert len(model_calls) == 1
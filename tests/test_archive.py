@@ -0,0 +1,72 @@
+"""
+Recording a crawl of a local site to a WARC archive and replaying it offline.
+
+    python -m pytest tests/test_archive.py
+"""
+import gzip
+import os
+import sys
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.generator import generate_llms_txt
+from llmstxt_generate_agent.utils.archive import CrawlArchive
+from llmstxt_generate_agent.utils.transport import HttpTransport
+
+MAX_BYTES = 10_000
+
+def _warc_headers(path: str) -> list[dict]:
+    """The WARC headers of each response record in the archive."""
+    records = []
+    with gzip.open(path, "rb") as f:
+        for record in f.read().split(b"WARC/1.1\r\n")[1:]:
+            head = record.split(b"\r\n\r\n", 1)[0].decode("utf-8")
+            headers = dict(line.split(": ", 1) for line in head.split("\r\n"))
+            if headers['WARC-Type'] == 'response':
+                records.append(headers)
+    return records
+
+def test_record_then_replay(local_site, tmp_path):
+    local_site.add('/page', '<html><title>Page</title><p>café</p></html>')
+    local_site.add('/large', '<html>' + 'x' * 2 * MAX_BYTES + '</html>')
+    local_site.add('/missing', '<html>Not found</html>', status=404)
+    paths = ('/page', '/large', '/missing')
+    path = str(tmp_path / "crawl.warc.gz")
+
+    with HttpTransport(max_retries=0, archive=CrawlArchive(path, 'w')) as transport:
+        live = [transport.fetch(local_site.url(p), max_bytes=MAX_BYTES) for p in paths]
+    truncated = {record['WARC-Target-URI']: record.get('WARC-Truncated') for record in _warc_headers(path)}
+    assert truncated == {local_site.url('/page'): None, local_site.url('/large'): 'length',
+                         local_site.url('/missing'): None}
+
+    local_site.requests.clear()
+    archive = CrawlArchive(path, 'r')
+    with HttpTransport(max_retries=0, archive=archive) as transport:
+        replayed = [transport.fetch(local_site.url(p), max_bytes=MAX_BYTES) for p in paths]
+        unrecorded = transport.fetch(local_site.url('/other'))
+    assert not local_site.requests
+    for before, after in zip(live, replayed):
+        assert (after.status, after.text, after.error) == (before.status, before.text, before.error)
+    # The truncated record keeps its size, so the page is turned down again without a body
+    assert replayed[1].error == f"{2 * MAX_BYTES + 13} bytes is over the {MAX_BYTES} byte limit"
+    assert (unrecorded.status, archive.misses) == (404, 1)
+
+def test_replayed_run_writes_the_same_outputs(local_site, workdir):
+    local_site.add('/docs', '<html><head><title>Docs</title></head><body><h1>Docs</h1>'
+                            '<a href="/docs/a">A</a> <a href="/docs/b">B</a></body></html>')
+    for name in 'ab':
+        local_site.add(f'/docs/{name}', f'<html><head><title>{name}</title></head><body><h1>Page {name}</h1>'
+                                        f'<p>About {name}.</p></body></html>')
+    archive = str(workdir / "crawl.warc.gz")
+
+    generate_llms_txt(local_site.url('/docs'), service_name='site', output_dir=str(workdir / "live"), archive=archive)
+    local_site.routes.clear()
+    result = generate_llms_txt(local_site.url('/docs'), service_name='site', output_dir=str(workdir / "replay"),
+                               archive=archive, replay=True)
+    assert "[Recursive]: Successfully generated" in result
+
+    for name in ("site-llms-v1.0.0.txt", "site-llms-full-v1.0.0.txt"):
+        with open(workdir / "live" / name, encoding="utf-8") as live, \
+                open(workdir / "replay" / name, encoding="utf-8") as replayed:
+            assert replayed.read() == live.read()
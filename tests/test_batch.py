@@ -0,0 +1,71 @@
+"""
+Batch manifests and summaries: manifest options are validated and reach the
+site's run, and summaries report what each run did, not what an earlier run
+left on disk.
+
+    python -m pytest tests/test_batch.py
+"""
+import json
+import os
+import re
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.batch import BatchJob, load_manifest, run_batch
+
+PAGES = 4
+
+def test_load_manifest_coerces_options(tmp_path):
+    csv_path = tmp_path / "sites.csv"
+    csv_path.write_text("url,max_pages,max_page_bytes,full_index\nhttps://a.example/docs,20,65536,true\n")
+    json_path = tmp_path / "sites.json"
+    json_path.write_text(json.dumps({'defaults': {'full_index': True},
+                                     'sites': [{'url': 'https://b.example/docs', 'max_pages': 20,
+                                                'max_page_bytes': 65536}]}))
+    expected = {'max_pages': 20, 'max_page_bytes': 65536, 'full_index': True}
+    assert load_manifest(str(csv_path))[0].options == expected
+    assert load_manifest(str(json_path))[0].options == expected
+
+@pytest.mark.parametrize('options, error', [
+    ({'max_pages': 'many'}, "option 'max_pages' must be a int"),
+    ({'max_pages': True}, "option 'max_pages' must be a int"),
+    ({'max_page_bytes': 1.5}, "option 'max_page_bytes' must be a int"),
+    ({'full_index': 'maybe'}, "option 'full_index' must be a bool"),
+    ({'max_depth': 3}, "unknown option(s) max_depth"),
+])
+def test_load_manifest_rejects_bad_options(tmp_path, options, error):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps([{'url': 'https://a.example/docs', **options}]))
+    with pytest.raises(ValueError, match=re.escape(error)):
+        load_manifest(str(path))
+
+def test_site_options_reach_the_run(local_site, workdir):
+    links = "".join(f'<a href="/docs/p{n}">Page {n}</a>' for n in range(PAGES))
+    for n in range(PAGES):
+        local_site.add(f'/docs/p{n}', f'<html><head><title>Page {n}</title></head><body><h1>Page {n}</h1>{links}</body></html>')
+    local_site.routes['/docs'] = local_site.routes['/docs/p0']
+
+    jobs = [BatchJob(local_site.url('/docs'), service_name='site', options={'max_pages': 2, 'full_index': True})]
+    [result] = run_batch(jobs, output_dir=str(workdir), max_retries=0)
+    assert (result['status'], result['pages']) == ('ok', 2)
+    assert os.path.exists(workdir / "site-llms-full-v1.0.0.txt.idx.json")
+
+def test_summary_counts_this_run(local_site, workdir):
+    locs = "".join(f"<url><loc>{local_site.url(f'/docs/p{n}')}</loc></url>" for n in range(PAGES))
+    local_site.add('/docs/sitemap.xml', f'<?xml version="1.0"?><urlset>{locs}</urlset>', 'application/xml')
+    for n in range(PAGES):
+        local_site.add(f'/docs/p{n}', f'<html><head><title>Page {n}</title></head><body><h1>Page {n}</h1></body></html>')
+
+    jobs = [BatchJob(local_site.url('/docs'), service_name='site')]
+    [result] = run_batch(jobs, output_dir=str(workdir), max_retries=0)
+    assert (result['status'], result['pages']) == ('ok', PAGES)
+
+    # The site is gone; its manifest from the first run is still on disk
+    local_site.routes.clear()
+    [result] = run_batch(jobs, output_dir=str(workdir), max_retries=0)
+    assert os.path.exists(workdir / "site-manifest.json")
+    assert (result['status'], result['pages']) == ('empty', 0)
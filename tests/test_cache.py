@@ -0,0 +1,93 @@
+"""
+HttpCache revalidation and eviction, and ConversionCache keys, against a
+local site.
+
+    python -m pytest tests/test_cache.py
+"""
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.generator import generate_llms_txt
+from llmstxt_generate_agent.utils.cache import HttpCache
+from llmstxt_generate_agent.utils.metrics import Metrics
+from llmstxt_generate_agent.utils.transport import HttpTransport
+
+PAGE_BYTES = 1000
+
+@pytest.fixture
+def site(local_site):
+    """Pages /a, /b and /c that answer a matching If-None-Match with a 304."""
+    local_site.statuses = []
+
+    def page(name):
+        body = f'<html><title>{name}</title><p>{name * PAGE_BYTES}</p></html>'.encode('utf-8')
+        etag = f'"{name}-1"'
+
+        def route(handler):
+            status = 304 if handler.headers.get('If-None-Match') == etag else 200
+            local_site.statuses.append((handler.path, status))
+            return status, {'ETag': etag, 'Content-Type': 'text/html; charset=utf-8'}, body
+        return route
+
+    for name in 'abc':
+        local_site.routes[f'/{name}'] = page(name)
+    return local_site
+
+def test_304_is_answered_from_cache(site, tmp_path):
+    cache = HttpCache(str(tmp_path / "http"))
+    with HttpTransport(max_retries=0, cache=cache) as transport:
+        first = transport.fetch(site.url('/a'))
+        second = transport.fetch(site.url('/a'))
+        assert cache.validators(site.url('/a')) == {'If-None-Match': '"a-1"'}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    assert site.statuses == [('/a', 200), ('/a', 304)]
+    assert not first.from_cache and second.from_cache
+    assert second.status == 200 and second.text == first.text
+
+def test_least_recently_used_entry_is_evicted(site, tmp_path):
+    # Room for two of the three pages
+    cache = HttpCache(str(tmp_path / "http"), max_bytes=int(2.5 * PAGE_BYTES))
+    with HttpTransport(max_retries=0, cache=cache) as transport:
+        for path in ('/a', '/b', '/a', '/c'):
+            transport.fetch(site.url(path))
+        assert cache.validators(site.url('/b')) == {}
+        assert cache.validators(site.url('/a')) and cache.validators(site.url('/c'))
+        assert len(os.listdir(tmp_path / "http" / "bodies")) == 2
+
+        # The evicted page is downloaded again, the others revalidated
+        site.statuses.clear()
+        for path in ('/a', '/b'):
+            transport.fetch(site.url(path))
+    assert site.statuses == [('/a', 304), ('/b', 200)]
+
+def test_conversion_cache_key_follows_converter_options(local_site, workdir):
+    locs = "".join(f"<url><loc>{local_site.url(f'/docs/p{n}')}</loc></url>" for n in range(3))
+    local_site.add('/docs/sitemap.xml', f'<?xml version="1.0"?><urlset>{locs}</urlset>', 'application/xml')
+    for n in range(3):
+        local_site.add(f'/docs/p{n}', f'<html><head><title>Page {n}</title></head><body>'
+                                      f'<div><p>Sidebar notes</p></div>'
+                                      f'<main><h1>Page {n}</h1><p>{"Words about the page. " * 20}</p></main>'
+                                      f'</body></html>')
+
+    def run(**options) -> tuple:
+        metrics = Metrics()
+        generate_llms_txt(local_site.url('/docs'), service_name='site', output_dir=str(workdir),
+                          cache_dir=str(workdir / "cache"), metrics=metrics, **options)
+        with open(workdir / "site-llms-full-v1.0.0.txt", encoding="utf-8") as f:
+            full = f.read()
+        return metrics.counters.get('conversion_cache_hits', 0), "Sidebar" in full
+
+    assert run() == (0, True)
+    assert run() == (3, True)
+    # Other options convert the pages again instead of serving the full-page Markdown
+    assert run(main_content=True) == (0, False)
+    assert run(main_content=True) == (3, False)
+    assert run(content_selectors=['main']) == (0, False)
+    assert run(converter_engine='lxml') == (0, True)
+    assert run() == (3, True)
@@ -0,0 +1,72 @@
+"""
+Near-duplicate pages are skipped with SimHash during a crawl of a local site.
+
+    python -m pytest tests/test_dedup.py
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.generator import generate_llms_txt
+
+ARTICLE = ("The scheduler keeps a window of requests per host and grows it while responses stay fast. "
+           "When the host answers with errors or throttling the window is halved and requests wait. "
+           "A Retry-After header blocks the host until the given time has passed, within a cap. "
+           "Hosts that publish a crawl delay in robots.txt get their requests spaced by that delay. "
+           "Slots are released only once the body has been read, so slow downloads count as load. "
+           "The window never drops below one request and never grows past the configured limit. ")
+GUIDE = ("Install the package from the index, then create a configuration file in the project root. "
+         "Every option has a default, so an empty file is enough to run the first crawl locally. "
+         "Point the crawler at the documentation root and pick an output directory for the files. "
+         "The first run downloads every page; later runs only fetch pages that have changed since. "
+         "Generated files are versioned, so several releases of the docs can live side by side. ")
+
+def _page(title: str, body: str, nav: str = "Home Guide Reference") -> str:
+    return (f'<html><head><title>{title}</title></head><body><nav>{nav}</nav>'
+            f'<main><h1>{title}</h1><p>{body}</p></main></body></html>')
+
+@pytest.fixture
+def site(local_site):
+    pages = {
+        '/docs/scheduler': _page("Scheduler", ARTICLE),
+        # The same article under another URL, with one word changed
+        '/docs/v2/scheduler': _page("Scheduler", ARTICLE.replace("fast", "quick", 1)),
+        '/docs/install': _page("Install", GUIDE),
+        # Identical content, different site chrome
+        '/docs/print/install': _page("Install", GUIDE, nav="Back to the docs"),
+        # Too short to fingerprint, so never treated as a duplicate
+        '/docs/short': _page("Short", "See the scheduler page."),
+        '/docs/short-copy': _page("Short", "See the scheduler page."),
+    }
+    locs = "".join(f"<url><loc>{local_site.url(path)}</loc></url>" for path in pages)
+    local_site.add('/docs/sitemap.xml', f'<?xml version="1.0"?><urlset>{locs}</urlset>', 'application/xml')
+    for path, html in pages.items():
+        local_site.add(path, html)
+    return local_site
+
+def _written(workdir) -> list[str]:
+    """Titles of the pages in llms-full.txt, after its own."""
+    with open(workdir / "site-llms-full-v1.0.0.txt", encoding="utf-8") as f:
+        return [line for line in f.read().splitlines() if line.startswith("# ")][1:]
+
+def test_near_duplicates_are_skipped(site, workdir):
+    result = generate_llms_txt(site.url('/docs'), service_name='site', output_dir=str(workdir), dedup_threshold=0.9)
+    assert "2 near-duplicate pages skipped" in result
+    assert _written(workdir) == ["# Scheduler", "# Install", "# Short", "# Short"]
+    with open(workdir / "site-duplicates-v1.0.0.json", encoding="utf-8") as f:
+        report = json.load(f)
+    assert report == {'threshold': 0.9, 'merged': {
+        site.url('/docs/scheduler'): [site.url('/docs/v2/scheduler')],
+        site.url('/docs/install'): [site.url('/docs/print/install')],
+    }}
+
+def test_every_page_is_kept_without_threshold(site, workdir):
+    result = generate_llms_txt(site.url('/docs'), service_name='site', output_dir=str(workdir))
+    assert "near-duplicate" not in result
+    assert len(_written(workdir)) == 6
+    assert not os.path.exists(workdir / "site-duplicates-v1.0.0.json")
@@ -0,0 +1,75 @@
+"""
+Discovery on a single-page-app host, which answers every unknown path with
+`200 text/html` (a soft 404) and declares its real sitemap in robots.txt.
+Neither the HTML at sitemap.xml nor the one at llms.txt may be taken for
+the real file.
+
+    python -m pytest tests/test_discovery.py
+"""
+import gzip
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.discovery import discover, is_sitemap_head
+from llmstxt_generate_agent.utils.transport import HttpTransport
+
+SPA_SHELL = b'<!doctype html><html><head><title>App</title></head><body><div id="root"></div></body></html>'
+
+@pytest.fixture
+def spa_site(local_site):
+    local_site.default = (200, {'Content-Type': 'text/html; charset=utf-8'}, SPA_SHELL)
+    local_site.add('/robots.txt', f"User-agent: *\nSitemap: {local_site.url('/static/map.xml')}\n", 'text/plain')
+    sitemap = f'<?xml version="1.0"?><urlset><url><loc>{local_site.url("/docs/a")}</loc></url></urlset>'
+    local_site.add('/static/map.xml', sitemap, 'application/xml')
+    # A misconfigured server labelling its HTML shell as text
+    local_site.add('/docs/llms-full.txt', SPA_SHELL, 'text/plain')
+    return local_site.origin
+
+def test_soft_404_is_not_a_sitemap(spa_site):
+    with HttpTransport() as transport:
+        result = discover(f"{spa_site}/docs", transport)
+    assert result.sitemap_url == f"{spa_site}/static/map.xml"
+    assert not any(found for url, found in result.sitemap_candidates if url != result.sitemap_url)
+
+def test_soft_404_is_not_an_official_llms_txt(spa_site):
+    with HttpTransport() as transport:
+        result = discover(f"{spa_site}/docs", transport, stop_on_official=True)
+    assert not result.has_official
+    assert result.sitemap_url == f"{spa_site}/static/map.xml"
+
+@pytest.mark.parametrize('head, expected', [
+    (b'<?xml version="1.0" encoding="UTF-8"?><urlset>', True),
+    (b'\xef\xbb\xbf\n  <sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">', True),
+    (b'<!-- generated -->\n<urlset>', True),
+    (gzip.compress(b'<?xml version="1.0"?><urlset>' + b' ' * 4096)[:64], True),
+    (SPA_SHELL, False),
+    (b'<html><body>Not found</body></html>', False),
+    (gzip.compress(SPA_SHELL), False),
+    (b'User-agent: *', False),
+])
+def test_sitemap_sniff(head, expected):
+    assert is_sitemap_head(head) is expected
+
+def test_discovery_cache_is_bounded(monkeypatch):
+    from llmstxt_generate_agent import generator
+    clock = [1000.0]
+    monkeypatch.setattr(generator, 'discover', lambda url: object())
+    monkeypatch.setattr(generator.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(generator, '_discoveries', generator.OrderedDict())
+
+    first = generator._discovery_for("https://a.example/docs")
+    for n in range(generator._DISCOVERY_CACHE_SIZE * 2):
+        generator._discovery_for(f"https://site{n}.example/docs")
+        # Recently used entries stay
+        assert generator._discovery_for("https://a.example/docs") is first
+    assert len(generator._discoveries) == generator._DISCOVERY_CACHE_SIZE
+
+    # Expired entries are dropped on the next insert
+    clock[0] += generator._DISCOVERY_TTL
+    assert generator._discovery_for("https://a.example/docs") is not first
+    assert list(generator._discoveries) == ["https://a.example/docs"]
@@ -0,0 +1,66 @@
+"""
+URL canonicalization and the seen-sets behind the recursive crawl frontier.
+
+    python -m pytest tests/test_frontier.py
+"""
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.crawlers.frontier import BloomFilter, Frontier, SeenSet, canonicalize_url, url_key
+
+@pytest.mark.parametrize('url, expected', [
+    ("HTTPS://Docs.Example.com:443/Guide/", "https://docs.example.com/Guide/"),
+    ("http://example.com:8080/a", "http://example.com:8080/a"),
+    ("http://example.com:80/a#section", "http://example.com/a"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com/docs/index.html", "https://example.com/docs/"),
+    ("https://example.com/docs/INDEX.HTM?b=2", "https://example.com/docs/?b=2"),
+    ("https://example.com/a?utm_source=x&b=2&a=1&gclid=y&UTM_Medium=z", "https://example.com/a?a=1&b=2"),
+    ("https://example.com/a?q=%2F%20x&ref_src=t", "https://example.com/a?q=%2F%20x"),
+    ("  https://user:pw@Example.com/a  ", "https://user:pw@example.com/a"),
+    ("http://[::1]:8000/a", "http://[::1]:8000/a"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+    assert canonicalize_url(expected) == expected
+
+def test_url_key():
+    variants = ["https://example.com/docs", "https://example.com/docs/", "https://example.com/docs/index.html",
+                "https://EXAMPLE.com/docs/#top", "https://example.com/docs?utm_campaign=x"]
+    assert len({url_key(url) for url in variants}) == 1
+    assert url_key("https://example.com/Docs") != url_key("https://example.com/docs")
+    assert url_key("https://example.com/Docs", case_insensitive=True) == url_key("https://example.com/docs", True)
+    assert url_key("https://example.com/a?x=1") != url_key("https://example.com/a?x=2")
+
+@pytest.mark.parametrize('seen', [SeenSet, lambda: BloomFilter(10_000, 0.001)])
+def test_seen_sets(seen):
+    keys = [f"https://example.com/page/{n}" for n in range(2000)]
+    seen = seen()
+    assert all(seen.add(key) for key in keys)
+    assert not any(seen.add(key) for key in keys)
+    assert all(key in seen for key in keys)
+    assert len(seen) == len(keys)
+    assert "https://example.com/other" not in seen
+
+def test_frontier_bfs_and_dedup():
+    frontier = Frontier()
+    assert frontier.head_depth() is None
+    assert frontier.add("https://example.com/docs/", 0) == "https://example.com/docs/"
+    assert frontier.add("https://example.com/docs/index.html", 0) is None
+    assert frontier.pop() == ("https://example.com/docs/", 0)
+    for path in ("b", "a", "b#x", "c?utm_source=feed"):
+        frontier.add(f"https://example.com/docs/{path}", 1)
+    frontier.add("https://example.com/docs/d", 2)
+    assert len(frontier) == 4
+    assert frontier.head_depth() == 1
+    assert [frontier.pop() for _ in range(4)] == [
+        ("https://example.com/docs/b", 1), ("https://example.com/docs/a", 1),
+        ("https://example.com/docs/c", 1), ("https://example.com/docs/d", 2),
+    ]
+    assert not frontier
+    assert not frontier.mark_seen("https://example.com/docs/a")
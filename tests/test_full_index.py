@@ -0,0 +1,43 @@
+"""
+Sharded llms-full.txt outputs across runs with different settings.
+
+    python -m pytest tests/test_full_index.py
+"""
+import os
+import sys
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.formatter import LlmsFullWriter
+from llmstxt_generate_agent.utils.full_index import LlmsFullReader
+
+def _write(path, pages, **options):
+    writer = LlmsFullWriter(str(path), **options)
+    for n in range(pages):
+        writer.write_page(f"https://example.com/docs/section{n % 3}/page{n}", f"# Page {n}\n\n" + "text " * 50)
+    writer.close("Docs")
+    return writer
+
+def test_stale_shards_are_removed(tmp_path):
+    path = tmp_path / "site-llms-full-v1.0.0.txt"
+    other_version = tmp_path / "site-llms-full-v1.0.0.1.txt"
+    other_version.write_text("kept")
+
+    _write(path, 12, shard_size=1000, compress=['gzip'])
+    first = sorted(os.listdir(tmp_path))
+    assert "site-llms-full-v1.0.0.part-004.txt.gz" in first
+
+    # Fewer, larger shards and no compression
+    writer = _write(path, 6, shard_size=2000)
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [path.name, other_version.name] + [os.path.basename(output) for output in writer.outputs]
+    )
+    with LlmsFullReader(str(path)) as reader:
+        assert len(reader) == 6
+
+    # Sharded by path prefix, then not sharded at all
+    _write(path, 6, shard_prefix_depth=2)
+    assert "site-llms-full-v1.0.0.docs-section1.txt" in os.listdir(tmp_path)
+    _write(path, 6)
+    assert sorted(os.listdir(tmp_path)) == sorted([path.name, other_version.name])
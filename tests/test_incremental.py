@@ -0,0 +1,72 @@
+"""
+Repeat runs against a sitemap without `<lastmod>`. Without an HTTP cache,
+incremental runs revalidate pages with the ETag the previous run recorded and
+only download changed pages again; with one, every page is a cache hit.
+
+    python -m pytest tests/test_incremental.py
+"""
+import json
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.generator import generate_llms_txt
+from llmstxt_generate_agent.utils.metrics import Metrics
+
+PAGES = 5
+
+@pytest.fixture
+def site(local_site):
+    """Pages with ETags; bump `site.revisions[n]` to change page n. `site.downloads` counts 200s."""
+    local_site.revisions = Counter()
+    local_site.downloads = Counter()
+    locs = "".join(f"<url><loc>{local_site.url(f'/docs/p{n}')}</loc></url>" for n in range(PAGES))
+    local_site.add('/docs/sitemap.xml', f'<?xml version="1.0"?><urlset>{locs}</urlset>', 'application/xml')
+
+    def page(n):
+        def route(handler):
+            etag = f'"p{n}-r{local_site.revisions[n]}"'
+            if handler.headers.get('If-None-Match') == etag:
+                return 304, {'ETag': etag}, b''
+            local_site.downloads[n] += 1
+            body = (f'<html><head><title>Page {n}</title></head>'
+                    f'<body><h1>Page {n}</h1><p>Revision {local_site.revisions[n]}</p></body></html>')
+            return 200, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag}, body.encode()
+        return route
+
+    for n in range(PAGES):
+        local_site.routes[f'/docs/p{n}'] = page(n)
+    return local_site
+
+def test_etag_revalidation_without_cache(site, workdir):
+    generate_llms_txt(site.url('/docs'), service_name='site', output_dir=str(workdir), incremental=True)
+    assert all(site.downloads[n] == 1 for n in range(PAGES))
+
+    site.revisions[2] += 1
+    result = generate_llms_txt(site.url('/docs'), service_name='site', output_dir=str(workdir), incremental=True)
+    assert "1 changed" in result
+
+    # Only the changed page is downloaded again
+    assert [site.downloads[n] for n in range(PAGES)] == [1, 1, 2, 1, 1]
+    with open(workdir / "site-llms-full-v1.0.0.txt", encoding="utf-8") as f:
+        full = f.read()
+    assert all(f"# Page {n}\n" in full for n in range(PAGES))
+    assert "Revision 1" in full
+    with open(workdir / "site-changes-v1.0.0.json", encoding="utf-8") as f:
+        assert json.load(f)['reused'] == PAGES - 1
+
+def test_cached_rerun_hit_rate(site, workdir):
+    cache_dir = str(workdir / "cache")
+    generate_llms_txt(site.url('/docs'), service_name='site', output_dir=str(workdir), cache_dir=cache_dir)
+
+    # Discovery's 404 probes are not misses; every page is revalidated from the cache
+    metrics = Metrics()
+    generate_llms_txt(site.url('/docs'), service_name='site', output_dir=str(workdir), cache_dir=cache_dir,
+                      metrics=metrics)
+    assert metrics.gauges['http_cache_misses'] == 0
+    assert metrics.gauges['http_cache_hit_rate'] == 1.0
@@ -0,0 +1,51 @@
+"""
+Regex link extraction against the HTML parser it replaces.
+
+    python -m pytest tests/test_links.py
+"""
+import os
+import sys
+import time
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.parser import extract_links, _parser_links
+
+BASE_URL = "https://example.com/docs/"
+
+@pytest.mark.parametrize('html, expected', [
+    ('<a title="a>b" href="/one">One</a>', ["https://example.com/one"]),
+    ("<a data-title='x > y' class=nav HREF=two#top>Two</a>", ["https://example.com/docs/two"]),
+    ('<a title="see href=/bad" href="three">Three</a>', ["https://example.com/docs/three"]),
+    ('<a data-href="/bad" href="/four">Four</a>', ["https://example.com/four"]),
+    ('<a\nhref="/five?a=1&amp;b=2">Five</a><a name="x">No link</a>', ["https://example.com/five?a=1&b=2"]),
+    # Markup in scripts, styles and comments is not part of the page, whatever its case
+    ('<SCRIPT>document.write("<a href=/js>")</SCRIPT><Style>a[href="/css"]{}</Style><!-- <a href="/c"> -->'
+     '<a href="/six">Six</a>', ["https://example.com/six"]),
+    # Tags the expression can't delimit are left to the parser
+    ('<a title="a<b" href="/seven">Seven</a>', ["https://example.com/seven"]),
+    ('<a title="oops href="/q">Q</a><a href="/eight">Eight</a>', ["https://example.com/eight"]),
+])
+def test_extract_links(html, expected):
+    assert extract_links(html, BASE_URL) == expected
+    assert _parser_links(html, BASE_URL) == expected
+
+def test_extract_links_matches_parser():
+    html = "".join(
+        f'<li class="toc"><a class="reference internal" href="{href}">Entry</a></li>'
+        for href in ("/docs/a.html", "../api/b.html#s", "https://github.com/x", "c?tab=1&amp;lang=py", " d ")
+    )
+    assert extract_links(html, BASE_URL) == _parser_links(html, BASE_URL)
+
+@pytest.mark.parametrize('html', [
+    '<a title="' + 'x' * 200_000 + ' href="/never">',
+    '<a ' + 'data-x=y ' * 50_000 + 'href="/last">',
+    '<a ' + '= ' * 50_000 + 'href="/last">',
+])
+def test_extract_links_linear(html):
+    started = time.process_time()
+    extract_links(html * 5, BASE_URL)
+    assert time.process_time() - started < 1.0
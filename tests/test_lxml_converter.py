@@ -0,0 +1,149 @@
+"""
+Golden-output parity of the lxml converter engine with markdownify.
+
+Each case pins the Markdown the markdownify engine produces today; the lxml
+engine must produce it byte for byte, with and without main-content
+extraction.
+
+    python -m pytest tests/test_lxml_converter.py
+"""
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.converter import html_to_markdown
+from llmstxt_generate_agent.utils.parser import ParsedPage
+
+GOLDEN = {
+    'headings': (
+        '<h1>Client <code>Session</code></h1><p>Intro</p>'
+        '<h2>Options <a class="headerlink" href="#options">¶</a></h2><h3>\n  Multi\n  line\n</h3><h4></h4>',
+        "\n".join([
+            "# Client `Session`",
+            "Intro",
+            "## Options [¶](#options)",
+            "### Multi line",
+            "#### ",
+        ]),
+    ),
+    'code_blocks': (
+        '<p>Install with <code>pip install pkg_name</code>:</p>'
+        '<pre><code class="language-python">\n\ndef main():\n    return 1\n\n</code></pre>'
+        '<pre><span class="k">import</span> <span class="n">os</span>\nprint(os.sep)</pre>'
+        '<p>Ticks: <code>a`b</code></p>',
+        "\n".join([
+            "Install with `pip install pkg_name`:",
+            "```",
+            "def main():",
+            "    return 1",
+            "```",
+            "```",
+            "import os",
+            "print(os.sep)",
+            "```",
+            "Ticks: `` a`b ``",
+        ]),
+    ),
+    'tables': (
+        '<table><thead><tr><th>Name</th><th>Default</th></tr></thead><tbody>'
+        '<tr><td><code>timeout</code></td><td>30<br>seconds</td></tr><tr><td colspan="2">spans</td></tr>'
+        '</tbody></table><table><tr><td>no</td><td>header</td></tr></table>',
+        "\n".join([
+            "| Name | Default |",
+            "| --- | --- |",
+            "| `timeout` | 30 seconds |",
+            "| spans | |",
+            "|  |  |",
+            "| --- | --- |",
+            "| no | header |",
+        ]),
+    ),
+    'lists': (
+        '<ul><li>One</li><li><p>Two</p><ul><li>Nested <em>item</em></li>'
+        '<li>Deeper<ul><li>Third level</li></ul></li></ul></li></ul>'
+        '<ol start="3"><li>Three</li><li>Four<ol><li>Sub</li></ol></li></ol><p>After</p>',
+        "\n".join([
+            "* One",
+            "* Two",
+            "  + Nested *item*",
+            "  + Deeper",
+            "    - Third level",
+            "3. Three",
+            "4. Four",
+            "   1. Sub",
+            "After",
+        ]),
+    ),
+    'inline': (
+        '<p>Use <strong>bold</strong>, <em>emphasis</em> and snake_case *stars*. '
+        'See <a href="https://example.com/docs">the docs</a>, <a href="https://example.com">https://example.com</a> '
+        'and <a href="/api" title="API">API</a>.</p>',
+        r'Use **bold**, *emphasis* and snake\_case \*stars\*. See [the docs](https://example.com/docs), '
+        r'<https://example.com> and [API](/api "API").',
+    ),
+    'blocks': (
+        '<blockquote><p>Note</p><p>Second paragraph</p></blockquote><p>Text<br>after a break</p><hr>'
+        '<dl><dt>Term</dt><dd>Definition</dd></dl>',
+        "\n".join([
+            "> Note",
+            ">",
+            "> Second paragraph",
+            "Text  ",
+            "after a break",
+            "---",
+            "Term",
+            ":   Definition",
+        ]),
+    ),
+    'page': (
+        '<html><head><title>Sessions</title></head><body><header>Site header</header>'
+        '<nav><a href="/">Home</a></nav><div class="content"><h1>Sessions</h1><p>Sessions keep settings.</p>'
+        '<img src="diagram.png" alt="Diagram"><script>track()</script></div><footer>Footer</footer></body></html>',
+        "\n".join([
+            "Sessions",
+            "# Sessions",
+            "Sessions keep settings.",
+            "![Diagram](diagram.png)",
+        ]),
+    ),
+}
+
+SIDEBAR = '<div class="sidebar"><ul>' + "".join(f'<li><a href="/p{i}">Page {i}</a></li>' for i in range(30)) + '</ul></div>'
+
+@pytest.mark.parametrize('name', GOLDEN)
+@pytest.mark.parametrize('engine', ['markdownify', 'lxml'])
+def test_golden_output(name, engine):
+    html, expected = GOLDEN[name]
+    assert html_to_markdown(html, engine=engine) == expected
+
+@pytest.mark.parametrize('name', GOLDEN)
+def test_main_content_parity(name):
+    html = f'<html><body>{SIDEBAR}<main>{GOLDEN[name][0]}</main></body></html>'
+    expected = html_to_markdown(html, main_content=True)
+    assert html_to_markdown(html, main_content=True, engine='lxml') == expected
+    assert "Page 1" not in expected
+
+def test_density_fallback_parity():
+    article = "".join(f'<h2>Section {i}</h2><p>{"Plain text without links. " * 12}</p>' for i in range(5))
+    html = f'<html><body><div id="page">{SIDEBAR}<div id="content">{article}</div></div></body></html>'
+    expected = html_to_markdown(html, main_content=True)
+    assert html_to_markdown(html, main_content=True, engine='lxml') == expected
+    assert expected.startswith("## Section 0")
+
+def test_parsed_page_metadata():
+    html = ('<html><head><title> Sessions </title><meta name="description" content=" Keeps settings. "></head>'
+            '<body><p>x</p></body></html>')
+    pages = [ParsedPage("https://example.com/", html, engine=engine) for engine in ('markdownify', 'lxml')]
+    assert [(p.title, p.description, p.markdown) for p in pages] == [("Sessions", "Keeps settings.", " Sessions \nx")] * 2
+
+@pytest.mark.parametrize('html', ["", "   ", "<!-- only a comment -->"])
+def test_empty_documents(html):
+    assert html_to_markdown(html, engine='lxml') == html_to_markdown(html)
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        html_to_markdown("<p>x</p>", engine='pandoc')
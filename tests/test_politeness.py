@@ -0,0 +1,95 @@
+"""
+robots.txt rules and per-host admission control.
+
+    python -m pytest tests/test_politeness.py
+"""
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.discovery import discover
+from llmstxt_generate_agent.utils.politeness import HostScheduler, RobotsPolicy
+from llmstxt_generate_agent.utils.transport import HttpTransport
+
+@pytest.mark.parametrize('status, body, allowed', [
+    (200, "User-agent: *\nDisallow: /docs/private/\n", False),
+    (200, "User-agent: *\nAllow: /\n", True),
+    (403, "", False),
+    (401, "", False),
+    (404, "", True),
+    (500, "", True),
+])
+def test_seeded_and_fetched_robots_agree(local_site, status, body, allowed):
+    local_site.add('/robots.txt', body, 'text/plain', status=status)
+    url = local_site.url('/docs/private/page')
+    with HttpTransport(max_retries=0) as transport:
+        discovery = discover(local_site.url('/docs'), transport)
+        seeded = RobotsPolicy(transport.session)
+        seeded.seed(url, discovery.robots_txt, discovery.robots_status)
+        fetched = RobotsPolicy(transport.session)
+        assert seeded.allowed(url) is fetched.allowed(url) is allowed
+
+def test_unreachable_robots_allows_everything():
+    policy = RobotsPolicy(requests.Session(), timeout=1)
+    policy.seed("http://127.0.0.1:9/docs", None, None)
+    assert policy.allowed("http://127.0.0.1:9/docs/page")
+
+@pytest.fixture
+def throttling_site(local_site):
+    """/busy answers 429 with `Retry-After: 1`, /throttled without, until `busy` is cleared."""
+    local_site.busy = True
+    local_site.add('/ok', '<html><title>OK</title></html>')
+
+    def busy(handler):
+        if local_site.busy:
+            return 429, {'Retry-After': '1', 'Content-Type': 'text/html'}, b'<html>Slow down</html>'
+        return 200, {'Content-Type': 'text/html'}, b'<html>Done</html>'
+    local_site.routes['/busy'] = busy
+    local_site.routes['/throttled'] = lambda handler: (429, {}, b'') if local_site.busy else busy(handler)
+    return local_site
+
+def test_throttling_halves_the_window_and_pauses_the_host(throttling_site):
+    scheduler = HostScheduler(max_concurrency=8, initial_concurrency=4)
+    with HttpTransport(max_retries=0, scheduler=scheduler) as transport:
+        for _ in range(20):
+            assert transport.fetch(throttling_site.url('/ok')).status == 200
+        [host] = scheduler._hosts.values()
+        grown = host.limit
+        assert grown > 4
+
+        assert transport.fetch(throttling_site.url('/busy')).status == 429
+        assert host.limit == grown / 2
+        started = time.monotonic()
+        assert transport.fetch(throttling_site.url('/ok')).status == 200
+        assert time.monotonic() - started >= 0.9
+
+        # Throttled again at a window of one, requests to the host are spaced out too
+        while host.limit > 1:
+            host.last_decrease = 0.0
+            transport.fetch(throttling_site.url('/throttled'))
+        host.last_decrease = 0.0
+        transport.fetch(throttling_site.url('/throttled'))
+        assert host.limit == 1 and host.interval >= 0.25
+
+        # Healthy responses grow the window back
+        throttling_site.busy = False
+        for _ in range(5):
+            transport.fetch(throttling_site.url('/throttled'))
+        assert host.limit > 1
+
+def test_retried_throttling_counts_as_throttling(throttling_site):
+    throttling_site.statuses = iter((429, 200))
+    throttling_site.routes['/flaky'] = lambda handler: (next(throttling_site.statuses), {'Content-Type': 'text/html'},
+                                                        b'<html>Flaky</html>')
+    scheduler = HostScheduler(max_concurrency=8, initial_concurrency=4)
+    with HttpTransport(max_retries=1, backoff_factor=0, backoff_jitter=0, scheduler=scheduler) as transport:
+        # urllib3 absorbs the 429 and its retry succeeds; the window still backs off
+        assert transport.fetch(throttling_site.url('/flaky')).status == 200
+        [host] = scheduler._hosts.values()
+        assert host.limit == 2
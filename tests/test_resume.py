@@ -0,0 +1,80 @@
+"""
+Resuming an interrupted generate_llms_txt run from its checkpoint.
+
+A small docs site without a sitemap is served locally, so the default path
+runs: the sitemap attempt finds nothing and falls back to the recursive
+crawl. The first run is killed after a few pages; the resumed run must not
+fetch those pages again and must still write every page.
+
+    python -m pytest tests/test_resume.py
+"""
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.generator import generate_llms_txt
+from llmstxt_generate_agent.utils.formatter import LlmsFullWriter
+
+PAGES = 30
+
+@pytest.fixture
+def site(local_site):
+    for n in range(PAGES):
+        # The first page links to every page, the others to their neighbours
+        targets = range(PAGES) if n == 0 else ((n + 1) % PAGES, (n + 2) % PAGES)
+        links = "".join(f'<a href="/docs/p{k}.html">Page {k}</a>' for k in targets)
+        local_site.add(f'/docs/p{n}.html',
+                       f'<html><head><title>Page {n}</title></head><body><h1>Page {n}</h1>{links}</body></html>')
+    local_site.routes['/docs'] = local_site.routes['/docs/'] = local_site.routes['/docs/p0.html']
+    return local_site
+
+def test_resume_after_crash(site, workdir, monkeypatch):
+    write_page = LlmsFullWriter.write_page
+    written = []
+
+    def crash_after_ten(self, url, markdown):
+        if len(written) == 10:
+            raise KeyboardInterrupt
+        written.append(url)
+        return write_page(self, url, markdown)
+
+    monkeypatch.setattr(LlmsFullWriter, 'write_page', crash_after_ten)
+    with pytest.raises(KeyboardInterrupt):
+        generate_llms_txt(site.url('/docs/'), service_name='site', output_dir=str(workdir), concurrency=2)
+    assert os.path.exists(workdir / ".site-recursive-checkpoint.sqlite")
+    monkeypatch.setattr(LlmsFullWriter, 'write_page', write_page)
+
+    site.requests.clear()
+    result = generate_llms_txt(site.url('/docs/'), service_name='site', output_dir=str(workdir), concurrency=2,
+                               resume=True)
+    assert "[Recursive]: Successfully generated" in result
+
+    # Pages that reached the checkpoint are not fetched again
+    assert not any(site.requests[f"/docs/{url.rsplit('/', 1)[1]}"] for url in written)
+    with open(workdir / "site-llms-full-v1.0.0.txt", encoding="utf-8") as f:
+        full = f.read()
+    assert all(f"# Page {n}\n" in full for n in range(PAGES))
+    assert not any(name.endswith("checkpoint.sqlite") for name in os.listdir(workdir))
+
+def test_completed_run_leaves_no_checkpoint(site, workdir, monkeypatch):
+    write_page = LlmsFullWriter.write_page
+
+    def crash(self, url, markdown):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(LlmsFullWriter, 'write_page', crash)
+    with pytest.raises(KeyboardInterrupt):
+        generate_llms_txt(site.url('/docs/'), service_name='site', output_dir=str(workdir))
+    assert os.path.exists(workdir / ".site-recursive-checkpoint.sqlite")
+    monkeypatch.setattr(LlmsFullWriter, 'write_page', write_page)
+
+    # The site gains a sitemap, so the next run completes without the recursive crawl
+    locs = "".join(f"<url><loc>{site.url(f'/docs/p{n}.html')}</loc></url>" for n in range(PAGES))
+    site.add('/docs/sitemap.xml', f'<?xml version="1.0"?><urlset>{locs}</urlset>', 'application/xml')
+    result = generate_llms_txt(site.url('/docs/'), service_name='site', output_dir=str(workdir))
+    assert "[Sitemap]: Successfully generated" in result
+    assert not any("checkpoint" in name for name in os.listdir(workdir))
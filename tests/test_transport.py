@@ -0,0 +1,36 @@
+"""
+HttpTransport.fetch() and the charset handling behind it.
+
+    python -m pytest tests/test_transport.py
+"""
+import os
+import sys
+
+import pytest
+
+# Ensure module is found
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llmstxt_generate_agent.utils.transport import HttpTransport, decode_html
+
+@pytest.mark.parametrize('body, content_type, expected', [
+    (b'<p>caf\xc3\xa9</p>', 'text/html; charset=utf-8', ('<p>café</p>', 'utf-8')),
+    (b'<p>caf\xe9</p>', 'text/html; charset=ISO-8859-1', ('<p>café</p>', 'cp1252')),
+    (b'<meta charset="windows-1252"><p>caf\xe9</p>', 'text/html', ('<meta charset="windows-1252"><p>café</p>', 'cp1252')),
+    # Codecs that are not text encodings are ignored
+    (b'<html>hi</html>', 'text/html; charset=hex', ('<html>hi</html>', 'utf-8')),
+    (b'<meta charset="rot13"><p>caf\xc3\xa9</p>', 'text/html', ('<meta charset="rot13"><p>café</p>', 'utf-8')),
+    (b'<meta http-equiv="Content-Type" content="text/html; charset=base64"><p>caf\xe9</p>', None,
+     ('<meta http-equiv="Content-Type" content="text/html; charset=base64"><p>café</p>', 'cp1252')),
+])
+def test_decode_html(body, content_type, expected):
+    assert decode_html(body, content_type) == expected
+
+def test_fetch_survives_bogus_charsets(local_site):
+    local_site.add('/header', '<html><title>Header</title></html>', 'text/html; charset=zlib')
+    local_site.add('/meta', '<html><meta charset="hex"><title>Meta</title></html>')
+    with HttpTransport(max_retries=0) as transport:
+        header = transport.fetch(local_site.url('/header'))
+        meta = transport.fetch(local_site.url('/meta'))
+    assert (header.error, header.encoding, header.text) == (None, 'utf-8', '<html><title>Header</title></html>')
+    assert (meta.error, meta.encoding) == (None, 'utf-8')